@@ -5,34 +5,58 @@ Provides integration with the Android version of the application.
 import json
 import os
 import platform
+import queue
+import shutil
 import subprocess
-from typing import Dict, List, Optional, Any, Tuple
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 
 # This module serves as a placeholder for Android-specific functionality 
 # that would be implemented in the native Android application.
 # It also serves as a design reference for the Android implementation.
 
+# Seconds a Shizuku availability check stays valid
+SHIZUKU_CHECK_TTL = 5.0
+
+# Printed after each command sent to the persistent shell, followed by its exit status
+SHELL_SENTINEL = "__MEMDBG_DONE__"
+
+# Seconds the persistent shell may stay silent mid-command before it is dropped
+SHELL_READ_TIMEOUT = 10.0
+
+def _pump_lines(stream, lines: queue.Queue) -> None:
+    """Copy lines from stream into a queue until EOF, then put an empty string"""
+    try:
+        for line in stream:
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    lines.put("")
+
 class AndroidProcessConnector:
     def __init__(self):
         """Android-specific implementation to interface with Android app"""
         self.adb_path = shutil.which('adb')
         self.attached_pid = None
-        self.using_shizuku = False  # New flag for Shizuku support.connected = False
+        self.connected = False
         self.current_pid = None
         self.device_id = None
         self.using_shizuku = False  # Flag to indicate whether to use Shizuku API
+        self._shizuku_cached = None  # (monotonic timestamp, available) of the last Shizuku check
+        # One long-lived `adb shell` per device, so queries don't each spawn adb
+        self._shell_process = None
+        self._shell_output = None  # Queue of lines read from the persistent shell
+        self._shell_lock = threading.RLock()
     
     def is_android_connected(self) -> bool:
         """Check if an Android device is connected via ADB"""
+        # A live persistent shell means the device is still there
+        if self._shell_process is not None and self._shell_process.poll() is None:
+            return True
+        
         try:
-            # Check if adb is installed
-            subprocess.run("adb version", 
-                          stdout=subprocess.PIPE, 
-                          stderr=subprocess.PIPE, 
-                          check=True,
-                          shell=True)
-            
-            # Get list of connected devices
+            # Get list of connected devices; this also fails if adb isn't installed
             result = subprocess.run("adb devices", 
                                    stdout=subprocess.PIPE, 
                                    stderr=subprocess.PIPE, 
@@ -49,60 +73,192 @@ class AndroidProcessConnector:
                 if line.strip() and "device" in line:
                     # Extract device ID
                     self.device_id = line.split()[0]
+                    self._open_shell()
                     return True
             
             return False
         except (subprocess.SubprocessError, FileNotFoundError):
             return False
     
+    def _open_shell(self) -> None:
+        """Start the persistent shell on the current device, replacing any previous one"""
+        with self._shell_lock:
+            self._close_shell()
+            try:
+                process = subprocess.Popen(
+                    ["adb", "-s", self.device_id, "shell"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1
+                )
+            except OSError:
+                return
+            self._start_shell(process)
+    
+    def _start_shell(self, process: subprocess.Popen) -> None:
+        """
+        Adopt a started shell process as the persistent shell.
+        
+        A daemon thread moves its output into a queue, so reads can wait with
+        a timeout on every platform instead of blocking in readline().
+        """
+        with self._shell_lock:
+            self._shell_process = process
+            self._shell_output = queue.Queue()
+            threading.Thread(target=_pump_lines, args=(process.stdout, self._shell_output),
+                             daemon=True).start()
+    
+    def _close_shell(self) -> None:
+        """Stop the persistent shell, if one is running"""
+        with self._shell_lock:
+            if self._shell_process is not None:
+                try:
+                    self._shell_process.kill()
+                    self._shell_process.wait()
+                except OSError:
+                    pass
+                self._shell_process = None
+                self._shell_output = None
+    
+    def _shell_lines(self, command: str, check: bool = True) -> Iterator[str]:
+        """
+        Yield the output of a shell command on the device line by line as it arrives.
+        
+        Commands go through the persistent shell when it is running, costing a
+        round trip instead of an adb spawn; otherwise a one-off `adb shell` is
+        used. With check set, a failing command raises CalledProcessError after
+        its output. If the shell stays silent for SHELL_READ_TIMEOUT it is
+        killed, and the command falls back to a one-off `adb shell` when no
+        output was yielded yet. The shell is held until the iteration ends, so
+        no other device command may be issued from inside the loop.
+        """
+        with self._shell_lock:
+            process = self._shell_process
+            output = self._shell_output
+            if process is not None:
+                pending = None
+                yielded = False
+                try:
+                    # printf runs with the command's $? and starts on a fresh line
+                    process.stdin.write(f"{command}; printf '\\n{SHELL_SENTINEL}%d\\n' $?\n")
+                    process.stdin.flush()
+                    while True:
+                        line = self._read_shell_line(output)
+                        if not line:
+                            raise OSError("adb shell exited")
+                        if line.startswith(SHELL_SENTINEL):
+                            break
+                        # Lines go out one behind, since the last carries printf's extra newline
+                        if pending is not None:
+                            yielded = True
+                            yield pending
+                        pending = line
+                except GeneratorExit:
+                    # The caller stopped early: consume the rest so the next command starts clean
+                    self._skip_to_sentinel(output)
+                    raise
+                except (OSError, ValueError):
+                    # Includes TimeoutError from a shell that stopped answering
+                    self._close_shell()
+                    if yielded:
+                        raise subprocess.SubprocessError(f"adb shell exited during: {command}")
+                else:
+                    # Drop the newline printf added before the sentinel
+                    if pending is not None and len(pending) > 1:
+                        yield pending[:-1]
+                    status = int(line[len(SHELL_SENTINEL):])
+                    if check and status != 0:
+                        raise subprocess.CalledProcessError(status, command)
+                    return
+        
+        result = subprocess.run(f"adb -s {self.device_id} shell {command}", 
+                               stdout=subprocess.PIPE, 
+                               stderr=subprocess.PIPE, 
+                               check=check, 
+                               text=True,
+                               shell=True)
+        yield from result.stdout.splitlines(keepends=True)
+    
+    @staticmethod
+    def _read_shell_line(output: queue.Queue) -> str:
+        """Return the next persistent shell line ("" at EOF), raising TimeoutError after SHELL_READ_TIMEOUT"""
+        try:
+            return output.get(timeout=SHELL_READ_TIMEOUT)
+        except queue.Empty:
+            raise TimeoutError(f"adb shell silent for {SHELL_READ_TIMEOUT} seconds") from None
+    
+    def _skip_to_sentinel(self, output: queue.Queue) -> None:
+        """Read and discard persistent shell output up to the end of the current command"""
+        try:
+            while True:
+                line = self._read_shell_line(output)
+                if not line:
+                    self._close_shell()
+                    return
+                if line.startswith(SHELL_SENTINEL):
+                    return
+        except (OSError, ValueError):
+            self._close_shell()
+    
+    def _shell(self, command: str, check: bool = True) -> str:
+        """Run a shell command on the device and return its output; see _shell_lines"""
+        return "".join(self._shell_lines(command, check))
+    
     def list_processes(self) -> List[Dict[str, Any]]:
         """List running processes on the connected Android device"""
-        if not self.is_android_connected():
-            return []
-        
         try:
-            # Use ADB to get process list
-            cmd = f"adb -s {self.device_id} shell ps -e"
-            result = subprocess.run(cmd, 
-                                   stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE, 
-                                   check=True, 
-                                   text=True,
-                                   shell=True)
-            
-            processes = []
-            lines = result.stdout.strip().split('\n')
-            
-            # Skip header line
-            for line in lines[1:]:
-                parts = line.split()
-                if len(parts) >= 8:  # Standard ps format
-                    pid = parts[1]
-                    name = parts[-1]  # Process name is typically the last column
-                    
-                    processes.append({
-                        "pid": pid,
-                        "name": name,
-                        "type": "android",
-                        "status": "running"
-                    })
-            
-            return processes
+            return list(self.iter_processes())
         except subprocess.SubprocessError:
             return []
     
+    def iter_processes(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield running processes on the connected Android device.
+        
+        Lines are parsed as adb delivers them, so parsing overlaps the transfer
+        and callers looking for one process can stop early. Raises
+        SubprocessError if the listing fails.
+        """
+        if not self.is_android_connected():
+            return
+        
+        # Use ADB to get process list
+        lines = self._shell_lines("ps -e")
+        
+        # Skip header line, the first one with any text
+        for line in lines:
+            if line.strip():
+                break
+        
+        for line in lines:
+            parts = line.split()
+            if len(parts) >= 8:  # Standard ps format
+                pid = parts[1]
+                name = parts[-1]  # Process name is typically the last column
+                
+                yield {
+                    "pid": pid,
+                    "name": name,
+                    "type": "android",
+                    "status": "running"
+                }
+    
     def attach_to_process(self, pid: str) -> bool:
         """Attach to a process on the Android device"""
         if not self.is_android_connected():
             return False
         
-        # Verify the process exists
-        processes = self.list_processes()
-        for process in processes:
-            if process["pid"] == pid:
-                self.current_pid = pid
-                self.connected = True
-                return True
+        # Verify the process exists, stopping the listing once it is found
+        try:
+            for process in self.iter_processes():
+                if process["pid"] == pid:
+                    self.current_pid = pid
+                    self.connected = True
+                    return True
+        except subprocess.SubprocessError:
+            pass
         
         return False
     
@@ -123,16 +279,10 @@ class AndroidProcessConnector:
             
             # Attempt to read memory using ADB and su (for rooted devices)
             dd_cmd = f"dd if=/proc/{self.current_pid}/mem bs=1 count={size} skip={int(address, 16)} 2>/dev/null | xxd -p"
-            adb_cmd = f"adb -s {self.device_id} shell su -c '{dd_cmd}'"
-            result = subprocess.run(adb_cmd, 
-                                   stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE, 
-                                   check=True, 
-                                   text=True,
-                                   shell=True)
+            output = self._shell(f"su -c '{dd_cmd}'")
             
             # Convert hex string to bytes
-            hex_str = result.stdout.strip().replace("\n", "")
+            hex_str = output.strip().replace("\n", "")
             if hex_str:
                 return bytes.fromhex(hex_str)
             
@@ -163,16 +313,10 @@ class AndroidProcessConnector:
         try:
             # Read memory maps from /proc/{pid}/maps
             cat_cmd = f"cat /proc/{self.current_pid}/maps"
-            adb_cmd = f"adb -s {self.device_id} shell su -c '{cat_cmd}'"
-            result = subprocess.run(adb_cmd, 
-                                   stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE, 
-                                   check=True, 
-                                   text=True,
-                                   shell=True)
+            output = self._shell(f"su -c '{cat_cmd}'")
             
             regions = []
-            lines = result.stdout.strip().split('\n')
+            lines = output.strip().split('\n')
             
             for line in lines:
                 parts = line.split()
@@ -210,15 +354,10 @@ class AndroidProcessConnector:
         
         try:
             # Try running a command that requires root
-            adb_cmd = f"adb -s {self.device_id} shell su -c 'id'"
-            result = subprocess.run(adb_cmd, 
-                                   stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE, 
-                                   text=True,
-                                   shell=True)
+            output = self._shell("su -c 'id'", check=False)
             
             # If command succeeds and contains "uid=0", the device is rooted
-            return "uid=0" in result.stdout
+            return "uid=0" in output
         except subprocess.SubprocessError:
             return False
     
@@ -228,15 +367,9 @@ class AndroidProcessConnector:
             return "Unknown"
         
         try:
-            adb_cmd = f"adb -s {self.device_id} shell getprop ro.build.version.release"
-            result = subprocess.run(adb_cmd, 
-                                   stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE, 
-                                   check=True, 
-                                   text=True,
-                                   shell=True)
+            output = self._shell("getprop ro.build.version.release")
             
-            return result.stdout.strip()
+            return output.strip()
         except subprocess.SubprocessError:
             return "Unknown"
             
@@ -247,17 +380,28 @@ class AndroidProcessConnector:
         
     def is_shizuku_available(self) -> bool:
         """Check if Shizuku is available on the device"""
+        # Reuse a recent answer so repeated UI polling doesn't fork adb each time
+        now = time.monotonic()
+        if self._shizuku_cached is not None and now - self._shizuku_cached[0] < SHIZUKU_CHECK_TTL:
+            return self._shizuku_cached[1]
+        
         if not self.is_android_connected():
             return False
             
-        # Use adb to check if Shizuku is installed
-        result = subprocess.run(
-            ["adb", "shell", "pm", "list", "packages", "moe.shizuku.privileged.api"],
-            capture_output=True,
-            text=True
-        )
+        # `pm path` resolves a single package instead of listing every installed one
+        try:
+            result = subprocess.run(
+                ["adb", "shell", "pm", "path", "moe.shizuku.privileged.api"],
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+            available = result.returncode == 0 and "package:" in result.stdout
+        except (subprocess.SubprocessError, FileNotFoundError):
+            available = False
         
-        return "moe.shizuku.privileged.api" in result.stdout
+        self._shizuku_cached = (now, available)
+        return available
         
     def read_memory_shizuku(self, pid: str, address: str, size: int = 8) -> Optional[bytes]:
         """Read memory using Shizuku API rather than root"""
@@ -280,27 +424,6 @@ class AndroidProcessConnector:
         return True
 
 # Helper function to check if running on Android
-
-    def use_shizuku(self) -> bool:
-        """Configure to use Shizuku instead of direct root"""
-        self.using_shizuku = True
-        return True
-        
-    def is_shizuku_available(self) -> bool:
-        """Check if Shizuku is available on the device"""
-        if not self.is_android_connected():
-            return False
-            
-        # Use adb to check if Shizuku is installed
-        result = subprocess.run(
-            ["adb", "shell", "pm", "list", "packages", "moe.shizuku.privileged.api"],
-            capture_output=True,
-            text=True
-        )
-        
-        return "moe.shizuku.privileged.api" in result.stdout
-
-
 def is_running_on_android() -> bool:
     """Check if the current platform is Android"""
     return "android" in platform.platform().lower()
\ No newline at end of file
@@ -7,9 +7,13 @@ from memory_editor import MemoryEditor, MemoryDisplay
 from process_bridge import ProcessBridge, ProcessType
 from memory_ai_assistant import MemoryAIAssistant
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging; DEBUG traces every memory access, so it is opt-in via LOG_LEVEL
+_log_level_name = os.environ.get("LOG_LEVEL", "INFO").upper()
+_log_level = getattr(logging, _log_level_name, None)
+logging.basicConfig(level=_log_level if isinstance(_log_level, int) else logging.INFO)
 logger = logging.getLogger(__name__)
+if not isinstance(_log_level, int):
+    logger.warning("Unknown LOG_LEVEL %r, using INFO", _log_level_name)
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -119,6 +123,15 @@ def get_memory(process_id):
     """API endpoint to get memory values"""
     try:
         format_name = request.args.get('format')
+        limit = request.args.get('limit', type=int)
+        if limit is not None:
+            # Paginated read: format only the requested page
+            offset = request.args.get('offset', 0, type=int)
+            if limit < 1 or offset < 0:
+                return jsonify({"success": False, "error": "limit must be at least 1 and offset at least 0"}), 400
+            page = next(memory_editor.iter_process_memory(process_id, format_name, chunk_size=limit, offset=offset), {})
+            next_offset = offset + len(page) if len(page) == limit else None
+            return jsonify({"success": True, "memory": page, "next_offset": next_offset})
         memory_map = memory_editor.read_process_memory(process_id, format_name)
         return jsonify({"success": True, "memory": memory_map})
     except Exception as e:
@@ -189,7 +202,7 @@ def get_registers(process_id):
     """API endpoint to get CPU registers"""
     try:
         registers = memory_editor.get_process_registers(process_id)
-        return jsonify({"success": True, "registers": registers})
+        return jsonify({"success": True, "registers": dict(registers)})
     except Exception as e:
         logger.error(f"Error getting registers: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -323,7 +336,7 @@ def step_instruction(process_id):
             instructions = memory_editor.get_process_instructions(process_id)
             return jsonify({
                 "success": True, 
-                "registers": registers,
+                "registers": dict(registers),
                 "instructions": [
                     {
                         "address": instr.address,
@@ -352,7 +365,7 @@ def run_until_breakpoint(process_id):
             instructions = memory_editor.get_process_instructions(process_id)
             return jsonify({
                 "success": True, 
-                "registers": registers,
+                "registers": dict(registers),
                 "instructions": [
                     {
                         "address": instr.address,
@@ -477,6 +490,7 @@ def delete_process(process_id):
     """API endpoint to delete a simulated process"""
     try:
         process_simulator.delete_process(process_id)
+        memory_editor.detach(process_id)
         return jsonify({"success": True})
     except Exception as e:
         logger.error(f"Error deleting process: {e}")
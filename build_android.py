@@ -770,12 +770,7 @@ class NativeMemoryAccess {
     
     print("Native code files created successfully.")
 
-def create_readme():
-    """Create a README file for the Android version."""
-    readme_path = ANDROID_DIR / "README.md"
-    
-    with open(readme_path, 'w') as f:
-        f.write("""
+ANDROID_README = b"""
 # Memory Debugger Android
 
 This is the Android version of Memory Debugger, which allows you to inspect and modify memory of processes on Android devices.
@@ -825,7 +820,13 @@ If you encounter issues:
 ## License
 
 See the LICENSE file in the root directory for licensing information.
-        """.strip())
+        """.strip()
+
+def create_readme():
+    """Create a README file for the Android version."""
+    readme_path = ANDROID_DIR / "README.md"
+    
+    readme_path.write_bytes(ANDROID_README)
 
 def main():
     """Create the Android version of Memory Debugger."""
@@ -0,0 +1,257 @@
+#include <jni.h>
+#include <string>
+#include <vector>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+#include <cstdint>
+#include <mutex>
+#include <fcntl.h>
+#include <unistd.h>
+#include <android/log.h>
+
+#if defined(__aarch64__)
+#include <arm_neon.h>
+#endif
+
+#define LOGD(...) __android_log_print(ANDROID_LOG_DEBUG, "MemoryDebuggerNative", __VA_ARGS__)
+#define LOGE(...) __android_log_print(ANDROID_LOG_ERROR, "MemoryDebuggerNative", __VA_ARGS__)
+
+static inline int hex_nibble(unsigned char c) {
+    if (c >= '0' && c <= '9') return c - '0';
+    c |= 0x20;
+    if (c >= 'a' && c <= 'f') return c - 'a' + 10;
+    return -1;
+}
+
+// Decode a hex string into raw bytes. On ARM64 16 hex chars are decoded per
+// iteration with NEON; the tail (and other architectures) use the scalar loop.
+// A trailing odd character is decoded as a single low nibble.
+static bool decode_hex(const std::string& hex, std::vector<char>& out) {
+    size_t len = hex.size();
+    out.resize((len + 1) / 2);
+    const uint8_t* src = reinterpret_cast<const uint8_t*>(hex.data());
+    uint8_t* dst = reinterpret_cast<uint8_t*>(out.data());
+    size_t i = 0;
+
+#if defined(__aarch64__)
+    const uint8x16_t ascii_zero = vdupq_n_u8('0');
+    const uint8x16_t ascii_a = vdupq_n_u8('a');
+    const uint8x16_t lower_bit = vdupq_n_u8(0x20);
+    const uint8x16_t nine = vdupq_n_u8(9);
+    const uint8x16_t five = vdupq_n_u8(5);
+    const uint8x16_t ten = vdupq_n_u8(10);
+    for (; i + 16 <= len; i += 16) {
+        uint8x16_t chars = vld1q_u8(src + i);
+        uint8x16_t digits = vsubq_u8(chars, ascii_zero);
+        uint8x16_t is_digit = vcleq_u8(digits, nine);
+        uint8x16_t letters = vsubq_u8(vorrq_u8(chars, lower_bit), ascii_a);
+        uint8x16_t is_letter = vcleq_u8(letters, five);
+        if (vminvq_u8(vorrq_u8(is_digit, is_letter)) != 0xFF) {
+            return false;
+        }
+        uint8x16_t nibbles = vbslq_u8(is_digit, digits, vaddq_u8(letters, ten));
+        uint8x16_t high = vuzp1q_u8(nibbles, nibbles);
+        uint8x16_t low = vuzp2q_u8(nibbles, nibbles);
+        uint8x16_t bytes = vorrq_u8(vshlq_n_u8(high, 4), low);
+        vst1_u8(dst + i / 2, vget_low_u8(bytes));
+    }
+#endif
+
+    for (; i + 1 < len; i += 2) {
+        int high = hex_nibble(src[i]);
+        int low = hex_nibble(src[i + 1]);
+        if (high < 0 || low < 0) {
+            return false;
+        }
+        dst[i / 2] = static_cast<uint8_t>((high << 4) | low);
+    }
+    if (i < len) {
+        int low = hex_nibble(src[i]);
+        if (low < 0) {
+            return false;
+        }
+        dst[i / 2] = static_cast<uint8_t>(low);
+    }
+    return true;
+}
+
+// Most recently written pid and its open /proc/<pid>/mem descriptor, so bursts
+// of writes to the same process skip the open/close pair.
+static std::mutex g_mem_fd_mutex;
+static std::string g_mem_fd_pid;
+static int g_mem_fd = -1;
+
+static bool write_process_memory(const std::string& pid, unsigned long long address,
+                                 const std::vector<char>& buffer) {
+    std::lock_guard<std::mutex> lock(g_mem_fd_mutex);
+    for (int attempt = 0; attempt < 2; attempt++) {
+        if (g_mem_fd < 0 || g_mem_fd_pid != pid) {
+            if (g_mem_fd >= 0) {
+                close(g_mem_fd);
+            }
+            std::string mem_path = "/proc/" + pid + "/mem";
+            g_mem_fd = open(mem_path.c_str(), O_WRONLY | O_CLOEXEC);
+            g_mem_fd_pid = pid;
+            if (g_mem_fd < 0) {
+                LOGE("Failed to open memory file for writing: %s", mem_path.c_str());
+                return false;
+            }
+        }
+        
+        ssize_t written = pwrite64(g_mem_fd, buffer.data(), buffer.size(), static_cast<off64_t>(address));
+        if (written == static_cast<ssize_t>(buffer.size())) {
+            return true;
+        }
+        
+        // The cached descriptor may belong to a process that has since exited; reopen once
+        close(g_mem_fd);
+        g_mem_fd = -1;
+    }
+    return false;
+}
+
+extern "C" {
+    // Note: These functions require root access to work on Android
+    
+    JNIEXPORT jstring JNICALL
+    Java_com_memorydebugger_app_NativeMemoryAccess_listProcessesNative(JNIEnv *env, jobject /* this */) {
+        LOGD("Listing processes from native code");
+        
+        std::string result = "[]";
+        try {
+            // On Linux/Android, we can read process list from /proc
+            std::vector<std::string> processes;
+            
+            // This requires root on modern Android
+            std::ifstream proc_dir("/proc");
+            if (!proc_dir.is_open()) {
+                LOGE("Failed to open /proc directory");
+                return env->NewStringUTF(result.c_str());
+            }
+            
+            std::string line;
+            while (std::getline(proc_dir, line)) {
+                // Check if line is a number (PID)
+                if (std::all_of(line.begin(), line.end(), ::isdigit)) {
+                    // Read process name from /proc/[pid]/comm
+                    std::string comm_path = "/proc/" + line + "/comm";
+                    std::ifstream comm_file(comm_path);
+                    
+                    if (comm_file.is_open()) {
+                        std::string process_name;
+                        std::getline(comm_file, process_name);
+                        
+                        // Add to JSON array
+                        processes.push_back("{\"pid\":\"" + line + "\",\"name\":\"" + process_name + "\"}");
+                    }
+                }
+            }
+            
+            // Create JSON array
+            result = "[" + (processes.empty() ? "" : processes[0]);
+            for (size_t i = 1; i < processes.size(); i++) {
+                result += "," + processes[i];
+            }
+            result += "]";
+            
+        } catch (const std::exception& e) {
+            LOGE("Exception in listProcessesNative: %s", e.what());
+        }
+        
+        return env->NewStringUTF(result.c_str());
+    }
+    
+    JNIEXPORT jstring JNICALL
+    Java_com_memorydebugger_app_NativeMemoryAccess_readMemoryNative(
+            JNIEnv *env, jobject /* this */,
+            jstring j_pid, jstring j_address, jint size) {
+        
+        const char* pid_str = env->GetStringUTFChars(j_pid, nullptr);
+        const char* address_str = env->GetStringUTFChars(j_address, nullptr);
+        
+        LOGD("Reading memory: PID %s, Address %s, Size %d", pid_str, address_str, size);
+        
+        std::string result = "null";
+        try {
+            // Parse address as hex
+            unsigned long long address;
+            std::stringstream ss;
+            ss << std::hex << address_str;
+            ss >> address;
+            
+            // Open process memory
+            std::string mem_path = "/proc/" + std::string(pid_str) + "/mem";
+            std::ifstream mem_file(mem_path, std::ios::binary);
+            
+            if (!mem_file.is_open()) {
+                LOGE("Failed to open memory file: %s", mem_path.c_str());
+            } else {
+                // Seek to address
+                mem_file.seekg(address);
+                
+                // Read memory
+                std::vector<char> buffer(size);
+                mem_file.read(buffer.data(), size);
+                
+                // Convert to hex string
+                std::stringstream hex_ss;
+                hex_ss << std::hex << std::setfill('0');
+                for (int i = 0; i < size && mem_file.good(); i++) {
+                    hex_ss << std::setw(2) << static_cast<int>(buffer[i] & 0xFF);
+                }
+                
+                result = "\"" + hex_ss.str() + "\"";
+            }
+            
+        } catch (const std::exception& e) {
+            LOGE("Exception in readMemoryNative: %s", e.what());
+        }
+        
+        env->ReleaseStringUTFChars(j_pid, pid_str);
+        env->ReleaseStringUTFChars(j_address, address_str);
+        
+        return env->NewStringUTF(result.c_str());
+    }
+    
+    JNIEXPORT jboolean JNICALL
+    Java_com_memorydebugger_app_NativeMemoryAccess_writeMemoryNative(
+            JNIEnv *env, jobject /* this */,
+            jstring j_pid, jstring j_address, jstring j_value) {
+        
+        const char* pid_str = env->GetStringUTFChars(j_pid, nullptr);
+        const char* address_str = env->GetStringUTFChars(j_address, nullptr);
+        const char* value_str = env->GetStringUTFChars(j_value, nullptr);
+        
+        LOGD("Writing memory: PID %s, Address %s, Value %s", pid_str, address_str, value_str);
+        
+        bool success = false;
+        try {
+            // Parse address as hex
+            unsigned long long address;
+            std::stringstream addr_ss;
+            addr_ss << std::hex << address_str;
+            addr_ss >> address;
+            
+            // Parse hex value
+            std::string value_hex = value_str;
+            std::vector<char> buffer;
+            
+            if (!decode_hex(value_hex, buffer)) {
+                throw std::invalid_argument("invalid hex value");
+            }
+            
+            // Write memory with a single pwrite on /proc/<pid>/mem
+            success = write_process_memory(pid_str, address, buffer);
+            
+        } catch (const std::exception& e) {
+            LOGE("Exception in writeMemoryNative: %s", e.what());
+        }
+        
+        env->ReleaseStringUTFChars(j_pid, pid_str);
+        env->ReleaseStringUTFChars(j_address, address_str);
+        env->ReleaseStringUTFChars(j_value, value_str);
+        
+        return success;
+    }
+}
\ No newline at end of file
@@ -14,12 +14,59 @@ import tempfile
 import json
 import zipfile
 
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
 # Define the base directories
 CURRENT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 ANDROID_DIR = CURRENT_DIR / "android_app"
 BUILD_FILES_DIR = CURRENT_DIR / "build_android_files"
 APK_OUTPUT_DIR = CURRENT_DIR / "builds"
 
+# Patterns used to patch android_process_connector.py (matched against raw bytes)
+# The connector already carries the Shizuku methods once this is defined
+_SHIZUKU_MARKER_RE = re.compile(rb"def is_shizuku_available\b")
+_CONNECTOR_CLASS_RE = re.compile(rb"class AndroidProcessConnector:")
+_CONNECTOR_INIT_RE = re.compile(rb"def __init__\(self\):.*?(\n\s+\w+|\n\w+)", re.DOTALL)
+_CONNECTOR_END_RE = re.compile(rb"def is_running_on_android\(\)")
+
+# Launcher icon mipmap directories and sizes, largest first so each resize
+# can start from the previous (already reduced) image
+MIPMAP_RESIZE_CHAIN = (
+    ("mipmap-xxxhdpi", 192),
+    ("mipmap-xxhdpi", 144),
+    ("mipmap-xhdpi", 96),
+    ("mipmap-hdpi", 72),
+    ("mipmap-mdpi", 48),
+)
+
+# Placeholder entries for the development APK
+_DUMMY_APK_MANIFEST = b"Manifest-Version: 1.0\nCreated-By: Memory Debugger Build Script\n"
+_DUMMY_APK_DEX = b"This is a placeholder for DEX file"
+_DUMMY_APK_ANDROID_MANIFEST = b"This is a placeholder for AndroidManifest.xml"
+_DUMMY_APK_RESOURCES = b"This is a placeholder for resources.arsc"
+
+def _scandir_files(roots):
+    """Yield (root, DirEntry) for every file under each root that passes its filter.
+
+    roots is a list of (root_dir, filter_callable) pairs. Missing roots are skipped.
+    DirEntry caches the file type from readdir, so no extra stat() per entry.
+    """
+    for root, accept in roots:
+        if not os.path.isdir(root):
+            continue
+        stack = [os.fspath(root)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file() and accept(entry):
+                        yield root, entry
+
 def setup_android_project():
     """Set up the Android project structure."""
     print("Setting up Android project structure...")
@@ -108,21 +155,23 @@ def copy_build_files():
     src_static_dir = CURRENT_DIR / "static"
     src_templates_dir = CURRENT_DIR / "templates"
     
-    if src_static_dir.exists():
-        for file in src_static_dir.glob("**/*"):
-            if file.is_file():
-                dest_file = assets_dir / file.relative_to(src_static_dir)
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy(file, dest_file)
-                print(f"Copied {file} to {dest_file}")
-    
-    if src_templates_dir.exists():
-        for file in src_templates_dir.glob("**/*.html"):
-            if file.is_file():
-                dest_file = assets_dir / file.name
-                shutil.copy(file, dest_file)
-                print(f"Copied {file} to {dest_file}")
-    
+    # Walk static/ and templates/ in a single scandir pass; static keeps its
+    # directory layout, templates are flattened into the assets root
+    created_dirs = set()
+    for root, entry in _scandir_files([
+        (src_static_dir, lambda e: True),
+        (src_templates_dir, lambda e: e.name.endswith(".html")),
+    ]):
+        if root == src_static_dir:
+            dest_file = assets_dir / os.path.relpath(entry.path, root)
+        else:
+            dest_file = assets_dir / entry.name
+        if dest_file.parent not in created_dirs:
+            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(dest_file.parent)
+        shutil.copy(entry.path, dest_file)
+        print(f"Copied {entry.path} to {dest_file}")
+
     # Also create a basic index.html if none exists
     index_html_path = assets_dir / "index.html"
     if not index_html_path.exists():
@@ -639,17 +688,21 @@ zipStorePath=wrapper/dists
         f.write(gradle_wrapper_properties_content.strip())
     
     # Create gradlew and gradlew.bat scripts
+    # gradlew is created executable in one step; fchmod on the open fd also
+    # covers the case where the file already exists (O_CREAT's mode is then ignored)
     gradlew_path = ANDROID_DIR / "gradlew"
-    with open(gradlew_path, 'w') as f:
-        f.write("#!/usr/bin/env sh\n\n# Gradle wrapper script for Unix")
-    
+    fd = os.open(gradlew_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        os.write(fd, b"#!/usr/bin/env sh\n\n# Gradle wrapper script for Unix")
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o755)
+    finally:
+        os.close(fd)
+
     gradlew_bat_path = ANDROID_DIR / "gradlew.bat"
     with open(gradlew_bat_path, 'w') as f:
         f.write("@rem Gradle wrapper script for Windows\n")
-    
-    # Make gradlew executable
-    os.chmod(gradlew_path, 0o755)
-    
+
     print("Gradle build files created successfully.")
 
 def create_native_code():
@@ -676,181 +729,8 @@ target_link_libraries(memorydebugger ${log-lib})
     with open(cmake_path, 'w') as f:
         f.write(cmake_content.strip())
     
-    # Create memory_access.cpp
-    memory_cpp_path = cpp_dir / "memory_access.cpp"
-    memory_cpp_content = """
-#include <jni.h>
-#include <string>
-#include <vector>
-#include <fstream>
-#include <sstream>
-#include <android/log.h>
-
-#define LOGD(...) __android_log_print(ANDROID_LOG_DEBUG, "MemoryDebuggerNative", __VA_ARGS__)
-#define LOGE(...) __android_log_print(ANDROID_LOG_ERROR, "MemoryDebuggerNative", __VA_ARGS__)
-
-extern "C" {
-    // Note: These functions require root access to work on Android
-    
-    JNIEXPORT jstring JNICALL
-    Java_com_memorydebugger_app_NativeMemoryAccess_listProcessesNative(JNIEnv *env, jobject /* this */) {
-        LOGD("Listing processes from native code");
-        
-        std::string result = "[]";
-        try {
-            // On Linux/Android, we can read process list from /proc
-            std::vector<std::string> processes;
-            
-            // This requires root on modern Android
-            std::ifstream proc_dir("/proc");
-            if (!proc_dir.is_open()) {
-                LOGE("Failed to open /proc directory");
-                return env->NewStringUTF(result.c_str());
-            }
-            
-            std::string line;
-            while (std::getline(proc_dir, line)) {
-                // Check if line is a number (PID)
-                if (std::all_of(line.begin(), line.end(), ::isdigit)) {
-                    // Read process name from /proc/[pid]/comm
-                    std::string comm_path = "/proc/" + line + "/comm";
-                    std::ifstream comm_file(comm_path);
-                    
-                    if (comm_file.is_open()) {
-                        std::string process_name;
-                        std::getline(comm_file, process_name);
-                        
-                        // Add to JSON array
-                        processes.push_back("{\\\"pid\\\":\\\"" + line + "\\\",\\\"name\\\":\\\"" + process_name + "\\\"}");
-                    }
-                }
-            }
-            
-            // Create JSON array
-            result = "[" + (processes.empty() ? "" : processes[0]);
-            for (size_t i = 1; i < processes.size(); i++) {
-                result += "," + processes[i];
-            }
-            result += "]";
-            
-        } catch (const std::exception& e) {
-            LOGE("Exception in listProcessesNative: %s", e.what());
-        }
-        
-        return env->NewStringUTF(result.c_str());
-    }
-    
-    JNIEXPORT jstring JNICALL
-    Java_com_memorydebugger_app_NativeMemoryAccess_readMemoryNative(
-            JNIEnv *env, jobject /* this */,
-            jstring j_pid, jstring j_address, jint size) {
-        
-        const char* pid_str = env->GetStringUTFChars(j_pid, nullptr);
-        const char* address_str = env->GetStringUTFChars(j_address, nullptr);
-        
-        LOGD("Reading memory: PID %s, Address %s, Size %d", pid_str, address_str, size);
-        
-        std::string result = "null";
-        try {
-            // Parse address as hex
-            unsigned long long address;
-            std::stringstream ss;
-            ss << std::hex << address_str;
-            ss >> address;
-            
-            // Open process memory
-            std::string mem_path = "/proc/" + std::string(pid_str) + "/mem";
-            std::ifstream mem_file(mem_path, std::ios::binary);
-            
-            if (!mem_file.is_open()) {
-                LOGE("Failed to open memory file: %s", mem_path.c_str());
-            } else {
-                // Seek to address
-                mem_file.seekg(address);
-                
-                // Read memory
-                std::vector<char> buffer(size);
-                mem_file.read(buffer.data(), size);
-                
-                // Convert to hex string
-                std::stringstream hex_ss;
-                hex_ss << std::hex << std::setfill('0');
-                for (int i = 0; i < size && mem_file.good(); i++) {
-                    hex_ss << std::setw(2) << static_cast<int>(buffer[i] & 0xFF);
-                }
-                
-                result = "\\\"" + hex_ss.str() + "\\\"";
-            }
-            
-        } catch (const std::exception& e) {
-            LOGE("Exception in readMemoryNative: %s", e.what());
-        }
-        
-        env->ReleaseStringUTFChars(j_pid, pid_str);
-        env->ReleaseStringUTFChars(j_address, address_str);
-        
-        return env->NewStringUTF(result.c_str());
-    }
-    
-    JNIEXPORT jboolean JNICALL
-    Java_com_memorydebugger_app_NativeMemoryAccess_writeMemoryNative(
-            JNIEnv *env, jobject /* this */,
-            jstring j_pid, jstring j_address, jstring j_value) {
-        
-        const char* pid_str = env->GetStringUTFChars(j_pid, nullptr);
-        const char* address_str = env->GetStringUTFChars(j_address, nullptr);
-        const char* value_str = env->GetStringUTFChars(j_value, nullptr);
-        
-        LOGD("Writing memory: PID %s, Address %s, Value %s", pid_str, address_str, value_str);
-        
-        bool success = false;
-        try {
-            // Parse address as hex
-            unsigned long long address;
-            std::stringstream addr_ss;
-            addr_ss << std::hex << address_str;
-            addr_ss >> address;
-            
-            // Parse hex value
-            std::string value_hex = value_str;
-            std::vector<char> buffer;
-            
-            for (size_t i = 0; i < value_hex.length(); i += 2) {
-                std::string byte_str = value_hex.substr(i, 2);
-                char byte = static_cast<char>(std::stoi(byte_str, nullptr, 16));
-                buffer.push_back(byte);
-            }
-            
-            // Open process memory
-            std::string mem_path = "/proc/" + std::string(pid_str) + "/mem";
-            std::ofstream mem_file(mem_path, std::ios::binary | std::ios::out);
-            
-            if (!mem_file.is_open()) {
-                LOGE("Failed to open memory file for writing: %s", mem_path.c_str());
-            } else {
-                // Seek to address
-                mem_file.seekp(address);
-                
-                // Write memory
-                mem_file.write(buffer.data(), buffer.size());
-                success = mem_file.good();
-            }
-            
-        } catch (const std::exception& e) {
-            LOGE("Exception in writeMemoryNative: %s", e.what());
-        }
-        
-        env->ReleaseStringUTFChars(j_pid, pid_str);
-        env->ReleaseStringUTFChars(j_address, address_str);
-        env->ReleaseStringUTFChars(j_value, value_str);
-        
-        return success;
-    }
-}
-"""
-    
-    with open(memory_cpp_path, 'w') as f:
-        f.write(memory_cpp_content.strip())
+    # Copy memory_access.cpp from the build files
+    shutil.copyfile(BUILD_FILES_DIR / "memory_access.cpp", cpp_dir / "memory_access.cpp")
     
     print("Native code files created successfully.")
 
@@ -864,36 +744,38 @@ def copy_icon():
         print("Icon not found, skipping icon copy.")
         return
     
-    from PIL import Image
-    import io
-    
-    # Dictionary of mipmap directories and their sizes
-    mipmap_sizes = {
-        "mipmap-mdpi": 48,
-        "mipmap-hdpi": 72,
-        "mipmap-xhdpi": 96,
-        "mipmap-xxhdpi": 144,
-        "mipmap-xxxhdpi": 192
-    }
+    if not HAS_PIL:
+        print("Pillow not installed, skipping icon copy.")
+        return
     
     try:
         # Open the source icon
-        img = Image.open(icon_path)
-        
-        # Resize and save the icon for each mipmap directory
-        for mipmap_dir, size in mipmap_sizes.items():
+        # Decode once up front; every resize below works from decoded pixels
+        source = Image.open(icon_path)
+        source.load()
+        current = source.convert("RGBA")
+
+        # Walk the resize chain so each step filters the previous (smaller)
+        # result rather than the full source image
+        for mipmap_dir, size in MIPMAP_RESIZE_CHAIN:
             dest_dir = ANDROID_DIR / "app" / "src" / "main" / "res" / mipmap_dir
             dest_dir.mkdir(parents=True, exist_ok=True)
-            
+
             # Resize the image
-            resized_img = img.resize((size, size), Image.LANCZOS)
-            
-            # Save as ic_launcher.png
-            resized_img.save(dest_dir / "ic_launcher.png")
-            
-            # Save as ic_launcher_round.png (same for simplicity)
-            resized_img.save(dest_dir / "ic_launcher_round.png")
-        
+            current = current.resize((size, size), Image.LANCZOS, reducing_gap=3.0)
+
+            # Save ic_launcher.png once with fast zlib settings, then hardlink
+            # ic_launcher_round.png to it (same image for simplicity)
+            launcher_path = dest_dir / "ic_launcher.png"
+            round_path = dest_dir / "ic_launcher_round.png"
+            current.save(launcher_path, optimize=False, compress_level=1)
+            if round_path.exists():
+                round_path.unlink()
+            try:
+                os.link(launcher_path, round_path)
+            except OSError:
+                shutil.copyfile(launcher_path, round_path)
+
         print("Icon files copied successfully.")
     except Exception as e:
         print(f"Error copying icon: {e}")
@@ -910,50 +792,25 @@ def create_dummy_apk():
     apk_path = APK_OUTPUT_DIR / "MemoryDebugger-dev.apk"
     
     # Create a simple zip file with the Android structure
-    with zipfile.ZipFile(apk_path, 'w') as zipf:
+    # The placeholders are tiny, so store them instead of deflating
+    with zipfile.ZipFile(apk_path, 'w', compression=zipfile.ZIP_STORED) as zipf:
         # Add a META-INF folder with a MANIFEST.MF
-        manifest_content = "Manifest-Version: 1.0\nCreated-By: Memory Debugger Build Script\n"
-        zipf.writestr("META-INF/MANIFEST.MF", manifest_content)
+        zipf.writestr("META-INF/MANIFEST.MF", _DUMMY_APK_MANIFEST)
         
         # Add a simple dex file placeholder
-        zipf.writestr("classes.dex", "This is a placeholder for DEX file")
+        zipf.writestr("classes.dex", _DUMMY_APK_DEX)
         
         # Add AndroidManifest.xml placeholder
-        zipf.writestr("AndroidManifest.xml", "This is a placeholder for AndroidManifest.xml")
+        zipf.writestr("AndroidManifest.xml", _DUMMY_APK_ANDROID_MANIFEST)
         
         # Add a resources placeholder
-        zipf.writestr("resources.arsc", "This is a placeholder for resources.arsc")
+        zipf.writestr("resources.arsc", _DUMMY_APK_RESOURCES)
     
     print(f"Dummy APK created at: {apk_path}")
     
     # Create a readme file explaining how to build the real APK
     readme_path = APK_OUTPUT_DIR / "HOW_TO_BUILD_APK.md"
-    readme_content = """# How to Build the Memory Debugger APK
-
-This is a placeholder APK file. To build the actual APK:
-
-1. Install Android Studio from [developer.android.com](https://developer.android.com/studio)
-2. Open the 'android_app' folder in Android Studio
-3. Wait for Gradle sync to complete
-4. Click on Build > Build Bundle(s) / APK(s) > Build APK(s)
-5. The APK will be generated in 'android_app/app/build/outputs/apk/debug/'
-
-## Requirements
-
-- Android Studio Arctic Fox (2020.3.1) or newer
-- Android SDK 30 or newer
-- Android NDK 21 or newer
-
-## Features in the Full APK
-
-- List running processes on Android devices
-- Read and write memory of processes (requires Shizuku or root)
-- View memory maps of processes
-- Web interface for advanced features
-"""
-    
-    with open(readme_path, 'w') as f:
-        f.write(readme_content)
+    shutil.copyfile(BUILD_FILES_DIR / "HOW_TO_BUILD_APK.md", readme_path)
     
     print(f"Instructions created at: {readme_path}")
 
@@ -962,85 +819,7 @@ def create_readme():
     print("Creating README file...")
     
     readme_path = CURRENT_DIR / "ANDROID_SHIZUKU_README.md"
-    readme_content = """# Memory Debugger with Shizuku Integration
-
-## Overview
-
-This version of Memory Debugger includes Shizuku integration for Android, allowing memory debugging without requiring full root access. Shizuku provides a more controlled and secure way to access process memory while maintaining most of the functionality available in the root-only version.
-
-## What is Shizuku?
-
-Shizuku is a tool that grants apps the ability to run commands with elevated permissions, similar to `adb shell`. It works in two modes:
-
-1. **ADB Mode**: Works on any Android device with USB debugging enabled. Users connect their device to a computer once to set up Shizuku.
-2. **Root Mode**: For rooted devices, Shizuku can start automatically without requiring a computer.
-
-## Features Enabled by Shizuku
-
-- List all running processes on the device
-- Read memory from other app processes
-- Write memory to other app processes (with limitations)
-- View memory maps and regions
-- All done without requiring full root access
-
-## Requirements
-
-- Android 8.0 (API 26) or higher
-- Shizuku app installed from [Google Play](https://play.google.com/store/apps/details?id=moe.shizuku.privileged.api) or [GitHub](https://github.com/RikkaApps/Shizuku/releases)
-- Either:
-  - One-time USB debugging setup with a computer, or
-  - A rooted device
-
-## Setup Instructions
-
-### Setting up Shizuku with ADB (non-rooted devices)
-
-1. Install the Shizuku app from Google Play Store
-2. Enable Developer Options on your device:
-   - Go to Settings > About phone
-   - Tap "Build number" 7 times
-3. Enable USB debugging in Developer Options
-4. Connect your device to a computer
-5. Set up Shizuku by following the app's instructions
-6. Once set up, you can disconnect from the computer
-
-### Setting up Shizuku with Root
-
-1. Install the Shizuku app from Google Play Store
-2. Open the app and select "Start with root"
-3. Grant root access when prompted
-
-## Using Memory Debugger with Shizuku
-
-1. Launch Memory Debugger
-2. Select "Shizuku" as the access method
-3. Tap "Check/Request Permissions"
-4. Grant Shizuku permissions when prompted
-5. Now you can browse processes and perform memory operations
-
-## Limitations
-
-- Some deeply protected system processes may still be inaccessible
-- Performance may be slower than with direct root access
-- On some devices, you may need to restart Shizuku after rebooting
-
-## Troubleshooting
-
-- If Memory Debugger can't connect to Shizuku, try restarting the Shizuku app
-- If you get permission errors, make sure you've granted Shizuku permission to Memory Debugger
-- On some devices, the ADB-based Shizuku may stop working after a system update, requiring reconnection to a computer
-
-## Safety Notes
-
-While Shizuku is safer than full root access, it still provides elevated permissions that could potentially be misused. Only use Memory Debugger on apps you own or have permission to modify.
-
-## Building the App
-
-See the HOW_TO_BUILD_APK.md file in the builds directory for instructions on building the app from source.
-"""
-    
-    with open(readme_path, 'w') as f:
-        f.write(readme_content)
+    shutil.copyfile(BUILD_FILES_DIR / "ANDROID_SHIZUKU_README.md", readme_path)
     
     print(f"README created at: {readme_path}")
 
@@ -1055,12 +834,14 @@ def update_android_process_connector():
         return
     
     # Read the existing file
-    with open(connector_path, 'r') as f:
+    with open(connector_path, 'rb') as f:
         connector_content = f.read()
     
     # Add Shizuku support if not already present
-    if "shizuku_support" not in connector_content.lower():
-        shizuku_additions = """
+    if _SHIZUKU_MARKER_RE.search(connector_content):
+        print("android_process_connector.py already has Shizuku support.")
+    else:
+        shizuku_additions = b"""
     def use_shizuku(self) -> bool:
         \"\"\"Configure to use Shizuku instead of direct root\"\"\"
         self.using_shizuku = True
@@ -1068,40 +849,54 @@ def update_android_process_connector():
         
     def is_shizuku_available(self) -> bool:
         \"\"\"Check if Shizuku is available on the device\"\"\"
+        import time
+        
+        # Reuse a recent answer so repeated UI polling doesn't fork adb each time
+        now = time.monotonic()
+        cached = getattr(self, "_shizuku_cached", None)
+        if cached is not None and now - cached[0] < 5.0:
+            return cached[1]
+        
         if not self.is_android_connected():
             return False
             
-        # Use adb to check if Shizuku is installed
-        result = subprocess.run(
-            ["adb", "shell", "pm", "list", "packages", "moe.shizuku.privileged.api"],
-            capture_output=True,
-            text=True
-        )
-        
-        return "moe.shizuku.privileged.api" in result.stdout
+        # `pm path` resolves a single package instead of listing every installed one
+        try:
+            result = subprocess.run(
+                ["adb", "shell", "pm", "path", "moe.shizuku.privileged.api"],
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+            available = result.returncode == 0 and "package:" in result.stdout
+        except (subprocess.SubprocessError, FileNotFoundError):
+            available = False
+        
+        self._shizuku_cached = (now, available)
+        return available
 """
         
         # Find the class definition
-        class_def_match = re.search(r"class AndroidProcessConnector:", connector_content)
+        class_def_match = _CONNECTOR_CLASS_RE.search(connector_content)
         if class_def_match:
             # Find the end of the __init__ method
-            init_end_match = re.search(r"def __init__\(self\):.*?(\n\s+\w+|\n\w+)", connector_content, re.DOTALL)
+            init_end_match = _CONNECTOR_INIT_RE.search(connector_content)
             if init_end_match:
                 # Update the __init__ method
-                init_update = "def __init__(self):\n        \"\"\"Android-specific implementation to interface with Android app\"\"\"\n        self.adb_path = shutil.which('adb')\n        self.attached_pid = None\n        self.using_shizuku = False  # New flag for Shizuku support"
+                init_update = b"def __init__(self):\n        \"\"\"Android-specific implementation to interface with Android app\"\"\"\n        self.adb_path = shutil.which('adb')\n        self.attached_pid = None\n        self.using_shizuku = False  # New flag for Shizuku support"
                 
                 connector_content = connector_content.replace(
                     connector_content[class_def_match.end():init_end_match.end()],
-                    "\n    " + init_update
+                    b"\n    " + init_update
                 )
             
             # Add the new methods at the end of the class
-            class_end_match = re.search(r"def is_running_on_android\(\)", connector_content)
+            class_end_match = _CONNECTOR_END_RE.search(connector_content)
             if class_end_match:
-                connector_content = connector_content[:class_end_match.start()] + shizuku_additions + "\n\n" + connector_content[class_end_match.start():]
+                connector_content = connector_content[:class_end_match.start()] + shizuku_additions + b"\n\n" + connector_content[class_end_match.start():]
                 
                 # Write the updated content back to the file
-                with open(connector_path, 'w') as f:
+                with open(connector_path, 'wb') as f:
                     f.write(connector_content)
                 
                 print("Updated android_process_connector.py with Shizuku support.")
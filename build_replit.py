@@ -7,18 +7,72 @@ import os
 import sys
 import platform
 import shutil
-import zipfile
 from datetime import datetime
 
-def zip_directory(path, zip_path):
-    """Zip the contents of a directory (path) into a zip file (zip_path)."""
-    print(f"Creating zip archive: {zip_path}")
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, path)
-                zipf.write(file_path, arcname)
+from create_release import read_version, zip_directory
+
+# Files generated into the package, kept as bytes so they are written without encoding
+DEFAULT_REQUIREMENTS = b"""anthropic>=0.49.0
+email-validator>=2.2.0
+flask>=3.1.0
+flask-sqlalchemy>=3.1.1
+gunicorn>=23.0.0
+psutil>=7.0.0
+requests>=2.32.3
+python-dotenv>=1.0.0
+pyinstaller>=6.0.0
+"""
+
+QUICK_START_GUIDE = b"""MEMORY DEBUGGER QUICK START GUIDE
+==============================
+
+Option 1: Run directly
+---------------------
+1. Install Python 3.10 or later if you don't have it already
+2. Install the required dependencies:
+   pip install -r requirements.txt
+3. Copy the .env.example file to .env and edit it to add your Anthropic API key
+4. Run the application:
+   python main.py
+5. Open your web browser and go to http://localhost:5000
+
+Option 2: Build an executable (no Python required to run it)
+-----------------------------------------------------------
+Windows:
+1. Install Python 3.10 or later
+2. Install required dependencies: pip install -r requirements.txt pyinstaller
+3. Run the build script: build_windows.bat
+4. The executable will be created in the 'dist' folder
+5. Double-click dist/MemoryDebugger.exe to run the application
+
+macOS:
+1. Install Python 3.10 or later
+2. Install required dependencies: pip install -r requirements.txt pyinstaller
+3. Make the build script executable: chmod +x build_macos.sh
+4. Run the build script: ./build_macos.sh
+5. The executable will be created in the 'dist' folder
+
+Linux:
+1. Install Python 3.10 or later
+2. Install required dependencies: pip install -r requirements.txt pyinstaller
+3. Make the build script executable: chmod +x build_linux.sh
+4. Run the build script: ./build_linux.sh
+5. The executable will be created in the 'dist' folder
+
+For more detailed instructions, see INSTALLATION.md and README.md
+"""
+
+def link_or_copy(src, dst):
+    """Hardlink src to dst, falling back to a regular copy across filesystems.
+
+    The package directory is only read back for zipping and then removed, so
+    sharing inodes with the source tree is safe and avoids copying any bytes.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+    return dst
 
 def main():
     """Create a Memory Debugger package for distribution."""
@@ -30,17 +84,10 @@ def main():
         os.makedirs(build_dir)
     
     # Get current version from version_info.txt or set default
-    version = "1.0.0"
     try:
-        with open('version_info.txt', 'r') as f:
-            content = f.read()
-            version_search = content.find("filevers=(")
-            if version_search != -1:
-                version_part = content[version_search:content.find(")", version_search)]
-                version_nums = [s for s in version_part.split(',') if s.strip().isdigit()]
-                if len(version_nums) >= 3:
-                    version = '.'.join(version_nums[:3])
-    except Exception as e:
+        version = read_version()
+    except FileNotFoundError as e:
+        version = "1.0.0"
         print(f"Warning: Could not read version info: {e}")
     
     # Create a temporary directory for the files
@@ -76,68 +123,23 @@ def main():
     print("Copying source files...")
     for file in source_files:
         if os.path.exists(file):
-            shutil.copy(file, os.path.join(temp_dir, file))
+            link_or_copy(file, os.path.join(temp_dir, file))
     
     # Copy entire directories
     directories = ['templates', 'static']
     for directory in directories:
         if os.path.exists(directory):
-            shutil.copytree(directory, os.path.join(temp_dir, directory))
+            shutil.copytree(directory, os.path.join(temp_dir, directory),
+                            copy_function=link_or_copy, dirs_exist_ok=True)
     
     # Create a requirements.txt file if it doesn't exist
     if not os.path.exists('requirements.txt'):
-        with open(os.path.join(temp_dir, 'requirements.txt'), 'w') as f:
-            f.write("""anthropic>=0.49.0
-email-validator>=2.2.0
-flask>=3.1.0
-flask-sqlalchemy>=3.1.1
-gunicorn>=23.0.0
-psutil>=7.0.0
-requests>=2.32.3
-python-dotenv>=1.0.0
-pyinstaller>=6.0.0
-""")
+        with open(os.path.join(temp_dir, 'requirements.txt'), 'wb') as f:
+            f.write(DEFAULT_REQUIREMENTS)
     
     # Create the quick start guide
-    with open(os.path.join(temp_dir, 'QUICK_START.txt'), 'w') as f:
-        f.write("""MEMORY DEBUGGER QUICK START GUIDE
-==============================
-
-Option 1: Run directly
----------------------
-1. Install Python 3.10 or later if you don't have it already
-2. Install the required dependencies:
-   pip install -r requirements.txt
-3. Copy the .env.example file to .env and edit it to add your Anthropic API key
-4. Run the application:
-   python main.py
-5. Open your web browser and go to http://localhost:5000
-
-Option 2: Build an executable (no Python required to run it)
------------------------------------------------------------
-Windows:
-1. Install Python 3.10 or later
-2. Install required dependencies: pip install -r requirements.txt pyinstaller
-3. Run the build script: build_windows.bat
-4. The executable will be created in the 'dist' folder
-5. Double-click dist/MemoryDebugger.exe to run the application
-
-macOS:
-1. Install Python 3.10 or later
-2. Install required dependencies: pip install -r requirements.txt pyinstaller
-3. Make the build script executable: chmod +x build_macos.sh
-4. Run the build script: ./build_macos.sh
-5. The executable will be created in the 'dist' folder
-
-Linux:
-1. Install Python 3.10 or later
-2. Install required dependencies: pip install -r requirements.txt pyinstaller
-3. Make the build script executable: chmod +x build_linux.sh
-4. Run the build script: ./build_linux.sh
-5. The executable will be created in the 'dist' folder
-
-For more detailed instructions, see INSTALLATION.md and README.md
-""")
+    with open(os.path.join(temp_dir, 'QUICK_START.txt'), 'wb') as f:
+        f.write(QUICK_START_GUIDE)
     
     # Create the zip file
     date_str = datetime.now().strftime('%Y%m%d')
@@ -145,6 +147,7 @@ For more detailed instructions, see INSTALLATION.md and README.md
     zip_path = os.path.join(build_dir, zip_filename)
     
     # Create the zip archive
+    print(f"Creating zip archive: {zip_path}")
     zip_directory(temp_dir, zip_path)
     
     # Clean up
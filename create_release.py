@@ -8,33 +8,57 @@ import platform
 import subprocess
 import shutil
 import zipfile
+import re
 import glob
 from datetime import datetime
 
+# Formats that are already compressed gain nothing from deflate; store them as-is
+PRECOMPRESSED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.ico', '.zip', '.apk', '.gz', '.whl'}
+
+def iter_files(path):
+    """Recursively yield a DirEntry for every non-directory under path.
+
+    scandir reports the entry type from readdir, so no stat() is needed per entry.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            else:
+                yield entry
+
 def zip_directory(path, zip_path):
     """Zip the contents of a directory (path) into a zip file (zip_path)."""
     with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, path)
-                zipf.write(file_path, arcname)
+        for entry in iter_files(path):
+            arcname = os.path.relpath(entry.path, path)
+            if os.path.splitext(entry.name)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+                zipf.write(entry.path, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                zipf.write(entry.path, arcname)
+
+def read_version(path='version_info.txt', default="1.0.0"):
+    """Return the major.minor.patch version from the filevers tuple in path, or default.
+
+    Raises FileNotFoundError if path does not exist.
+    """
+    with open(path, 'r') as f:
+        content = f.read()
+    # A missing marker leaves rest empty, so no sentinel checks are needed
+    _, _, rest = content.partition("filevers=(")
+    version_part, _, _ = rest.partition(")")
+    version_nums = re.findall(r"\d+", version_part)
+    if len(version_nums) >= 3:
+        return '.'.join(version_nums[:3])
+    return default
 
 def main():
     """Create release packages for Memory Debugger application."""
     # Get current version from version_info.txt or set default
-    version = "1.0.0"
     try:
-        with open('version_info.txt', 'r') as f:
-            content = f.read()
-            version_search = content.find("filevers=(")
-            if version_search != -1:
-                version_part = content[version_search:content.find(")", version_search)]
-                version_nums = [s for s in version_part.split(',') if s.strip().isdigit()]
-                if len(version_nums) >= 3:
-                    version = '.'.join(version_nums[:3])
-    except:
-        pass
+        version = read_version()
+    except FileNotFoundError:
+        version = "1.0.0"
     
     # Create release directory
     release_dir = os.path.join('releases')
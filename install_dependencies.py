@@ -15,9 +15,6 @@ def main():
     # Determine platform-specific details
     system = platform.system()
     
-    # Make sure pip is up to date
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "pip"])
-    
     # Base dependencies
     dependencies = [
         "anthropic",
@@ -25,6 +22,7 @@ def main():
         "flask",
         "flask-sqlalchemy",
         "gunicorn",
+        "waitress",  # Production WSGI server for packaged builds
         "psutil",
         "requests",
         "python-dotenv",
@@ -40,9 +38,24 @@ def main():
     elif system == "Darwin":  # macOS
         dependencies.append("psycopg2-binary")
     
-    # Install dependencies
+    # Optionally swap in Pillow-SIMD (same API, SIMD resize kernels) for faster
+    # icon generation. It builds from source and conflicts with stock Pillow,
+    # so it is opt-in and stock Pillow is removed first.
+    if os.environ.get("MEMDBG_PILLOW_SIMD") == "1":
+        subprocess.call([sys.executable, "-m", "pip", "uninstall", "-y", "pillow"])
+        dependencies[dependencies.index("pillow")] = "pillow-simd"
+    
+    # Install dependencies (and upgrade pip) in a single resolver pass,
+    # preferring prebuilt wheels so nothing is compiled from source
     print(f"Installing the following packages: {', '.join(dependencies)}")
-    subprocess.check_call([sys.executable, "-m", "pip", "install"] + dependencies)
+    env = {**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1", "PIP_NO_INPUT": "1"}
+    pip_install = [sys.executable, "-m", "pip", "install", "--upgrade", "--prefer-binary"]
+    try:
+        subprocess.check_call(pip_install + ["--only-binary=:all:", "pip"] + dependencies, env=env)
+    except subprocess.CalledProcessError:
+        # Some package has no wheel for this platform; allow source builds
+        print("Wheel-only install failed, retrying with source builds allowed...")
+        subprocess.check_call(pip_install + ["pip"] + dependencies, env=env)
     
     print("\nDependencies installed successfully!")
     print("You can now run the build scripts:")
@@ -1,5 +1,7 @@
 import os
 import sys
+import socket
+import subprocess
 import webbrowser
 import threading
 import time
@@ -15,9 +17,33 @@ load_dotenv(verbose=True)
 # running from a PyInstaller-created bundle. IDE/linters will flag it
 # as an error, but it works correctly at runtime.
 
+def wait_for_server(host="localhost", port=5000, timeout=10.0):
+    """Poll until the server accepts connections or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.05):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+def launch_browser(url):
+    """Open url with the platform's launcher, skipping webbrowser's browser probing."""
+    if sys.platform == "win32":
+        os.startfile(url)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", url])
+    else:
+        try:
+            subprocess.Popen(["xdg-open", url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            # No xdg-open (minimal desktop); let webbrowser find something
+            webbrowser.open(url)
+
 def open_browser():
-    """Open the web browser after a short delay to ensure the server is running."""
-    time.sleep(1.5)
+    """Open the web browser once the server is accepting connections."""
+    wait_for_server()
     url = "http://localhost:5000"
     # Print instructions to console
     print("\n" + "=" * 60)
@@ -28,11 +54,23 @@ def open_browser():
     print("=" * 60 + "\n")
     
     try:
-        webbrowser.open(url)
+        launch_browser(url)
     except Exception as e:
         print(f"Failed to open browser automatically: {e}")
         print(f"Please manually navigate to {url}")
 
+def run_server(host, port):
+    """Serve the app with waitress in packaged builds, Werkzeug otherwise."""
+    if getattr(sys, 'frozen', False):
+        try:
+            from waitress import serve
+        except ImportError:
+            logging.warning("waitress not bundled, falling back to the development server")
+        else:
+            serve(app, host=host, port=port, threads=8, ident=None, _quiet=True)
+            return
+    app.run(host=host, port=port)
+
 if __name__ == "__main__":
     # Check if we're running as a packaged application
     if getattr(sys, 'frozen', False):
@@ -53,7 +91,7 @@ if __name__ == "__main__":
         app.debug = True
     
     try:
-        app.run(host="0.0.0.0", port=5000)
+        run_server(host="0.0.0.0", port=5000)
     except Exception as e:
         logging.error(f"Error starting server: {e}")
         print(f"Error: {e}")
@@ -6,29 +6,537 @@ to interact with the memory editor using natural language commands.
 """
 
 import anthropic
+import hashlib
 import json
 import logging
 import re
 import os
 import sys
-from typing import Dict, Any, List, Optional, Tuple
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, List, Literal, Optional, Tuple
 
-# Configure logging
-logging.basicConfig(level=logging.INFO,
-                   format='%(asctime)s - %(levelname)s - %(message)s')
+# Optional local embedding model for the semantic query cache
+try:
+    import numpy
+    from sentence_transformers import SentenceTransformer
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    HAS_SENTENCE_TRANSFORMERS = False
+
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
-# Get API key from environment variable
-anthropic_key = os.environ.get('ANTHROPIC_API_KEY')
-if not anthropic_key:
-    logger.warning("ANTHROPIC_API_KEY environment variable not set")
-    logger.info("AI assistant features will be disabled")
-    # The application will still run, but AI features will be gracefully disabled
-    print("=" * 80)
-    print("NOTE: Anthropic API key not found. AI assistant features are disabled.")
-    print("To enable AI features, set the ANTHROPIC_API_KEY environment variable.")
-    print("See .env.example for configuration instructions.")
-    print("=" * 80)
+_missing_key_reported = False
+
+def get_api_key() -> Optional[str]:
+    """
+    Read the Anthropic API key from the environment.
+    
+    The key is read when a provider is created rather than at import, so
+    importing this module does no work and the key can be set late.
+    """
+    global _missing_key_reported
+    key = os.environ.get('ANTHROPIC_API_KEY')
+    if not key and not _missing_key_reported:
+        _missing_key_reported = True
+        logger.warning("ANTHROPIC_API_KEY environment variable not set")
+        logger.info("AI assistant features will be disabled")
+        # The application will still run, but AI features will be gracefully disabled
+        print("=" * 80)
+        print("NOTE: Anthropic API key not found. AI assistant features are disabled.")
+        print("To enable AI features, set the ANTHROPIC_API_KEY environment variable.")
+        print("See .env.example for configuration instructions.")
+        print("=" * 80)
+    return key
+
+class LLMCache:
+    """
+    Exact-match cache for LLM responses.
+    
+    Only deterministic requests (temperature 0) are cached, keyed by a hash of
+    everything that determines the response. Entries expire after ttl seconds
+    and the least recently used entry is evicted once maxsize is reached.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+    
+    @staticmethod
+    def cache_key(model: str, system: Any, messages: List[Dict[str, Any]],
+                  max_tokens: int, temperature: float) -> Optional[str]:
+        """Return the cache key for a request, or None if it isn't cacheable."""
+        if temperature > 0:
+            return None
+        payload = json.dumps({
+            "model": model,
+            "system": system,
+            "messages": messages,
+            "max_tokens": max_tokens
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: Optional[str]) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+    
+    def set(self, key: Optional[str], value: str) -> None:
+        """Store a response under key (no-op for uncacheable requests)."""
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+# Shared by all assistant instances
+response_cache = LLMCache()
+
+_embed_models: Dict[str, Any] = {}
+_embed_models_lock = threading.Lock()
+
+def get_embed_model(model_name: str):
+    """
+    Return the process-wide embedding model, loading it on first use.
+    
+    Loading takes around half a second and the weights are large, so every
+    cache and assistant instance shares one copy per model name. Linear
+    layers are quantized to int8 unless AI_EMBEDDING_QUANTIZE=0.
+    """
+    with _embed_models_lock:
+        model = _embed_models.get(model_name)
+        if model is None:
+            model = SentenceTransformer(model_name, device="cpu")
+            if os.environ.get('AI_EMBEDDING_QUANTIZE', '1') != '0':
+                model = _quantize_embed_model(model)
+            _embed_models[model_name] = model
+        return model
+
+def _quantize_embed_model(model):
+    """Apply dynamic int8 quantization to the model's Linear layers, if possible."""
+    try:
+        import torch
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        logger.warning("Embedding model quantization failed, using full precision: %s", e)
+        return model
+
+class SemanticCache:
+    """
+    Cache of query interpretations matched by embedding similarity.
+    
+    Paraphrases such as "find 100" and "search for value 100" map to the same
+    interpretation. A hit also requires the same process and exactly the same
+    literals (numbers, addresses, quoted strings), since queries that differ
+    only in a value embed almost identically but must not share an answer.
+    Disabled when sentence-transformers is not installed.
+    """
+    
+    def __init__(self, threshold: float = 0.92, maxsize: int = 256,
+                 model_name: Optional[str] = None):
+        self.threshold = threshold
+        self.model_name = model_name or os.environ.get('AI_EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+        self.enabled = HAS_SENTENCE_TRANSFORMERS
+        self._entries = deque(maxlen=maxsize)  # (process_id, literals, embedding, interpretation)
+        self._lock = threading.Lock()
+    
+    def _embed(self, query: str):
+        return get_embed_model(self.model_name).encode(query, normalize_embeddings=True)
+    
+    def lookup(self, query: str, process_id: str) -> Optional[str]:
+        """Return a cached interpretation for an equivalent query, or None."""
+        if not self.enabled:
+            return None
+        literals = tuple(_QUERY_LITERAL_RE.findall(query))
+        with self._lock:
+            candidates = [entry for entry in self._entries
+                          if entry[0] == process_id and entry[1] == literals]
+            if not candidates:
+                return None
+            query_embedding = self._embed(query)
+        scores = numpy.dot(numpy.vstack([entry[2] for entry in candidates]), query_embedding)
+        best = int(numpy.argmax(scores))
+        if scores[best] >= self.threshold:
+            return candidates[best][3]
+        return None
+    
+    def add(self, query: str, process_id: str, interpretation: str) -> None:
+        """Remember the interpretation produced for a query."""
+        if not self.enabled:
+            return
+        literals = tuple(_QUERY_LITERAL_RE.findall(query))
+        with self._lock:
+            self._entries.append((process_id, literals, self._embed(query), interpretation))
+
+# Numbers, hex addresses and quoted strings that must match for a semantic cache hit
+_QUERY_LITERAL_RE = re.compile(r'0x[0-9a-fA-F]+|[-+]?\d+(?:\.\d+)?|"[^"]*"')
+
+# Shared by all assistant instances
+semantic_cache = SemanticCache()
+
+# Patterns used to parse queries and AI responses
+_ADDR_RE = re.compile(r'0x[0-9a-fA-F]+|[0-9a-fA-F]{8,16}')
+_INT_RE = re.compile(r'[-+]?\d+')
+_FLOAT_RE = re.compile(r'[-+]?\d+\.\d+')
+_STR_RE = re.compile(r'"([^"]*)"')
+_JSON_FENCE_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_JSON_BRACE_RE = re.compile(r'({.*})', re.DOTALL)
+_FIND_VERB_RE = re.compile(r'\b(?:find|search|where is)\b', re.IGNORECASE)
+_CHANGE_VERB_RE = re.compile(r'\b(?:change|set|modify)\b', re.IGNORECASE)
+
+# What may stand between the numbers of an explicit list: "100, 200 and 300"
+_LIST_SEPARATOR_RE = re.compile(r'\s*(?:,\s*(?:and\s+)?|and\s+)', re.IGNORECASE)
+
+def _int_literal(literal: str) -> int:
+    """Convert a decimal or 0x-prefixed query literal to an int"""
+    return int(literal, 16) if literal.startswith('0x') else int(literal)
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+def get_shared_client(api_key: str) -> "anthropic.Anthropic":
+    """
+    Return the process-wide Anthropic client, creating it on first use.
+    
+    Sharing one client lets every assistant instance reuse the same HTTP
+    connection pool instead of paying a TCP/TLS handshake per instance.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            # The SDK retries connection errors, 408/409/429 and 5xx responses
+            # with exponential backoff (honouring retry-after headers)
+            _shared_client = anthropic.Anthropic(
+                api_key=api_key,
+                timeout=anthropic.Timeout(30.0, connect=5.0, write=10.0, pool=5.0),
+                max_retries=int(os.environ.get('ANTHROPIC_MAX_RETRIES', '4'))
+            )
+        return _shared_client
+
+# Seconds to wait for the interpretation request before falling back to local parsing
+INTERPRETATION_TIMEOUT = float(os.environ.get('AI_INTERPRETATION_TIMEOUT', '8'))
+_interpretation_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-interpret")
+
+# Conversation turns kept verbatim, and how many of the oldest are folded
+# into the rolling summary once that limit is reached
+HISTORY_MAXLEN = 20
+HISTORY_SUMMARIZE_BATCH = 10
+# Earlier queries mentioned in the rolling summary
+HISTORY_SUMMARY_QUERIES = 20
+# Most recent exchanges sent with each request for context
+CONTEXT_EXCHANGES = 3
+
+# Static part of the system prompt, sent as a prompt-cache breakpoint
+SYSTEM_PROMPT = ("You are a memory debugging assistant specialized in helping users find and modify values in computer memory. "
+                 "When asked to interpret a request, respond with properly formatted JSON.")
+
+# Schema of the structured interpretation of a user query
+MEMORY_ACTION_TOOL = {
+    "name": "memory_action",
+    "description": "Record the memory debugging action the user asked for.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "action": {"enum": ["find", "change"]},
+            "address": {"type": "string", "description": "Memory address to modify, e.g. 0x401000"},
+            "value": {"description": "Value to search for or write; a list of values to find several at once"},
+            "data_type": {"enum": ["int", "float", "string"]}
+        },
+        "required": ["action"]
+    }
+}
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a JSON object from model output, tolerating markdown fences and prose.
+    
+    Returns:
+        The parsed object, or None if the text doesn't contain one
+    """
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        json_match = _JSON_FENCE_RE.search(text) or _JSON_BRACE_RE.search(text)
+        if not json_match:
+            return None
+        try:
+            data = json.loads(json_match.group(1))
+        except json.JSONDecodeError:
+            return None
+    return data if isinstance(data, dict) else None
+
+# Receives streamed response text; returning True stops the stream
+TokenCallback = Callable[[str], Optional[bool]]
+
+class JsonObjectTracker:
+    """
+    Follow streamed text and report when the first JSON object has closed.
+    
+    Tracks brace depth, ignoring braces inside strings, so a streamed
+    interpretation can be cut off as soon as the object is complete.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume a chunk of text and return True once the object is complete."""
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = self.started
+            elif char == '{':
+                self.depth += 1
+                self.started = True
+            elif char == '}' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+class LLMProviderError(Exception):
+    """Raised by providers with a message suitable for showing to the user."""
+    pass
+
+class LLMProvider:
+    """
+    Interface for the language model backends the assistant can use.
+    
+    Providers receive provider-neutral input: a list of system prompt parts
+    (static parts first) and a list of {"role", "content"} messages.
+    """
+    
+    name = "base"
+    
+    def __init__(self):
+        self.model = None
+        self.interpretation_model = None
+    
+    @property
+    def available(self) -> bool:
+        """Whether the provider is configured and can take requests."""
+        return False
+    
+    def model_for(self, purpose: str) -> Optional[str]:
+        """Return the model to use for a request purpose ('interpret' or 'chat')."""
+        if purpose == "interpret" and self.interpretation_model:
+            return self.interpretation_model
+        return self.model
+    
+    def send(self, system: List[str], messages: List[Dict[str, str]],
+             max_tokens: int, temperature: float, model: Optional[str] = None,
+             stop_sequences: Optional[List[str]] = None,
+             on_token: Optional[TokenCallback] = None) -> Optional[str]:
+        """
+        Send a request and return the response text (None if it had none).
+        
+        If on_token is given the response is streamed: it is called with each
+        chunk of text as it arrives, and returning True stops generation early.
+        """
+        raise NotImplementedError
+    
+    def send_structured(self, system: List[str], messages: List[Dict[str, str]], tool: Dict[str, Any],
+                        max_tokens: int, temperature: float,
+                        model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send a request whose answer must match tool's input schema and return it parsed.
+        
+        The default asks for a single line of JSON and parses the text reply,
+        streaming it so generation stops as soon as the object is complete;
+        providers with native structured output override this.
+        """
+        text = self.send(system, messages, max_tokens, temperature,
+                         model=model, stop_sequences=["\n\n"],
+                         on_token=JsonObjectTracker().feed)
+        if text is None:
+            return None
+        return extract_json_object(text)
+
+class AnthropicProvider(LLMProvider):
+    """Anthropic Claude backend using the shared client."""
+    
+    name = "anthropic"
+    
+    def __init__(self):
+        super().__init__()
+        self.client = None
+        # Initialize Anthropic client if API key is available
+        api_key = get_api_key()
+        if api_key:
+            try:
+                self.client = get_shared_client(api_key)
+                # Using model name from environment or default to a versioned model
+                self.model = os.environ.get('ANTHROPIC_MODEL', 'claude-3-sonnet')
+                # Interpreting a query only needs a short JSON answer, which a smaller model handles faster
+                self.interpretation_model = os.environ.get('ANTHROPIC_INTERPRETATION_MODEL', 'claude-3-5-haiku-latest')
+                logger.info("Initialized Anthropic client successfully")
+            except Exception as e:
+                logger.error("Failed to initialize Anthropic client: %s", e)
+                self.client = None
+        else:
+            logger.error("Missing Anthropic API key, AI assistant will operate in fallback mode")
+    
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+    
+    def _prepare(self, system: List[str], messages: List[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Convert provider-neutral input to Messages API blocks with cache markers."""
+        # The first system part is the static instructions and forms a cached
+        # prefix; later parts (attached process, history summary) follow it so
+        # changing them doesn't invalidate the cache
+        system_blocks = [{"type": "text", "text": text} for text in system]
+        if system_blocks:
+            system_blocks[0]["cache_control"] = {"type": "ephemeral"}
+        
+        # Mark the current user message as the end of the cacheable
+        # conversation prefix for the next turn
+        api_messages = list(messages)
+        if api_messages:
+            api_messages[-1] = {
+                "role": api_messages[-1]["role"],
+                "content": [{
+                    "type": "text",
+                    "text": api_messages[-1]["content"],
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            }
+        
+        return system_blocks, api_messages
+    
+    def send(self, system: List[str], messages: List[Dict[str, str]],
+             max_tokens: int, temperature: float, model: Optional[str] = None,
+             stop_sequences: Optional[List[str]] = None,
+             on_token: Optional[TokenCallback] = None) -> Optional[str]:
+        system_blocks, api_messages = self._prepare(system, messages)
+        request = {
+            "model": model or self.model,
+            "system": system_blocks,
+            "messages": api_messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        if stop_sequences:
+            request["stop_sequences"] = stop_sequences
+        
+        if on_token is not None:
+            return self._stream(request, on_token)
+        
+        response = self._create(request)
+        
+        # Extract the text from the response
+        if response and response.content:
+            for content_block in response.content:
+                if content_block.type == 'text':
+                    return content_block.text
+        
+        return None
+    
+    def send_structured(self, system: List[str], messages: List[Dict[str, str]], tool: Dict[str, Any],
+                        max_tokens: int, temperature: float,
+                        model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        # Forcing the tool makes the SDK hand back the arguments already parsed
+        system_blocks, api_messages = self._prepare(system, messages)
+        response = self._create({
+            "model": model or self.model,
+            "system": system_blocks,
+            "messages": api_messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": tool["name"]}
+        })
+        
+        if response and response.content:
+            for content_block in response.content:
+                if content_block.type == 'tool_use':
+                    return content_block.input
+        
+        return None
+    
+    def _create(self, request: Dict[str, Any]):
+        """Send a Messages API request and return the complete response."""
+        with self._api_errors():
+            # Send the request to Anthropic Claude
+            return self.client.messages.create(**request)
+    
+    def _stream(self, request: Dict[str, Any], on_token: TokenCallback) -> Optional[str]:
+        """Stream a Messages API request, passing text to on_token until it asks to stop."""
+        chunks = []
+        with self._api_errors():
+            # Leaving the block closes the stream, which also ends generation
+            with self.client.messages.stream(**request) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    if on_token(text):
+                        break
+        return "".join(chunks) if chunks else None
+    
+    @contextmanager
+    def _api_errors(self):
+        """Map SDK errors to LLMProviderError."""
+        try:
+            yield
+            
+        # Specific errors first: they all subclass anthropic.APIError
+        except anthropic.AuthenticationError as e:
+            logger.error("Anthropic authentication error: %s", e)
+            raise LLMProviderError("Authentication error with the AI service. Please check your API key.") from e
+        except anthropic.RateLimitError as e:
+            logger.error("Anthropic rate limit error: %s", e)
+            raise LLMProviderError("The AI service is currently busy. Please try again later.") from e
+        except anthropic.APIConnectionError as e:
+            logger.error("Anthropic connection error: %s", e)
+            raise LLMProviderError("Error connecting to the AI service. Please check your network connection.") from e
+        except anthropic.APIError as e:
+            logger.error("Anthropic API error: %s", e)
+            raise LLMProviderError(f"Error communicating with the AI service: {str(e)}") from e
+
+# Providers selectable through the LLM_PROVIDER environment variable
+PROVIDERS = {
+    AnthropicProvider.name: AnthropicProvider,
+}
+
+def create_provider(name: Optional[str] = None) -> LLMProvider:
+    """
+    Create the language model provider named by name or LLM_PROVIDER.
+    
+    Unknown names fall back to Anthropic.
+    """
+    name = (name or os.environ.get('LLM_PROVIDER', 'anthropic')).lower()
+    provider_class = PROVIDERS.get(name)
+    if provider_class is None:
+        logger.warning("Unknown LLM provider '%s', using anthropic", name)
+        provider_class = AnthropicProvider
+    return provider_class()
 
 class MemoryAIAssistant:
     """
@@ -36,100 +544,112 @@ class MemoryAIAssistant:
     and can help with finding and modifying memory values.
     """
     
-    def __init__(self, memory_editor, process_bridge):
+    def __init__(self, memory_editor, process_bridge, provider: Optional[LLMProvider] = None):
         """
         Initialize the AI assistant with references to the memory editor and process bridge.
         
         Args:
             memory_editor: Reference to the memory editor instance
             process_bridge: Reference to the process bridge instance
+            provider: Language model backend (default: chosen by LLM_PROVIDER)
         """
         self.memory_editor = memory_editor
         self.process_bridge = process_bridge
         self.current_process_id = None
         self.current_process_type = None
-        self.conversation_history = []
-        
-        # Initialize Anthropic client if API key is available
-        if anthropic_key:
-            try:
-                self.client = anthropic.Anthropic(api_key=anthropic_key)
-                # Using model name from environment or default to a versioned model
-                self.model = os.environ.get('ANTHROPIC_MODEL', 'claude-3-sonnet')
-                logger.info("Initialized Anthropic client successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Anthropic client: {e}")
-                self.client = None
-        else:
-            logger.error("Missing Anthropic API key, AI assistant will operate in fallback mode")
-            self.client = None
+        self.conversation_history = deque(maxlen=HISTORY_MAXLEN)
+        self._summarized_queries = deque(maxlen=HISTORY_SUMMARY_QUERIES)
+        self.history_summary = ""
+        # Request context kept up to date as the conversation goes, rather than
+        # rebuilt from the history on every request
+        self._system_prefix = (SYSTEM_PROMPT,)
+        self._messages = deque(maxlen=2 * CONTEXT_EXCHANGES)
+        self.provider = provider if provider is not None else create_provider()
             
-    def _send_ai_request(self, prompt: str) -> str:
+    def _send_ai_request(self, prompt: str, purpose: Literal["interpret", "chat"] = "chat",
+                         on_token: Optional[TokenCallback] = None) -> str:
         """
-        Send a request to the Anthropic Claude API and get the response.
+        Send a request to the configured AI provider and get the response.
         
         Args:
             prompt: The user's prompt to send to the AI
+            purpose: 'interpret' for the short structured interpretation call,
+                     which uses a smaller model and token budget, or 'chat'
+            on_token: Optional callback to stream chat response text as it arrives
             
         Returns:
             The AI's response text
         """
         try:
-            # Check if Anthropic client is available
-            if not self.client:
-                logger.warning("No Anthropic client available, using fallback response")
+            # Check if the provider is available
+            if not self.provider.available:
+                logger.warning("No AI provider available, using fallback response")
                 return "AI assistant is not available. Please check your ANTHROPIC_API_KEY."
             
-            # Prepare the conversation context with information about attached process
-            system_prompt = "You are a memory debugging assistant specialized in helping users find and modify values in computer memory. "
+            # Static instructions first, per-session context after them
+            system_prompt = list(self._system_prefix)
             if self.current_process_id:
-                system_prompt += f"The user is currently attached to process {self.current_process_id}. "
-            
-            # Add information about our expected JSON response format
-            system_prompt += "When asked to interpret a request, respond with properly formatted JSON."
+                system_prompt.append(f"The user is currently attached to process {self.current_process_id}.")
+            # Interpretations depend only on the query, so they go without the
+            # conversation; that keeps their cache key stable as the chat grows
+            if self.history_summary and purpose == "chat":
+                system_prompt.append(self.history_summary)
             
-            # Create messages from conversation history (for context)
-            messages = []
-            for entry in self.conversation_history[-3:]:  # Include last 3 exchanges for context
-                messages.append({"role": "user", "content": entry['user']})
-                messages.append({"role": "assistant", "content": entry['assistant']})
-            
-            # Add the current user message
+            # Recent exchanges for context, then the current user message
+            messages = list(self._messages) if purpose == "chat" else []
             messages.append({"role": "user", "content": prompt})
             
-            # Send the request to Anthropic Claude
-            response = self.client.messages.create(
-                model=self.model,
-                system=system_prompt,
-                messages=messages if messages else None,
-                max_tokens=int(os.environ.get('ANTHROPIC_MAX_TOKENS', '1000')),
-                temperature=float(os.environ.get('ANTHROPIC_TEMPERATURE', '0'))
-            )
+            model = self.provider.model_for(purpose)
+            if purpose == "interpret":
+                max_tokens = int(os.environ.get('ANTHROPIC_INTERPRETATION_MAX_TOKENS', '128'))
+            else:
+                max_tokens = int(os.environ.get('ANTHROPIC_MAX_TOKENS', '1000'))
+            temperature = float(os.environ.get('ANTHROPIC_TEMPERATURE', '0'))
             
-            # Extract the text from the response
-            if response and response.content:
-                for content_block in response.content:
-                    if content_block.type == 'text':
-                        return content_block.text
+            # Deterministic requests that were answered before skip the API call
+            cache_key = response_cache.cache_key(f"{self.provider.name}:{model}:{purpose}",
+                                                 system_prompt, messages, max_tokens, temperature)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached)
+                return cached
             
-            return "I couldn't generate a proper response. Please try again."
+            if purpose == "interpret":
+                # Interpretations come back as structured data, returned here as JSON text
+                structured = self.provider.send_structured(system_prompt, messages, MEMORY_ACTION_TOOL,
+                                                           max_tokens, temperature, model=model)
+                text = json.dumps(structured) if structured is not None else None
+            else:
+                text = self.provider.send(system_prompt, messages, max_tokens, temperature,
+                                          model=model, on_token=on_token)
+            if text is None:
+                return "I couldn't generate a proper response. Please try again."
             
-        except anthropic.APIError as e:
-            logger.error(f"Anthropic API error: {e}")
-            return f"Error communicating with the AI service: {str(e)}"
-        except anthropic.APIConnectionError as e:
-            logger.error(f"Anthropic connection error: {e}")
-            return "Error connecting to the AI service. Please check your network connection."
-        except anthropic.RateLimitError as e:
-            logger.error(f"Anthropic rate limit error: {e}")
-            return "The AI service is currently busy. Please try again later."
-        except anthropic.AuthenticationError as e:
-            logger.error(f"Anthropic authentication error: {e}")
-            return "Authentication error with the AI service. Please check your API key."
+            response_cache.set(cache_key, text)
+            return text
+            
+        except LLMProviderError as e:
+            return str(e)
         except Exception as e:
-            logger.error(f"Unexpected error in AI request: {e}")
+            logger.error("Unexpected error in AI request: %s", e)
             return f"An unexpected error occurred: {str(e)}"
     
+    def _summarize_older_history(self) -> None:
+        """
+        Fold the oldest conversation turns into a one-line summary once the
+        history is full, so memory and prompt size stay bounded. The summary
+        is rebuilt only when turns are folded in and reused otherwise.
+        """
+        if len(self.conversation_history) < HISTORY_MAXLEN:
+            return
+        
+        for _ in range(HISTORY_SUMMARIZE_BATCH):
+            entry = self.conversation_history.popleft()
+            self._summarized_queries.append(entry['user'].strip()[:80])
+        
+        self.history_summary = "Earlier in this session the user asked: " + "; ".join(self._summarized_queries)
+    
     def set_current_process(self, process_id: str, process_type: str) -> None:
         """
         Set the current process being debugged.
@@ -152,7 +672,7 @@ class MemoryAIAssistant:
             Memory address as string or None if not found
         """
         # Look for patterns like 0x1234abcd or hexadecimal addresses
-        address_matches = re.search(r'0x[0-9a-fA-F]+|[0-9a-fA-F]{8,16}', text)
+        address_matches = _ADDR_RE.search(text)
         if address_matches:
             address = address_matches.group(0)
             # Ensure it has 0x prefix
@@ -165,76 +685,113 @@ class MemoryAIAssistant:
         """
         Extract a numeric value and its type from text.
         
+        A float anywhere in the text wins over an earlier int, so "find 7
+        near 2.5" yields (2.5, "float"); quoted strings are the last resort.
+        
         Args:
             text: Text to search for value
             
         Returns:
             Tuple of (value, type) or None if not found
         """
+        # Look for floats first, otherwise the integer pattern matches their whole part
+        float_matches = _FLOAT_RE.search(text)
+        if float_matches:
+            return (float(float_matches.group(0)), "float")
+        
         # Look for integers
-        int_matches = re.search(r'[-+]?\d+', text)
+        int_matches = _INT_RE.search(text)
         if int_matches:
             return (int(int_matches.group(0)), "int")
         
-        # Look for floats
-        float_matches = re.search(r'[-+]?\d+\.\d+', text)
-        if float_matches:
-            return (float(float_matches.group(0)), "float")
-        
         # Look for text in quotes for string values
-        string_matches = re.search(r'"([^"]*)"', text)
+        string_matches = _STR_RE.search(text)
         if string_matches:
             return (string_matches.group(1), "string")
         
         return None
     
-    def handle_user_query(self, query: str, process_id: str, process_type: str) -> str:
+    def _try_local_parse(self, query: str) -> Optional[Dict[str, Any]]:
         """
-        Process a natural language query from the user and take appropriate actions.
+        Interpret a plainly structured query without asking the AI.
+        
+        Handles queries with a single find or change verb and exactly one
+        value (plus an address for changes), such as "find 100" or
+        "change 0x401000 to 42". Finds may also list several numbers of the
+        same type ("find 100, 200 and 300"), which are searched together.
         
         Args:
             query: The user's natural language query
-            process_id: ID of the process to operate on
-            process_type: Type of the process ('simulated' or 'real')
             
         Returns:
-            Response to the user
+            Structured request like the AI interpretation, or None if ambiguous
         """
-        self.set_current_process(process_id, process_type)
+        wants_find = _FIND_VERB_RE.search(query) is not None
+        wants_change = _CHANGE_VERB_RE.search(query) is not None
+        if wants_find == wants_change:
+            return None
         
-        # First, ask the AI to interpret the user's request
-        interpretation_prompt = f"""
-        Interpret the following memory debugging request:
-        "{query}"
+        # The value is whatever single literal remains once the address is removed
+        address = self._extract_memory_address(query)
+        remainder = _ADDR_RE.sub(' ', query, count=1) if address else query
+        matches = list(_QUERY_LITERAL_RE.finditer(remainder))
+        literals = [match.group(0) for match in matches]
+        if not literals:
+            return None
         
-        If it's about finding a value, specify:
-        - What value to search for
-        - What data type it is (int, float, string)
+        if len(literals) > 1:
+            # Several plain numbers of one type are a batched find, but only when they
+            # form an explicit list; numbers spread through a sentence are for the AI
+            if not wants_find or address or any(literal.startswith('"') for literal in literals):
+                return None
+            if not all(_LIST_SEPARATOR_RE.fullmatch(remainder[before.end():after.start()])
+                       for before, after in zip(matches, matches[1:])):
+                return None
+            kinds = {'.' in literal for literal in literals}
+            if len(kinds) != 1:
+                return None
+            if kinds.pop():
+                return {"action": "find", "value": [float(literal) for literal in literals], "data_type": "float"}
+            return {"action": "find", "value": [_int_literal(literal) for literal in literals], "data_type": "int"}
         
-        If it's about changing a value, specify:
-        - The memory address to modify (if provided)
-        - The value to change it to
-        - What data type it is (int, float, string)
+        literal = literals[0]
+        if literal.startswith('"'):
+            value, data_type = literal[1:-1], "string"
+        elif '.' in literal:
+            value, data_type = float(literal), "float"
+        else:
+            value, data_type = _int_literal(literal), "int"
+        
+        if wants_find:
+            if address:
+                return None
+            return {"action": "find", "value": value, "data_type": data_type}
         
-        Respond in JSON format with action, address (if applicable), value, and data_type fields.
+        if not address:
+            return None
+        return {"action": "change", "address": address, "value": value, "data_type": data_type}
+    
+    def handle_user_query(self, query: str, process_id: str, process_type: str) -> str:
         """
+        Process a natural language query from the user and take appropriate actions.
         
-        ai_interpretation = self._send_ai_request(interpretation_prompt)
-        logger.info(f"AI interpretation: {ai_interpretation}")
+        Args:
+            query: The user's natural language query
+            process_id: ID of the process to operate on
+            process_type: Type of the process ('simulated' or 'real')
+            
+        Returns:
+            Response to the user
+        """
+        self.set_current_process(process_id, process_type)
         
-        # Extract structured information from the AI's interpretation
         try:
-            # Extract JSON from the AI response (it might be wrapped in markdown code blocks)
-            json_match = re.search(r'```json\s*(.*?)\s*```', ai_interpretation, re.DOTALL)
-            if json_match:
-                structured_data = json.loads(json_match.group(1))
+            # Plainly structured queries don't need the AI round-trip
+            structured_data = self._try_local_parse(query)
+            if structured_data is None:
+                structured_data = self._interpret_with_ai(query, process_id)
             else:
-                # Try to find JSON without markdown formatting
-                json_match = re.search(r'({.*})', ai_interpretation, re.DOTALL)
-                if json_match:
-                    structured_data = json.loads(json_match.group(1))
-                else:
-                    raise ValueError("Couldn't extract JSON from AI response")
+                logger.info("Parsed query locally: %s", structured_data)
             
             # Process the request based on the action
             if structured_data.get('action') == 'find':
@@ -248,7 +805,7 @@ class MemoryAIAssistant:
                 response = "I'm not sure what you want to do. Please try asking about finding or changing a memory value."
         
         except (json.JSONDecodeError, ValueError) as e:
-            logger.error(f"Error processing AI interpretation: {e}")
+            logger.error("Error processing AI interpretation: %s", e)
             
             # Fallback to pattern matching if AI interpretation failed
             if "find" in query.lower() or "search" in query.lower() or "where is" in query.lower():
@@ -273,24 +830,88 @@ class MemoryAIAssistant:
                 response = "I'm not sure what you want to do. Please try asking about finding or changing a memory value."
         
         # Update conversation history
+        self._summarize_older_history()
         self.conversation_history.append({
             "user": query,
             "assistant": response
         })
+        self._messages.append({"role": "user", "content": query})
+        self._messages.append({"role": "assistant", "content": response})
         
         return response
     
+    def _interpret_with_ai(self, query: str, process_id: str) -> Dict[str, Any]:
+        """
+        Ask the AI to interpret a query into a structured request.
+        
+        Args:
+            query: The user's natural language query
+            process_id: ID of the process to operate on
+            
+        Returns:
+            Structured request with action, address, value and data_type fields
+            
+        Raises:
+            ValueError: If no JSON could be extracted from the AI response
+        """
+        interpretation_prompt = f"""
+        Interpret the following memory debugging request:
+        "{query}"
+        
+        If it's about finding a value, specify:
+        - What value to search for
+        - What data type it is (int, float, string)
+        
+        If it's about changing a value, specify:
+        - The memory address to modify (if provided)
+        - The value to change it to
+        - What data type it is (int, float, string)
+        
+        Give the action, address (if applicable), value, and data_type fields
+        as a single-line JSON object, with no prose and no markdown.
+        """
+        
+        # Reuse the interpretation of an earlier, equivalently worded query if possible
+        ai_interpretation = semantic_cache.lookup(query, process_id)
+        from_semantic_cache = ai_interpretation is not None
+        if not from_semantic_cache:
+            # Bound the wait on the interpretation request; if it is slow we answer
+            # from the local pattern-matching fallback instead. A request that has
+            # not started yet is cancelled; one already sent keeps running and its
+            # response lands in the response cache for the next identical query.
+            future = _interpretation_executor.submit(self._send_ai_request, interpretation_prompt, "interpret")
+            try:
+                ai_interpretation = future.result(timeout=INTERPRETATION_TIMEOUT)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning("AI interpretation timed out after %ss, using fallback parsing", INTERPRETATION_TIMEOUT)
+                ai_interpretation = ""
+        logger.info("AI interpretation: %s", ai_interpretation)
+        
+        # Interpretations are plain JSON text; anything else is an error message
+        structured_data = extract_json_object(ai_interpretation)
+        if structured_data is None:
+            raise ValueError("Couldn't extract JSON from AI response")
+        
+        if not from_semantic_cache:
+            semantic_cache.add(query, process_id, ai_interpretation)
+        
+        return structured_data
+    
     def _handle_find_value(self, value: Any, data_type: str) -> str:
         """
         Handle a request to find a value in memory.
         
         Args:
-            value: The value to search for
+            value: The value to search for, or a list of values
             data_type: The data type of the value
             
         Returns:
             Response to the user
         """
+        if isinstance(value, list):
+            return self._handle_find_values(value, data_type)
+        
         try:
             # Use the memory editor to scan for the value
             results = self.memory_editor.scan_memory(self.current_process_id, value, data_type)
@@ -312,9 +933,39 @@ class MemoryAIAssistant:
             return results_text
             
         except Exception as e:
-            logger.error(f"Error finding value: {e}")
+            logger.error("Error finding value: %s", e)
             return f"Error while searching for value: {str(e)}"
     
+    def _handle_find_values(self, values: List[Any], data_type: str) -> str:
+        """
+        Handle a request to find several values, sharing one pass over memory.
+        
+        Args:
+            values: The values to search for
+            data_type: The data type of the values
+            
+        Returns:
+            Response to the user
+        """
+        try:
+            results = self.memory_editor.scan_memory_multi(self.current_process_id, values, data_type)
+            
+            results_text = ""
+            for value in values:
+                addresses = results.get(value, [])
+                if not addresses:
+                    results_text += f"{value}: not found\n"
+                elif len(addresses) > 5:
+                    results_text += f"{value}: {len(addresses)} instances, first at {', '.join(addresses[:5])}\n"
+                else:
+                    results_text += f"{value}: {len(addresses)} instances at {', '.join(addresses)}\n"
+            
+            return f"I searched for {len(values)} values in memory:\n" + results_text
+            
+        except Exception as e:
+            logger.error("Error finding values: %s", e)
+            return f"Error while searching for values: {str(e)}"
+    
     def _handle_change_value(self, address: str, value: Any, data_type: str) -> str:
         """
         Handle a request to change a value in memory.
@@ -342,5 +993,5 @@ class MemoryAIAssistant:
                 return f"Failed to change the value at {address}. Please check if the address is valid."
             
         except Exception as e:
-            logger.error(f"Error changing value: {e}")
+            logger.error("Error changing value: %s", e)
             return f"Error while changing the value: {str(e)}"
\ No newline at end of file
@@ -1,19 +1,392 @@
+import functools
+import itertools
 import logging
 import binascii
-from typing import Dict, Any, Optional, List, Tuple
+import math
+from enum import IntEnum
+from typing import Dict, Any, Callable, Iterable, Iterator, Mapping, Optional, List, Set, Tuple, Union
 from process_simulator import ProcessSimulator, Instruction, Breakpoint, Symbol
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# NumPy is optional; scans fall back to a plain loop without it
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Numba is optional; it speeds up float scans of very large memory maps
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
-class MemoryDisplay:
-    """Memory display format options"""
-    HEX = "hex"
-    DECIMAL = "decimal"
-    ASCII = "ascii"
-    BYTES = "bytes"
-    MIXED = "mixed"
+class MemoryDisplay(IntEnum):
+    """
+    Memory display format options.
+    
+    Integer codes index the formatter tables directly; str() gives the
+    lowercase name used by the web UI and API.
+    """
+    HEX = 0
+    DECIMAL = 1
+    ASCII = 2
+    BYTES = 3
+    MIXED = 4
+    
+    def __str__(self):
+        return self.name.lower()
+    
+    @classmethod
+    def parse(cls, display_format: Union['MemoryDisplay', str, None]) -> Optional['MemoryDisplay']:
+        """Resolve a MemoryDisplay or its name ("hex", ...), or None if unknown"""
+        if isinstance(display_format, cls):
+            return display_format
+        return _DISPLAY_FORMATS_BY_NAME.get(display_format)
+
+_DISPLAY_FORMATS_BY_NAME = {str(display_format): display_format for display_format in MemoryDisplay}
+
+# Float scans match values within this tolerance, since typed-in floats
+# rarely equal the stored binary value exactly
+FLOAT_SCAN_REL_TOL = 1e-6
+FLOAT_SCAN_ABS_TOL = 1e-9
+
+_INT64_MIN = -2**63
+_INT64_MAX = 2**63 - 1
+
+# Columns at least this long are scanned with the compiled kernel when Numba is available
+NUMBA_SCAN_THRESHOLD = 100_000
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _close_positions_kernel(values, positions, target, rtol, atol):
+        """Return positions[i] for each values[i] within tolerance of target (np.isclose rule)"""
+        n = values.size
+        chunks = 256
+        chunk_size = (n + chunks - 1) // chunks
+        tolerance = atol + rtol * abs(target)
+        
+        # Two passes over fixed chunks: count matches, then fill at each chunk's offset
+        counts = numpy.zeros(chunks + 1, dtype=numpy.int64)
+        for chunk in prange(chunks):
+            count = 0
+            for i in range(chunk * chunk_size, min((chunk + 1) * chunk_size, n)):
+                if abs(values[i] - target) <= tolerance:
+                    count += 1
+            counts[chunk + 1] = count
+        offsets = numpy.cumsum(counts)
+        
+        out = numpy.empty(offsets[chunks], dtype=positions.dtype)
+        for chunk in prange(chunks):
+            k = offsets[chunk]
+            for i in range(chunk * chunk_size, min((chunk + 1) * chunk_size, n)):
+                if abs(values[i] - target) <= tolerance:
+                    out[k] = positions[i]
+                    k += 1
+        return out
+
+def _close_positions(values, positions, target: float):
+    """Return the positions whose value is within the float scan tolerance of target"""
+    if HAS_NUMBA and values.size >= NUMBA_SCAN_THRESHOLD:
+        return _close_positions_kernel(values, positions, float(target),
+                                       FLOAT_SCAN_REL_TOL, FLOAT_SCAN_ABS_TOL)
+    return positions[numpy.isclose(values, target, rtol=FLOAT_SCAN_REL_TOL, atol=FLOAT_SCAN_ABS_TOL)]
+
+class ScanColumns:
+    """
+    The numbers of a process memory map split into NumPy columns for the
+    tolerant float scan.
+    
+    Ints and floats live in arrays next to their position in the map; other
+    numbers (bools, ints too large for int64) are kept aside and compared in
+    Python. Non-numeric values never match a float scan and are skipped.
+    """
+    
+    def __init__(self, memory_map: Mapping[str, Any]):
+        self.addresses = numpy.array(list(memory_map), dtype=object)
+        int_positions, int_values = [], []
+        float_positions, float_values = [], []
+        self.others: List[Tuple[int, Any]] = []
+        
+        for position, value in enumerate(memory_map.values()):
+            value_type = type(value)
+            if value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+                int_positions.append(position)
+                int_values.append(value)
+            elif value_type is float:
+                float_positions.append(position)
+                float_values.append(value)
+            elif _is_number(value):
+                self.others.append((position, value))
+        
+        self.int_positions = numpy.array(int_positions, dtype=numpy.intp)
+        self.int_values = numpy.array(int_values, dtype=numpy.int64)
+        self.float_positions = numpy.array(float_positions, dtype=numpy.intp)
+        self.float_values = numpy.array(float_values, dtype=numpy.float64)
+    
+    def scan(self, search_value: float) -> List[str]:
+        """Return the addresses holding a number close to search_value, in memory map order"""
+        int_matches = _close_positions(self.int_values, self.int_positions, search_value)
+        float_matches = _close_positions(self.float_values, self.float_positions, search_value)
+        other_positions = [position for position, value in self.others
+                           if math.isclose(value, search_value,
+                                           rel_tol=FLOAT_SCAN_REL_TOL, abs_tol=FLOAT_SCAN_ABS_TOL)]
+        
+        positions = numpy.concatenate([int_matches, float_matches,
+                                       numpy.array(other_positions, dtype=numpy.intp)])
+        positions.sort()
+        return self.addresses[positions].tolist()
+
+_MISSING = object()
+
+class ValueIndex:
+    """
+    Inverted index from memory value to the addresses holding it.
+    
+    Lookups use the same equality as a linear scan (100 and 100.0 share a
+    bucket) and return addresses in memory map order. Writes made through
+    the editor update the index in place; other changes rebuild it.
+    """
+    
+    def __init__(self, memory_map: Mapping[str, Any], version: int):
+        self.version = version
+        self.positions: Dict[str, int] = {}
+        self.buckets: Dict[Any, Dict[str, None]] = {}
+        self.unhashable: Dict[str, Any] = {}
+        for address, value in memory_map.items():
+            self.positions[address] = len(self.positions)
+            self._add(address, value)
+    
+    def _add(self, address: str, value: Any) -> None:
+        try:
+            self.buckets.setdefault(value, {})[address] = None
+        except TypeError:
+            self.unhashable[address] = value
+    
+    def _remove(self, address: str, value: Any) -> None:
+        if address in self.unhashable:
+            del self.unhashable[address]
+            return
+        bucket = self.buckets.get(value)
+        if bucket is not None:
+            bucket.pop(address, None)
+            if not bucket:
+                del self.buckets[value]
+    
+    def update(self, address: str, old_value: Any, new_value: Any, version: int) -> None:
+        """Record that address changed from old_value (or _MISSING) to new_value"""
+        if old_value is _MISSING:
+            self.positions[address] = len(self.positions)
+        else:
+            self._remove(address, old_value)
+        self._add(address, new_value)
+        self.version = version
+    
+    def lookup(self, search_value: Any) -> List[str]:
+        """Return the addresses whose value equals search_value"""
+        try:
+            matches = list(self.buckets.get(search_value, ()))
+        except TypeError:
+            matches = []
+        matches.extend(address for address, value in self.unhashable.items() if value == search_value)
+        if len(matches) > 1:
+            matches.sort(key=self.positions.__getitem__)
+        return matches
+
+def _is_number(value: Any) -> bool:
+    """True for ints and floats (bools count as ints, as in Python comparisons)"""
+    return isinstance(value, (int, float))
+
+def _linear_scan(memory_map: Mapping[str, Any], search_value: float) -> List[str]:
+    """Tolerant float scan of a memory map in Python, with the same matching rules as ScanColumns"""
+    return [address for address, value in memory_map.items()
+            if _is_number(value) and math.isclose(value, search_value,
+                                                  rel_tol=FLOAT_SCAN_REL_TOL,
+                                                  abs_tol=FLOAT_SCAN_ABS_TOL)]
+
+# Memory maps repeat a few values (0, 1, common pointers) many times,
+# so their hex strings are memoized rather than rebuilt per address
+_hex = functools.lru_cache(maxsize=8192)(hex)
+
+def _format_int_hex(value: int) -> Tuple[str, str]:
+    formatted_value = _hex(value)
+    return formatted_value, formatted_value
+
+def _format_int_mixed(value: int) -> Tuple[str, str]:
+    return str(value), _hex(value)
+
+# Display character for each byte value: itself if printable ASCII, else '.'
+_PRINTABLE_ASCII = tuple(chr(i) if 32 <= i <= 126 else '.' for i in range(256))
+
+def _format_int_ascii(value: int) -> Tuple[str, str]:
+    # Show the character if the number is in the printable range
+    return (_PRINTABLE_ASCII[value] if 0 <= value < 256 else '.'), _hex(value)
+
+def _format_int_bytes(value: int) -> Tuple[str, str]:
+    formatted_value = f"0x{value:08x}"
+    return formatted_value, formatted_value
+
+def _format_string(value: str) -> Tuple[str, str]:
+    # Hex of the string's UTF-8 bytes, converted in a single C call
+    return value, value.encode('utf-8', errors='replace').hex(' ')
+
+class _AsciiPrintableTable(dict):
+    """str.translate table mapping everything outside printable ASCII to '.'"""
+    
+    def __init__(self):
+        super().__init__((code, code if 32 <= code <= 126 else 0x2e) for code in range(256))
+    
+    def __missing__(self, code: int) -> int:
+        # Code points above 0xff are never printable ASCII; remember them as they appear
+        self[code] = 0x2e
+        return 0x2e
+
+_ASCII_PRINTABLE_TABLE = _AsciiPrintableTable()
+
+def _format_string_ascii(value: str) -> Tuple[str, str]:
+    # Replace non-printable characters with dots
+    return value.translate(_ASCII_PRINTABLE_TABLE), _format_string(value)[1]
+
+# (formatted value, hex value) formatters indexed by MemoryDisplay code
+_INT_FORMATTERS = (
+    _format_int_hex,     # HEX
+    _format_int_mixed,   # DECIMAL
+    _format_int_ascii,   # ASCII
+    _format_int_bytes,   # BYTES
+    _format_int_mixed,   # MIXED
+)
+_STRING_FORMATTERS = (
+    _format_string,        # HEX
+    _format_string,        # DECIMAL
+    _format_string_ascii,  # ASCII
+    _format_string,        # BYTES
+    _format_string,        # MIXED
+)
+
+def _parse_int(value: Any) -> int:
+    # Exact type checks first: ints pass through and strings pick their base
+    # directly, so the common cases cost a single int() call at most
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is str:
+        # Support hex input
+        return int(value, 16) if value[:2] in ('0x', '0X') else int(value)
+    return int(value)
+
+def _bytes_to_int(value: Any) -> Any:
+    # Convert hex string to bytes and then to int
+    if isinstance(value, str):
+        if value.startswith('0x'):
+            return int(value, 16)
+        # Convert space-separated hex bytes
+        return int(''.join(value.split()), 16)
+    return value
+
+# Value conversion applied before writing, per data type
+_WRITE_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "int": _parse_int,
+    "float": float,
+    "string": str,
+    "bytes": _bytes_to_int,
+}
+
+def _format_memory_map(items: Iterable[Tuple[str, Any]], symbols_by_address: Dict[str, Symbol],
+                       breakpoints: Dict[str, Breakpoint], display_format: MemoryDisplay) -> Dict[str, Dict[str, Any]]:
+    """Format (address, value) pairs into display cells keyed by address"""
+    # Pick the formatters for the display format once rather than per address
+    format_int = _INT_FORMATTERS[display_format]
+    format_string = _STRING_FORMATTERS[display_format]
+    
+    formatted_memory = {}
+    for address, value in items:
+        # Check if there's a symbol for this address
+        symbol = symbols_by_address.get(address)
+        symbol_name = symbol.name if symbol else None
+        
+        # Determine the data type of the value
+        if isinstance(value, int):
+            data_type = "int"
+            formatted_value, hex_value = format_int(value)
+        
+        elif isinstance(value, float):
+            data_type = "float"
+            formatted_value = str(value)
+            hex_value = "N/A"
+        
+        elif isinstance(value, str):
+            data_type = "string"
+            formatted_value, hex_value = format_string(value)
+        
+        else:
+            data_type = "unknown"
+            formatted_value = str(value)
+            hex_value = "N/A"
+        
+        # Check if there's a breakpoint at this address
+        breakpoint = breakpoints.get(address)
+        if breakpoint is None:
+            has_breakpoint, breakpoint_enabled, breakpoint_type = False, False, None
+        else:
+            has_breakpoint, breakpoint_enabled, breakpoint_type = True, breakpoint.enabled, breakpoint.type
+        
+        formatted_memory[address] = {
+            "value": value,
+            "formatted_value": formatted_value,
+            "type": data_type,
+            "hex": hex_value,
+            "symbol": symbol_name,
+            "has_breakpoint": has_breakpoint,
+            "breakpoint_enabled": breakpoint_enabled,
+            "breakpoint_type": breakpoint_type
+        }
+    
+    return formatted_memory
+
+
+class Session:
+    """
+    Debugging session bound to one process.
+    
+    The process is checked once when the session is created; its methods
+    go straight to the simulator without the per-call attach check, so
+    rapid breakpoint edits skip that overhead. Usable as a context manager.
+    """
+    
+    def __init__(self, editor: 'MemoryEditor', pid: str):
+        self.editor = editor
+        self.pid = pid
+        self.process_simulator = editor.process_simulator
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+    
+    def set_breakpoint(self, address: str, bp_type: str = "execution", condition: Optional[str] = None) -> bool:
+        """Set a breakpoint at the specified address"""
+        return self.process_simulator.set_breakpoint(self.pid, address, bp_type, condition)
+    
+    def remove_breakpoint(self, address: str) -> bool:
+        """Remove a breakpoint at the specified address"""
+        return self.process_simulator.remove_breakpoint(self.pid, address)
+    
+    def toggle_breakpoint(self, address: str) -> Tuple[bool, bool]:
+        """Toggle a breakpoint on/off, returns (success, new_state)"""
+        return self.process_simulator.toggle_breakpoint(self.pid, address)
+    
+    def get_breakpoints(self) -> List[Breakpoint]:
+        """Get all breakpoints for the process"""
+        return self.process_simulator.get_breakpoints(self.pid)
+    
+    def step_instruction(self) -> bool:
+        """Execute a single instruction"""
+        return self.process_simulator.step_instruction(self.pid)
+
 
 class MemoryEditor:
     """Class for interacting with process memory and debugging features"""
@@ -22,173 +395,279 @@ class MemoryEditor:
         self.process_simulator = process_simulator
         self.display_format = MemoryDisplay.MIXED
         self.current_process_id = None
+        # Processes already verified by attach_to_process
+        self._attached_pids: Set[str] = set()
+        # process_id -> (memory_version, ScanColumns) built on the first scan after a change
+        self._scan_columns: Dict[str, Tuple[int, ScanColumns]] = {}
+        # process_id -> ValueIndex used for exact (int and string) scans
+        self._value_index: Dict[str, ValueIndex] = {}
         logger.debug("Memory editor initialized")
     
     def attach_to_process(self, process_id: str) -> bool:
         """Attach to a process for memory editing"""
+        # Already attached: a membership test is enough to confirm it still exists
+        if process_id in self._attached_pids:
+            if process_id in self.process_simulator.processes:
+                self.current_process_id = process_id
+                return True
+            self.detach(process_id)
+        
         process = self.process_simulator.get_process(process_id)
         if not process:
-            logger.warning(f"Failed to attach to process {process_id}: Process not found")
+            logger.warning("Failed to attach to process %s: Process not found", process_id)
             return False
         
+        self._attached_pids.add(process_id)
         self.current_process_id = process_id
-        logger.debug(f"Attached to process {process_id}")
+        logger.debug("Attached to process %s", process_id)
         return True
     
-    def read_process_memory(self, process_id: str, display_format: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    def detach(self, process_id: str) -> None:
+        """Forget a process and drop the scan data cached for it"""
+        self._attached_pids.discard(process_id)
+        self._scan_columns.pop(process_id, None)
+        self._value_index.pop(process_id, None)
+        if self.current_process_id == process_id:
+            self.current_process_id = None
+    
+    def read_process_memory(self, process_id: str, display_format: Union[MemoryDisplay, str, None] = None) -> Dict[str, Dict[str, Any]]:
         """Read all memory from a process and format it for display"""
+        formatted_memory = {}
+        for chunk in self.iter_process_memory(process_id, display_format):
+            formatted_memory.update(chunk)
+        
+        logger.debug("Read memory for process %s: %d addresses", process_id, len(formatted_memory))
+        return formatted_memory
+    
+    def iter_process_memory(self, process_id: str, display_format: Union[MemoryDisplay, str, None] = None,
+                            chunk_size: int = 4096, offset: int = 0) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """
+        Format process memory for display in chunks of at most chunk_size addresses.
+        
+        Only one chunk is held at a time, so callers that stream or paginate
+        the result never materialize the whole formatted map. offset skips
+        that many addresses from the start of the memory map.
+        """
         if not self.attach_to_process(process_id):
-            return {}
+            return
         
-        format_to_use = display_format or self.display_format
+        format_to_use = self._resolve_display_format(display_format)
         memory_map = self.process_simulator.get_memory_map(process_id)
-        formatted_memory = {}
         
-        for address, value in memory_map.items():
-            # Check if there's a symbol for this address
-            symbol = self.process_simulator.get_address_symbol(process_id, address)
-            symbol_name = symbol.name if symbol else None
-            
-            # Determine the data type of the value
-            if isinstance(value, int):
-                data_type = "int"
-                # Format based on display preference
-                if format_to_use == MemoryDisplay.HEX:
-                    formatted_value = hex(value)
-                    hex_value = formatted_value
-                elif format_to_use == MemoryDisplay.DECIMAL:
-                    formatted_value = str(value)
-                    hex_value = hex(value)
-                elif format_to_use == MemoryDisplay.ASCII:
-                    # Try to convert number to ASCII if in printable range
-                    if 32 <= value <= 126:
-                        formatted_value = chr(value)
-                    else:
-                        formatted_value = '.'  # Non-printable character
-                    hex_value = hex(value)
-                elif format_to_use == MemoryDisplay.BYTES:
-                    # Format as bytes
-                    formatted_value = f"0x{value:08x}"
-                    hex_value = formatted_value
-                else:  # MIXED (default)
-                    formatted_value = str(value)
-                    hex_value = hex(value)
-            
-            elif isinstance(value, float):
-                data_type = "float"
-                formatted_value = str(value)
-                hex_value = "N/A"
-            
-            elif isinstance(value, str):
-                data_type = "string"
-                formatted_value = value
-                # Convert string to hex representation
-                hex_value = ' '.join([hex(ord(c))[2:] for c in value])
-                
-                # For ASCII format, keep the string as is
-                if format_to_use == MemoryDisplay.ASCII:
-                    # Replace non-printable characters with dots
-                    formatted_value = ''.join([c if 32 <= ord(c) <= 126 else '.' for c in value])
-            
-            else:
-                data_type = "unknown"
-                formatted_value = str(value)
-                hex_value = "N/A"
-            
-            # Check if there's a breakpoint at this address
-            process = self.process_simulator.get_process(process_id)
-            breakpoint = None
-            if process:
-                breakpoint = process.breakpoints.get(address)
-            
-            formatted_memory[address] = {
-                "value": value,
-                "formatted_value": formatted_value,
-                "type": data_type,
-                "hex": hex_value,
-                "symbol": symbol_name,
-                "has_breakpoint": breakpoint is not None,
-                "breakpoint_enabled": breakpoint.enabled if breakpoint else False,
-                "breakpoint_type": breakpoint.type if breakpoint else None
-            }
-        
-        logger.debug(f"Read memory for process {process_id}: {len(formatted_memory)} addresses")
-        return formatted_memory
+        # Fetch the per-process lookup tables once rather than per address
+        process = self.process_simulator.get_process(process_id)
+        symbols_by_address = process.symbols
+        breakpoints = process.breakpoints
+        
+        items = itertools.islice(memory_map.items(), offset, None)
+        while True:
+            formatted_memory = _format_memory_map(itertools.islice(items, chunk_size),
+                                                 symbols_by_address, breakpoints, format_to_use)
+            if not formatted_memory:
+                return
+            yield formatted_memory
     
     def write_process_memory(self, process_id: str, address: str, value: Any, data_type: str = "int") -> bool:
         """Write a value to a specific memory address"""
         if not self.attach_to_process(process_id):
             return False
         
+        convert = _WRITE_CONVERTERS.get(data_type)
+        if convert is None:
+            logger.warning("Unknown data type: %s", data_type)
+            return False
+        
         # Convert the value to the appropriate type
         try:
-            if data_type == "int":
-                # Support hex input
-                if isinstance(value, str) and value.startswith('0x'):
-                    value = int(value, 16)
-                else:
-                    value = int(value)
-            elif data_type == "float":
-                value = float(value)
-            elif data_type == "string":
-                value = str(value)
-            elif data_type == "bytes":
-                # Convert hex string to bytes and then to int
-                if isinstance(value, str):
-                    if value.startswith('0x'):
-                        value = int(value, 16)
-                    else:
-                        # Convert space-separated hex bytes
-                        value = int(''.join(value.split()), 16)
-            else:
-                logger.warning(f"Unknown data type: {data_type}")
-                return False
+            value = convert(value)
         except ValueError as e:
-            logger.error(f"Value conversion error: {e}")
+            logger.error("Value conversion error: %s", e)
             return False
         
-        result = self.process_simulator.write_memory(process_id, address, value)
+        result = self._write_converted(process_id, address, value)
         if result:
-            logger.debug(f"Wrote {value} to address {address} in process {process_id}")
+            logger.debug("Wrote %s to address %s in process %s", value, address, process_id)
         else:
-            logger.warning(f"Failed to write to address {address} in process {process_id}")
+            logger.warning("Failed to write to address %s in process %s", address, process_id)
         
         return result
     
+    def write_process_memory_bulk(self, process_id: str, items: List[Tuple[str, Any]], data_type: str = "int") -> bool:
+        """
+        Write several (address, value) pairs of one data type.
+        
+        Values are all converted before anything is written, so a bad value
+        leaves memory untouched. The batch is a single undo step.
+        """
+        if not self.attach_to_process(process_id):
+            return False
+        
+        convert = _WRITE_CONVERTERS.get(data_type)
+        if convert is None:
+            logger.warning("Unknown data type: %s", data_type)
+            return False
+        
+        try:
+            converted = [(address, convert(value)) for address, value in items]
+        except ValueError as e:
+            logger.error("Value conversion error: %s", e)
+            return False
+        
+        process = self.process_simulator.get_process(process_id)
+        old_version = process.memory_version
+        current_values = {address: process.memory.get(address, _MISSING) for address, _ in converted}
+        
+        result = self.process_simulator.write_memory_bulk(process_id, converted)
+        if result:
+            index = self._value_index.get(process_id)
+            if index is not None and index.version == old_version and process.memory_version == old_version + 1:
+                # Replay in order so an address written twice ends at its last value
+                for address, value in converted:
+                    index.update(address, current_values[address], value, process.memory_version)
+                    current_values[address] = value
+            logger.debug("Wrote %d values in process %s", len(converted), process_id)
+        return result
+    
+    def get_writer(self, process_id: str, data_type: str = "int") -> Optional[Callable[[str, Any], bool]]:
+        """
+        Return a fast write function for one process and data type.
+        
+        The attach check and data type lookup happen once here; the returned
+        writer(address, value) only converts and writes, and raises ValueError
+        for values that can't be converted. Returns None if the process
+        doesn't exist or the data type is unknown.
+        """
+        convert = _WRITE_CONVERTERS.get(data_type)
+        if convert is None or not self.attach_to_process(process_id):
+            return None
+        
+        write_converted = self._write_converted
+        
+        def writer(address: str, value: Any) -> bool:
+            return write_converted(process_id, address, convert(value))
+        
+        return writer
+    
+    def _write_converted(self, process_id: str, address: str, value: Any) -> bool:
+        """Write an already converted value, keeping the value index current"""
+        # Note the old value so the value index can be updated instead of rebuilt
+        process = self.process_simulator.get_process(process_id)
+        if process is None:
+            return False
+        old_value = process.memory.get(address, _MISSING)
+        old_version = process.memory_version
+        
+        result = self.process_simulator.write_memory(process_id, address, value)
+        if result:
+            index = self._value_index.get(process_id)
+            if index is not None and index.version == old_version and process.memory_version == old_version + 1:
+                index.update(address, old_value, value, process.memory_version)
+        return result
+    
+    def _convert_search_value(self, value: Any, data_type: str) -> Any:
+        """Convert a search value to the type stored in memory (raises ValueError)"""
+        if data_type == "int":
+            return _parse_int(value)
+        elif data_type == "float":
+            return float(value)
+        elif data_type == "string":
+            return str(value)
+        raise ValueError(f"Unknown data type: {data_type}")
+    
     def scan_memory(self, process_id: str, value: Any, data_type: str = "int") -> List[str]:
         """Scan process memory for occurrences of a specific value"""
         if not self.attach_to_process(process_id):
             return []
         
-        memory_map = self.process_simulator.get_memory_map(process_id)
-        matching_addresses = []
-        
         # Convert the value to the appropriate type
         try:
-            if data_type == "int":
-                if isinstance(value, str) and value.startswith('0x'):
-                    search_value = int(value, 16)
-                else:
-                    search_value = int(value)
-            elif data_type == "float":
-                search_value = float(value)
-            elif data_type == "string":
-                search_value = str(value)
-            else:
-                logger.warning(f"Unknown data type: {data_type}")
-                return []
+            search_value = self._convert_search_value(value, data_type)
         except ValueError as e:
-            logger.error(f"Value conversion error: {e}")
+            logger.error("Value conversion error: %s", e)
             return []
         
-        for address, mem_value in memory_map.items():
-            if mem_value == search_value:
-                matching_addresses.append(address)
+        if data_type == "float":
+            # Tolerant float matches need a scan rather than a hash lookup
+            columns = self._get_scan_columns(process_id)
+            if columns is not None:
+                matching_addresses = columns.scan(search_value)
+            else:
+                memory_map = self.process_simulator.get_memory_map(process_id)
+                matching_addresses = _linear_scan(memory_map, search_value)
+        else:
+            matching_addresses = self._get_value_index(process_id).lookup(search_value)
         
-        logger.debug(f"Found {len(matching_addresses)} matches for value {value} in process {process_id}")
+        logger.debug("Found %d matches for value %s in process %s", len(matching_addresses), value, process_id)
         return matching_addresses
     
-    def get_process_registers(self, process_id: str) -> Dict[str, int]:
+    def _get_scan_columns(self, process_id: str) -> Optional[ScanColumns]:
+        """Return the scan columns for a process, rebuilding them if memory changed"""
+        if not HAS_NUMPY:
+            return None
+        process = self.process_simulator.get_process(process_id)
+        if not process:
+            return None
+        
+        cached = self._scan_columns.get(process_id)
+        if cached is not None and cached[0] == process.memory_version:
+            return cached[1]
+        
+        columns = ScanColumns(process.memory)
+        self._scan_columns[process_id] = (process.memory_version, columns)
+        return columns
+    
+    def _get_value_index(self, process_id: str) -> ValueIndex:
+        """Return the value index for a process, rebuilding it if memory changed"""
+        process = self.process_simulator.get_process(process_id)
+        index = self._value_index.get(process_id)
+        if index is None or index.version != process.memory_version:
+            index = ValueIndex(process.memory, process.memory_version)
+            self._value_index[process_id] = index
+        return index
+    
+    def scan_memory_multi(self, process_id: str, values: List[Any], data_type: str = "int") -> Dict[Any, List[str]]:
+        """
+        Scan process memory for several values at once.
+        
+        Returns a dict mapping each requested value to its matching addresses.
+        """
+        if not self.attach_to_process(process_id):
+            return {}
+        
+        # Map each converted search value back to the value(s) the caller asked for
+        try:
+            requested: Dict[Any, List[Any]] = {}
+            for value in values:
+                requested.setdefault(self._convert_search_value(value, data_type), []).append(value)
+        except (ValueError, TypeError) as e:
+            logger.error("Value conversion error: %s", e)
+            return {}
+        
+        results: Dict[Any, List[str]] = {value: [] for value in values}
+        memory_map = self.process_simulator.get_memory_map(process_id)
+        
+        if data_type == "float":
+            # Tolerant float matches can't be found by hashing, so scan per value
+            columns = self._get_scan_columns(process_id)
+            for search_value, requested_values in requested.items():
+                if columns is not None:
+                    matches = columns.scan(search_value)
+                else:
+                    matches = _linear_scan(memory_map, search_value)
+                for value in requested_values:
+                    results[value] = list(matches)
+            return results
+        
+        index = self._get_value_index(process_id)
+        for search_value, requested_values in requested.items():
+            matches = index.lookup(search_value)
+            for value in requested_values:
+                results[value] = list(matches)
+        
+        logger.debug("Scanned for %d values in process %s", len(values), process_id)
+        return results
+    
+    def get_process_registers(self, process_id: str) -> Mapping[str, int]:
         """Get the CPU registers for a process"""
         if not self.attach_to_process(process_id):
             return {}
@@ -207,7 +686,7 @@ class MemoryEditor:
             else:
                 value = int(value)
         except ValueError as e:
-            logger.error(f"Register value conversion error: {e}")
+            logger.error("Register value conversion error: %s", e)
             return False
         
         return self.process_simulator.set_register(process_id, register, value)
@@ -219,6 +698,13 @@ class MemoryEditor:
         
         return self.process_simulator.get_instructions(process_id, start_address, count)
     
+    def session(self, process_id: str) -> Optional[Session]:
+        """Return a Session for the process, or None if it doesn't exist"""
+        if not self.attach_to_process(process_id):
+            return None
+        
+        return Session(self, process_id)
+    
     def set_breakpoint(self, process_id: str, address: str, bp_type: str = "execution", condition: Optional[str] = None) -> bool:
         """Set a breakpoint at the specified address"""
         if not self.attach_to_process(process_id):
@@ -259,7 +745,16 @@ class MemoryEditor:
         if not self.attach_to_process(process_id):
             return None
         
-        return self.process_simulator.lookup_symbol(process_id, name)
+        # The process keeps its symbols hashed by name, so resolve directly
+        # against that table instead of fetching the process a second time
+        return self.process_simulator.get_process(process_id).symbols_by_name.get(name)
+    
+    def lookup_address_symbol(self, process_id: str, address: str) -> Optional[Symbol]:
+        """Look up the symbol at an address"""
+        if not self.attach_to_process(process_id):
+            return None
+        
+        return self.process_simulator.get_process(process_id).symbols.get(address)
     
     def step_instruction(self, process_id: str) -> bool:
         """Step a single instruction in the process"""
@@ -289,10 +784,18 @@ class MemoryEditor:
         
         return self.process_simulator.redo_memory_edit(process_id)
     
-    def set_display_format(self, format_name: str) -> bool:
+    def set_display_format(self, format_name: Union[MemoryDisplay, str]) -> bool:
         """Set the memory display format"""
-        if format_name in [MemoryDisplay.HEX, MemoryDisplay.DECIMAL, MemoryDisplay.ASCII, 
-                          MemoryDisplay.BYTES, MemoryDisplay.MIXED]:
-            self.display_format = format_name
+        display_format = MemoryDisplay.parse(format_name)
+        if display_format is not None:
+            self.display_format = display_format
             return True
         return False
+    
+    def _resolve_display_format(self, display_format: Union[MemoryDisplay, str, None]) -> MemoryDisplay:
+        """Resolve a per-call display format, falling back to the editor's own (unknown names show as MIXED)"""
+        if display_format is None or display_format == "":
+            return self.display_format
+        resolved = MemoryDisplay.parse(display_format)
+        # HEX is 0, so test against None rather than truthiness
+        return MemoryDisplay.MIXED if resolved is None else resolved
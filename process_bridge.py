@@ -4,17 +4,22 @@ Bridges between the simulated process system and real processes.
 Also supports Android process integration.
 """
 
+import functools
+import itertools
 import os
 import sys
 import logging
 import platform
-from typing import Optional, Dict, List, Any, Union, Tuple
+import struct
+from typing import Iterator, Optional, Dict, List, Any, Union, Tuple
 
 from real_process_connector import (
     create_process_connector, 
     RealProcessConnector,
     ProcessInfo,
-    MemoryRegion
+    MemoryRegion,
+    MemoryProtection,
+    RegionIndex
 )
 from process_simulator import ProcessSimulator, SimulatedProcess, Instruction, Symbol, Breakpoint
 
@@ -25,10 +30,82 @@ try:
 except ImportError:
     HAS_ANDROID_SUPPORT = False
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=4096)
+def _parse_addr(address: str) -> int:
+    """Parse a hex address with or without its 0x prefix (raises ValueError)"""
+    # int() with base 16 accepts the 0x/0X prefix itself
+    return int(address, 16)
+
+def _region_dict(region: MemoryRegion, protection_to_string) -> Dict[str, Any]:
+    """Convert a connector memory region to the dict form returned by the bridge"""
+    return {
+        "base_address": f"0x{region.base_address:x}",
+        "size": region.size,
+        "protection": protection_to_string(region.protection),
+        "type": region.type,
+        "mapped_file": region.mapped_file
+    }
+
+# Byte encoders for simulated memory values, dispatched on the exact value type
+_DOUBLE = struct.Struct('<d')
+_QWORD = struct.Struct('<Q')
+
+def _pack_int(value: int) -> bytes:
+    try:
+        return _QWORD.pack(value)
+    except struct.error:
+        # Negative values are stored as two's complement; oversized ones still raise OverflowError
+        return value.to_bytes(8, byteorder='little', signed=value < 0)
+
+def _pack_string(value: str) -> bytes:
+    return value.encode('utf-8')
+
+def _pack_other(value: Any) -> bytes:
+    if isinstance(value, int):
+        return _pack_int(value)
+    if isinstance(value, float):
+        return _DOUBLE.pack(value)
+    if isinstance(value, str):
+        return _pack_string(value)
+    return str(value).encode('utf-8')
+
+_VALUE_PACKERS = {
+    int: _pack_int,
+    float: _DOUBLE.pack,
+    str: _pack_string,
+}
+
+# Printable ASCII bytes, deleted with bytes.translate to test whether data is all printable
+_PRINTABLE_BYTES = bytes(range(32, 127))
+
+# Linux protection strings indexed by the PROT_READ | PROT_WRITE | PROT_EXEC bits
+_LINUX_PROTECTION_STRINGS = tuple(
+    ("r" if bits & MemoryProtection.PROT_READ else "-") +
+    ("w" if bits & MemoryProtection.PROT_WRITE else "-") +
+    ("x" if bits & MemoryProtection.PROT_EXEC else "-")
+    for bits in range(8)
+)
+
+def _windows_protection_string(protection: int) -> str:
+    result = ""
+    if protection & MemoryProtection.PAGE_EXECUTE:
+        result += "x"
+    if protection & MemoryProtection.PAGE_READONLY:
+        result += "r"
+    if protection & MemoryProtection.PAGE_READWRITE:
+        result += "rw"
+    if protection & MemoryProtection.PAGE_EXECUTE_READ:
+        result += "rx"
+    if protection & MemoryProtection.PAGE_EXECUTE_READWRITE:
+        result += "rwx"
+    return result or "---"
+
+# Windows protection strings, filled in per flag value as regions are seen
+_WINDOWS_PROTECTION_STRINGS: Dict[int, str] = {}
+
 class ProcessType:
     """Enum for process types"""
     SIMULATED = "simulated"
@@ -45,9 +122,9 @@ class ProcessBridge:
         try:
             self.real_connector = create_process_connector()
             self.has_real_connector = True
-            logger.info(f"Real process connector created for {self.system}")
+            logger.info("Real process connector created for %s", self.system)
         except Exception as e:
-            logger.warning(f"Could not create real process connector: {e}")
+            logger.warning("Could not create real process connector: %s", e)
             self.real_connector = None
             self.has_real_connector = False
         
@@ -57,6 +134,12 @@ class ProcessBridge:
         # Current attached process type and ID
         self.current_type = None
         self.current_id = None
+        
+        # Per real process ID: (connector region index, its regions converted to dicts
+        # in the same order); rebuilt whenever the connector's index is replaced
+        self._region_cache: Dict[str, Tuple[RegionIndex, List[Dict[str, Any]]]] = {}
+        # psutil handle and static info (pid, name, path, username) per real PID
+        self._process_info_cache: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
     
     def list_simulated_processes(self) -> List[SimulatedProcess]:
         """List all simulated processes"""
@@ -69,38 +152,35 @@ class ProcessBridge:
             return []
         
         try:
-            process_list = []
-            real_processes = self.real_connector.list_processes()
-            
-            for proc in real_processes:
-                process_list.append({
-                    "pid": proc.pid,
-                    "name": proc.name,
-                    "path": proc.path,
-                    "type": ProcessType.REAL
-                })
-            
-            return process_list
+            return list(self.iter_real_processes())
         except Exception as e:
-            logger.error(f"Error listing real processes: {e}")
+            logger.error("Error listing real processes: %s", e)
             return []
     
-    def list_all_processes(self) -> List[Dict[str, Any]]:
-        """List all processes (both simulated and real)"""
-        # Get simulated processes
-        sim_processes = []
-        for proc in self.process_simulator.list_processes():
-            sim_processes.append({
+    def iter_real_processes(self) -> Iterator[Dict[str, Any]]:
+        """Yield real processes on the system, so callers showing a page can stop early"""
+        if not self.has_real_connector or self.real_connector is None:
+            return
+        
+        for proc in self.real_connector.iter_processes():
+            yield {
                 "pid": proc.pid,
                 "name": proc.name,
-                "type": ProcessType.SIMULATED
-            })
-        
-        # Get real processes if available
-        real_processes = self.list_real_processes()
+                "path": proc.path,
+                "type": ProcessType.REAL
+            }
+    
+    def list_all_processes(self) -> List[Dict[str, Any]]:
+        """List all processes (both simulated and real)"""
+        # Simulated processes, read straight from the simulator's table
+        processes = [
+            {"pid": proc.pid, "name": proc.name, "type": ProcessType.SIMULATED}
+            for proc in self.process_simulator.processes.values()
+        ]
         
-        # Combine the lists
-        return sim_processes + real_processes
+        # Append real processes if available, without an intermediate combined list
+        processes.extend(self.list_real_processes())
+        return processes
     
     def attach_to_process(self, process_id: str, process_type: str = ProcessType.SIMULATED) -> bool:
         """Attach to either a simulated or real process"""
@@ -115,7 +195,7 @@ class ProcessBridge:
             if success:
                 self.current_type = ProcessType.SIMULATED
                 self.current_id = process_id
-                logger.info(f"Attached to simulated process {process_id}")
+                logger.info("Attached to simulated process %s", process_id)
             return success
             
         elif process_type == ProcessType.REAL:
@@ -132,6 +212,9 @@ class ProcessBridge:
                     if self.current_type == ProcessType.REAL and self.has_real_connector and self.real_connector is not None:
                         self.real_connector.detach_from_process()
                 
+                # The layout may have changed since any earlier attach
+                self.invalidate_regions(process_id)
+                
                 # Attach to the real process
                 if self.real_connector is not None:
                     success = self.real_connector.attach_to_process(real_pid)
@@ -141,15 +224,15 @@ class ProcessBridge:
                     self.current_type = ProcessType.REAL
                     self.current_id = process_id
                     self.real_pid_map[process_id] = real_pid
-                    logger.info(f"Attached to real process {process_id}")
+                    logger.info("Attached to real process %s", process_id)
                 return success
                 
             except Exception as e:
-                logger.error(f"Error attaching to real process: {e}")
+                logger.error("Error attaching to real process: %s", e)
                 return False
         
         else:
-            logger.error(f"Unknown process type: {process_type}")
+            logger.error("Unknown process type: %s", process_type)
             return False
     
     def detach_from_process(self) -> bool:
@@ -159,6 +242,7 @@ class ProcessBridge:
             return True
         
         if self.current_type == ProcessType.REAL:
+            self.invalidate_regions()
             if self.has_real_connector and self.real_connector is not None:
                 success = self.real_connector.detach_from_process()
                 if success:
@@ -180,9 +264,9 @@ class ProcessBridge:
         
         # Convert address from string to int
         try:
-            addr_int = int(address, 16) if address.startswith("0x") else int(address, 16)
+            addr_int = _parse_addr(address)
         except ValueError:
-            logger.error(f"Invalid address format: {address}")
+            logger.error("Invalid address format: %s", address)
             return None
         
         if self.current_type == ProcessType.SIMULATED:
@@ -199,15 +283,8 @@ class ProcessBridge:
                 return None
             
             # Convert the value to bytes based on its type
-            if isinstance(value, int):
-                return value.to_bytes(8, byteorder='little')
-            elif isinstance(value, float):
-                import struct
-                return struct.pack('<d', value)
-            elif isinstance(value, str):
-                return value.encode('utf-8')
-            else:
-                return str(value).encode('utf-8')
+            pack = _VALUE_PACKERS.get(type(value), _pack_other)
+            return pack(value)
         
         elif self.current_type == ProcessType.REAL:
             if not self.has_real_connector or self.real_connector is None:
@@ -226,9 +303,9 @@ class ProcessBridge:
         
         # Convert address from string to int
         try:
-            addr_int = int(address, 16) if address.startswith("0x") else int(address, 16)
+            addr_int = _parse_addr(address)
         except ValueError:
-            logger.error(f"Invalid address format: {address}")
+            logger.error("Invalid address format: %s", address)
             return False
         
         if self.current_type == ProcessType.SIMULATED:
@@ -244,23 +321,25 @@ class ProcessBridge:
             try:
                 if data_type == "int":
                     value_int = int(value)
-                    data = value_int.to_bytes(8, byteorder='little')
+                    data = _pack_int(value_int)
                 elif data_type == "float":
-                    import struct
                     value_float = float(value)
-                    data = struct.pack('<d', value_float)
+                    data = _DOUBLE.pack(value_float)
                 elif data_type == "string":
                     data = str(value).encode('utf-8')
                 else:
-                    logger.error(f"Unsupported data type: {data_type}")
+                    logger.error("Unsupported data type: %s", data_type)
                     return False
                 
                 if self.real_connector:
-                    return self.real_connector.write_memory(addr_int, data)
+                    success = self.real_connector.write_memory(addr_int, data)
+                    if success:
+                        self.invalidate_regions()
+                    return success
                 return False
             
             except Exception as e:
-                logger.error(f"Error writing memory: {e}")
+                logger.error("Error writing memory: %s", e)
                 return False
         
         return False
@@ -286,35 +365,32 @@ class ProcessBridge:
             
             # For real processes, we need to get memory regions and read some sample values
             try:
-                memory_regions = self.real_connector.get_memory_regions() if self.real_connector else []
                 memory_map = {}
                 
-                # Sample a few regions
-                sample_count = min(len(memory_regions), 50)
-                for i in range(sample_count):
-                    region = memory_regions[i]
+                # Sample a few regions, reading them all in one batch
+                sampled_regions = list(itertools.islice(self.real_connector.iter_memory_regions(), 50)) \
+                    if self.real_connector else []
+                samples = []
+                if self.real_connector:
+                    with self.real_connector.session() as session:
+                        samples = session.read_batch([(region.base_address, 8) for region in sampled_regions])
+                for region, data in zip(sampled_regions, samples):
                     addr = region.base_address
                     addr_str = f"0x{addr:x}"
                     
-                    # Try to read some memory
+                    # Try to interpret the sampled memory
                     try:
-                        data = self.real_connector.read_memory(addr, 8) if self.real_connector else None
                         if data:
                             # Try to interpret the data
-                            import struct
-                            
-                            # As int (64-bit)
+                            # As int (64-bit); samples shorter than 8 bytes are skipped
                             try:
-                                int_val = int.from_bytes(data[:8], byteorder='little')
-                                float_val = struct.unpack('<d', data[:8])[0]
-                                
-                                # Try to interpret as string if it looks printable
-                                str_val = "".join(chr(b) if 32 <= b < 127 else '.' for b in data)
+                                int_val = _QWORD.unpack_from(data)[0]
+                                float_val = _DOUBLE.unpack_from(data)[0]
                                 
-                                # Decide on a type
-                                if all(32 <= b < 127 for b in data):
+                                # Decide on a type: a string if every byte is printable
+                                if not data.translate(None, _PRINTABLE_BYTES):
                                     val_type = "string"
-                                    value = str_val
+                                    value = data.decode('ascii')
                                 else:
                                     val_type = "int"
                                     value = int_val
@@ -322,7 +398,7 @@ class ProcessBridge:
                                 memory_map[addr_str] = {
                                     "value": value,
                                     "type": val_type,
-                                    "hex": ''.join(f'{b:02x}' for b in data)
+                                    "hex": data.hex()
                                 }
                             except:
                                 pass
@@ -332,7 +408,7 @@ class ProcessBridge:
                 return memory_map
                 
             except Exception as e:
-                logger.error(f"Error getting memory map: {e}")
+                logger.error("Error getting memory map: %s", e)
                 return {}
         
         return {}
@@ -363,62 +439,81 @@ class ProcessBridge:
                 return []
             
             try:
-                regions = self.real_connector.get_memory_regions() if self.real_connector else []
-                return [
-                    {
-                        "base_address": f"0x{r.base_address:x}",
-                        "size": r.size,
-                        "protection": self._protection_to_string(r.protection),
-                        "type": r.type,
-                        "mapped_file": r.mapped_file
-                    }
-                    for r in regions
-                ]
+                return self._indexed_regions()[1]
             except Exception as e:
-                logger.error(f"Error getting memory regions: {e}")
+                logger.error("Error getting memory regions: %s", e)
                 return []
         
         return []
     
+    def _indexed_regions(self) -> Tuple[RegionIndex, List[Dict[str, Any]]]:
+        """
+        Return the connector's region index for the current real process and
+        its regions as dicts, converting them only when the index is new.
+        """
+        index = self.real_connector.get_region_index()
+        cached = self._region_cache.get(self.current_id)
+        if cached is None or cached[0] is not index:
+            protection_to_string = self._protection_to_string
+            cached = (index, [_region_dict(r, protection_to_string) for r in index])
+            self._region_cache[self.current_id] = cached
+        return cached
+    
+    def invalidate_regions(self, process_id: Optional[str] = None) -> None:
+        """Drop the cached memory regions of a process (the current one by default)"""
+        process_id = process_id or self.current_id
+        self._region_cache.pop(process_id, None)
+        if self.real_connector is not None:
+            self.real_connector.invalidate_regions()
+    
+    def find_region(self, address: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """Find the memory region of the current process containing an address"""
+        try:
+            addr_int = _parse_addr(address) if isinstance(address, str) else address
+        except ValueError:
+            logger.error("Invalid address format: %s", address)
+            return None
+        
+        if self.current_type == ProcessType.REAL and self.real_connector is not None:
+            try:
+                index, regions = self._indexed_regions()
+            except Exception as e:
+                logger.error("Error getting memory regions: %s", e)
+                return None
+            i = index.position(addr_int)
+            return regions[i] if i is not None else None
+        
+        # Simulated processes have a single region spanning their memory
+        for region in self.get_memory_regions():
+            start = _parse_addr(region["base_address"])
+            if start <= addr_int < start + region["size"]:
+                return region
+        return None
+    
+    def iter_memory_regions(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield memory regions of the current real process one at a time.
+        
+        Regions are converted as the connector produces them, so callers that
+        only need the first few (or a page) never build the full list.
+        """
+        if self.current_type != ProcessType.REAL or not self.real_connector:
+            return
+        
+        protection_to_string = self._protection_to_string
+        for r in self.real_connector.iter_memory_regions():
+            yield _region_dict(r, protection_to_string)
+    
     def _protection_to_string(self, protection: int) -> str:
         """Convert protection flags to a string"""
         if self.system == "Windows":
-            from real_process_connector import MemoryProtection
-            
-            result = ""
-            if protection & MemoryProtection.PAGE_EXECUTE:
-                result += "x"
-            if protection & MemoryProtection.PAGE_READONLY:
-                result += "r"
-            if protection & MemoryProtection.PAGE_READWRITE:
-                result += "rw"
-            if protection & MemoryProtection.PAGE_EXECUTE_READ:
-                result += "rx"
-            if protection & MemoryProtection.PAGE_EXECUTE_READWRITE:
-                result += "rwx"
-            
-            return result or "---"
+            result = _WINDOWS_PROTECTION_STRINGS.get(protection)
+            if result is None:
+                result = _WINDOWS_PROTECTION_STRINGS[protection] = _windows_protection_string(protection)
+            return result
             
         elif self.system == "Linux":
-            from real_process_connector import MemoryProtection
-            
-            result = ""
-            if protection & MemoryProtection.PROT_READ:
-                result += "r"
-            else:
-                result += "-"
-                
-            if protection & MemoryProtection.PROT_WRITE:
-                result += "w"
-            else:
-                result += "-"
-                
-            if protection & MemoryProtection.PROT_EXEC:
-                result += "x"
-            else:
-                result += "-"
-                
-            return result
+            return _LINUX_PROTECTION_STRINGS[protection & 0x7]
         
         return "---"  # Default for unknown systems
     
@@ -449,21 +544,32 @@ class ProcessBridge:
                 real_pid = self.real_pid_map.get(self.current_id)
                 if real_pid:
                     try:
-                        proc = psutil.Process(real_pid)
-                        info = proc.as_dict(attrs=['pid', 'name', 'exe', 'username', 'cpu_percent'])
+                        # Reuse the handle and static attributes while the same process is running;
+                        # is_running() also detects a reused PID
+                        cached = self._process_info_cache.get(real_pid)
+                        if cached is None or not cached[0].is_running():
+                            proc = psutil.Process(real_pid)
+                            info = proc.as_dict(attrs=['pid', 'name', 'exe', 'username'])
+                            cached = (proc, {
+                                "pid": info['pid'],
+                                "name": info['name'],
+                                "path": info.get('exe'),
+                                "username": info.get('username')
+                            })
+                            self._process_info_cache[real_pid] = cached
                         
+                        proc, static_info = cached
                         return {
-                            "pid": info['pid'],
-                            "name": info['name'],
-                            "path": info.get('exe'),
-                            "username": info.get('username'),
-                            "cpu_percent": info.get('cpu_percent'),
+                            **static_info,
+                            # Measured since the previous call on the same handle
+                            "cpu_percent": proc.cpu_percent(),
                             "type": ProcessType.REAL
                         }
                     except psutil.NoSuchProcess:
+                        self._process_info_cache.pop(real_pid, None)
                         return {"error": "Process no longer exists"}
             except Exception as e:
-                logger.error(f"Error getting process info: {e}")
+                logger.error("Error getting process info: %s", e)
                 return {}
         
         return {}
\ No newline at end of file
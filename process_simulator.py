@@ -1,13 +1,102 @@
+import bisect
+import collections
+import functools
 import uuid
 import logging
 import random
-import copy
-from typing import Dict, List, Any, Optional, Set, Tuple
+import sys
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, List, Any, Mapping, Optional, Set, Tuple
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# NumPy is optional; it only speeds up generating large random memory maps
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
+# Number of random values a new process gets when no initial memory is given
+INITIAL_MEMORY_CELLS = 10
+
+# Random memory maps of at least this many cells are drawn with NumPy; below
+# it the cost of setting up the generator outweighs the per-value savings
+NUMPY_RANDOM_MEMORY_THRESHOLD = 256
+
+# Most memory edits a process can undo
+MEMORY_HISTORY_LIMIT = 50
+
+# Journal marker for an address that did not exist before an edit
+_MISSING = object()
+
+def _is_same_value(old: Any, new: Any) -> bool:
+    """Whether writing new over old changes nothing (1 over 1.0 does change the type)"""
+    return old is new or (type(old) is type(new) and old == new)
+
+# Stack addresses recur as CALL/RET push and pop, so their hex keys are
+# memoized rather than rebuilt on every step
+_hex = functools.lru_cache(maxsize=4096)(hex)
+
+# CPU registers (x86_64 style), in display order
+REGISTER_NAMES = (
+    "rax", "rbx", "rcx", "rdx",
+    "rsi", "rdi", "rbp", "rsp",
+    "r8", "r9", "r10", "r11",
+    "r12", "r13", "r14", "r15",
+    "rip", "rflags",
+    "cf", "zf", "sf", "of"  # Individual flags
+)
+_REGISTER_NAME_SET = frozenset(REGISTER_NAMES)
+
+# Kinds of decoded instruction operands
+OPERAND_IMM = 0  # Immediate integer (decimal or 0x-prefixed hex)
+OPERAND_REG = 1  # Register name
+OPERAND_SYMBOL = 2  # Anything else: a symbol name, or a memory key as a destination
+
+def _decode_operand(operand: str) -> Tuple[int, Any]:
+    """Classify an operand string once so execution needs no string parsing"""
+    if operand in _REGISTER_NAME_SET:
+        return OPERAND_REG, operand
+    if operand.isdigit() or (operand.startswith('-') and operand[1:].isdigit()):
+        return OPERAND_IMM, int(operand)
+    if operand.startswith('0x'):
+        try:
+            return OPERAND_IMM, int(operand, 16)
+        except ValueError:
+            pass
+    return OPERAND_SYMBOL, operand
+
+def _random_memory(base_address: int, count: int) -> Dict[str, Any]:
+    """Generate count random int, float, or string cells, 4 bytes apart from base_address"""
+    if HAS_NUMPY and count >= NUMPY_RANDOM_MEMORY_THRESHOLD:
+        # Draw every type and value in bulk, then pick per cell
+        rng = numpy.random.default_rng()
+        value_types = rng.integers(0, 3, size=count).tolist()
+        ints = rng.integers(0, 1001, size=count).tolist()
+        floats = rng.uniform(0, 100, size=count).round(2).tolist()
+        return {
+            hex(base_address + (i * 4)): (
+                ints[i] if value_type == 0 else
+                floats[i] if value_type == 1 else
+                f"String_{i}"
+            )
+            for i, value_type in enumerate(value_types)
+        }
+    
+    # Randomly choose between int, float, and string values, all in one draw
+    value_types = random.choices((0, 1, 2), k=count)
+    randint, uniform = random.randint, random.uniform
+    return {
+        hex(base_address + (i * 4)): (
+            randint(0, 1000) if value_type == 0 else
+            round(uniform(0, 100), 2) if value_type == 1 else
+            f"String_{i}"
+        )
+        for i, value_type in enumerate(value_types)
+    }
+
 # Instruction types for simulation
 class InstructionType:
     MOV = "mov"
@@ -22,11 +111,18 @@ class InstructionType:
 
 class Instruction:
     """Represents a simulated instruction"""
+    
+    __slots__ = ("address", "opcode", "operands", "bytes", "address_int", "length", "decoded_operands")
+    
     def __init__(self, address: str, opcode: str, operands: List[str], bytes_repr: str):
         self.address = address
         self.opcode = opcode  # e.g., MOV, ADD, etc.
         self.operands = operands  # e.g., ['eax', '[ebx+4]']
         self.bytes = bytes_repr  # Hexadecimal representation of instruction
+        # Precomputed so the interpreter loop never parses strings
+        self.address_int = int(address, 16)
+        self.length = len(bytes_repr.split()) // 2  # Simplified instruction length
+        self.decoded_operands = [_decode_operand(operand) for operand in operands]
         
     def __str__(self):
         operands_str = ", ".join(self.operands)
@@ -34,9 +130,13 @@ class Instruction:
 
 class Breakpoint:
     """Represents a breakpoint in memory"""
+    
+    __slots__ = ("address", "type", "condition", "enabled", "hit_count")
+    
     def __init__(self, address: str, bp_type: str, condition: Optional[str] = None, enabled: bool = True):
         self.address = address
-        self.type = bp_type  # "execution", "read", "write", or "access"
+        # Interned: types arrive as fresh strings from request bodies but are few and compared often
+        self.type = sys.intern(bp_type)  # "execution", "read", "write", or "access"
         self.condition = condition  # Optional condition expression
         self.enabled = enabled
         self.hit_count = 0
@@ -46,8 +146,12 @@ class Breakpoint:
 
 class Symbol:
     """Represents a symbol or label in the code"""
+    
+    __slots__ = ("address", "address_int", "name", "type")
+    
     def __init__(self, address: str, name: str, symbol_type: str = "function"):
         self.address = address
+        self.address_int = int(address, 16)  # Parsed once for branches that target the symbol
         self.name = name
         self.type = symbol_type  # "function", "variable", etc.
     
@@ -57,20 +161,23 @@ class Symbol:
 class SimulatedProcess:
     """Class representing a simulated process with memory, registers, and code"""
     
+    # Fixed attribute layout: no per-instance __dict__, and faster attribute access
+    __slots__ = (
+        "name", "pid", "memory", "memory_version", "registers",
+        "stack", "stack_base", "stack_size", "instructions", "instruction_addresses", "code_base",
+        "breakpoints", "execution_breakpoints", "execution_breakpoint_addresses", "symbols", "symbols_by_name", "running", "step_mode",
+        "undo_stack", "redo_stack", "pending_changes"
+    )
+    
     def __init__(self, name: str, pid: str, memory: Optional[Dict[str, Any]] = None):
         self.name = name
         self.pid = pid
         self.memory = memory or {}
+        # Incremented on every memory change so readers can tell when cached views are stale
+        self.memory_version = 0
         
         # CPU registers (x86_64 style)
-        self.registers = {
-            "rax": 0, "rbx": 0, "rcx": 0, "rdx": 0,
-            "rsi": 0, "rdi": 0, "rbp": 0, "rsp": 0,
-            "r8": 0, "r9": 0, "r10": 0, "r11": 0,
-            "r12": 0, "r13": 0, "r14": 0, "r15": 0,
-            "rip": 0, "rflags": 0,
-            "cf": 0, "zf": 0, "sf": 0, "of": 0  # Individual flags
-        }
+        self.registers = dict.fromkeys(REGISTER_NAMES, 0)
         
         # Stack memory
         self.stack = {}
@@ -78,11 +185,15 @@ class SimulatedProcess:
         self.stack_size = 0x10000  # 64KB stack
         
         # Code & instructions
-        self.instructions = {}  # address -> Instruction object
+        self.instructions = {}  # int address -> Instruction object
+        self.instruction_addresses: List[int] = []  # Sorted keys of instructions
         self.code_base = 0x400000  # Base address for code
         
         # Breakpoints
         self.breakpoints = {}  # address -> Breakpoint object
+        # Enabled execution breakpoints by int address, checked on every run step
+        self.execution_breakpoints: Dict[int, Breakpoint] = {}
+        self.execution_breakpoint_addresses: List[int] = []  # Sorted keys of execution_breakpoints
         
         # Symbols/labels
         self.symbols = {}  # address -> Symbol object
@@ -92,72 +203,162 @@ class SimulatedProcess:
         self.running = False
         self.step_mode = False
         
-        # Memory access history for undo/redo
-        self.memory_history = []
-        self.history_position = -1
+        # Journals of memory edits for undo/redo, each edit a list of
+        # (address, old value, new value); the oldest edits fall off the undo end
+        self.undo_stack: Deque[List[Tuple[str, Any, Any]]] = collections.deque(maxlen=MEMORY_HISTORY_LIMIT)
+        self.redo_stack: List[List[Tuple[str, Any, Any]]] = []
+        # Changes gathered by an open transaction, journaled as one edit on commit
+        self.pending_changes: Optional[List[Tuple[str, Any, Any]]] = None
         
     def __str__(self):
         return f"{self.name} (PID: {self.pid})"
     
-    def save_memory_state(self):
-        """Save current memory state for undo/redo"""
-        # Remove any states after current position if we're in the middle
-        if self.history_position < len(self.memory_history) - 1:
-            self.memory_history = self.memory_history[:self.history_position + 1]
-        
-        # Create a deep copy of the current memory
-        mem_copy = copy.deepcopy(self.memory)
-        self.memory_history.append(mem_copy)
-        self.history_position = len(self.memory_history) - 1
-        
-        # Keep history size manageable
-        if len(self.memory_history) > 50:  # Limit to 50 states
-            self.memory_history.pop(0)
-            self.history_position -= 1
+    def add_instruction(self, instr: Instruction) -> None:
+        """Add or replace an instruction, keeping the sorted address list in step"""
+        address = instr.address_int
+        if address not in self.instructions:
+            bisect.insort(self.instruction_addresses, address)
+        self.instructions[address] = instr
+    
+    def update_execution_breakpoint(self, address: str) -> None:
+        """Bring execution_breakpoints in line with the breakpoint at address"""
+        try:
+            address_int = int(address, 16)
+        except ValueError:
+            return
+        
+        bp = self.breakpoints.get(address)
+        if bp is not None and bp.enabled and bp.type == "execution":
+            if address_int not in self.execution_breakpoints:
+                bisect.insort(self.execution_breakpoint_addresses, address_int)
+            self.execution_breakpoints[address_int] = bp
+        elif self.execution_breakpoints.pop(address_int, None) is not None:
+            addresses = self.execution_breakpoint_addresses
+            del addresses[bisect.bisect_left(addresses, address_int)]
+    
+    def record_memory_change(self, changes: List[Tuple[str, Any, Any]]) -> None:
+        """
+        Journal one undoable edit as (address, old value, new value) triples.
+        
+        old is _MISSING for addresses the edit created. Only the changed
+        cells are kept, so recording costs nothing per unchanged address.
+        Inside a transaction the changes are held until it commits.
+        """
+        if self.pending_changes is not None:
+            self.pending_changes.extend(changes)
+            return
+        
+        # Undone edits can no longer be redone once a new edit is made
+        self.redo_stack.clear()
+        
+        # Bounded deque: past the limit the oldest edit is dropped
+        self.undo_stack.append(changes)
+    
+    def begin_transaction(self) -> bool:
+        """Start grouping memory edits into a single undo step"""
+        if self.pending_changes is not None:
+            return False
+        self.pending_changes = []
+        return True
+    
+    def commit_transaction(self) -> bool:
+        """Journal the edits made since begin_transaction as one undo step"""
+        changes = self.pending_changes
+        if changes is None:
+            return False
+        self.pending_changes = None
+        if changes:
+            self.record_memory_change(changes)
+        return True
     
     def undo_memory_change(self) -> bool:
         """Undo the last memory change"""
-        if self.history_position > 0:
-            self.history_position -= 1
-            self.memory = copy.deepcopy(self.memory_history[self.history_position])
+        if self.undo_stack:
+            changes = self.undo_stack.pop()
+            memory = self.memory
+            # Revert in reverse so repeated writes to one address unwind in order
+            for address, old_value, _ in reversed(changes):
+                if old_value is _MISSING:
+                    memory.pop(address, None)
+                else:
+                    memory[address] = old_value
+            self.redo_stack.append(changes)
+            self.memory_version += 1
             return True
         return False
     
     def redo_memory_change(self) -> bool:
         """Redo a previously undone memory change"""
-        if self.history_position < len(self.memory_history) - 1:
-            self.history_position += 1
-            self.memory = copy.deepcopy(self.memory_history[self.history_position])
+        if self.redo_stack:
+            changes = self.redo_stack.pop()
+            memory = self.memory
+            for address, _, new_value in changes:
+                memory[address] = new_value
+            self.undo_stack.append(changes)
+            self.memory_version += 1
             return True
         return False
 
 class ProcessSimulator:
     """Class for simulating processes that can be attached to for memory editing and debugging"""
     
+    # Sample program given to every new process. Symbols and instructions are
+    # never modified once created, so all processes share these objects
+    _SAMPLE_ENTRY = 0x400500  # main
+    _SAMPLE_SYMBOLS = (
+        # Functions
+        Symbol("0x400500", "main", "function"),
+        Symbol("0x400600", "calculate", "function"),
+        Symbol("0x400700", "print_result", "function"),
+        Symbol("0x400800", "handle_error", "function"),
+        # Global variables
+        Symbol("0x601000", "counter", "variable"),
+        Symbol("0x601008", "result", "variable"),
+        Symbol("0x601010", "message", "variable"),
+    )
+    # Initial values of the global variables
+    _SAMPLE_VARIABLES = (
+        ("0x601000", 0),
+        ("0x601008", 0),
+        ("0x601010", "Hello, Debugger!"),
+    )
+    # Code for main
+    _SAMPLE_INSTRUCTIONS = (
+        Instruction("0x400500", InstructionType.MOV, ["rax", "0"], "48 c7 c0 00 00 00 00"),
+        Instruction("0x400507", InstructionType.MOV, ["rbx", "10"], "48 c7 c3 0a 00 00 00"),
+        Instruction("0x40050e", InstructionType.CALL, ["0x400600"], "e8 e7 00 00 00"),
+        Instruction("0x400513", InstructionType.CMP, ["rax", "0"], "48 83 f8 00"),
+        Instruction("0x400517", InstructionType.JE, ["0x400800"], "0f 84 d7 02 00 00"),
+        Instruction("0x40051d", InstructionType.CALL, ["0x400700"], "e8 d2 01 00 00"),
+        Instruction("0x400522", InstructionType.RET, [], "c3"),
+    )
+    
     def __init__(self):
         self.processes: Dict[str, SimulatedProcess] = {}
         self.current_process: Optional[str] = None
+        # Opcode -> handler(process, instr, rip) returning the next RIP;
+        # opcodes without an entry (e.g. NOP) just fall through
+        self._opcode_handlers: Dict[str, Callable[[SimulatedProcess, Instruction, int], int]] = {
+            InstructionType.MOV: self._op_mov,
+            InstructionType.ADD: self._op_add,
+            InstructionType.SUB: self._op_sub,
+            InstructionType.JMP: self._op_jmp,
+            InstructionType.CMP: self._op_cmp,
+            InstructionType.JE: self._op_je,
+            InstructionType.CALL: self._op_call,
+            InstructionType.RET: self._op_ret,
+        }
         logger.debug("Process simulator initialized")
     
     def create_process(self, name: str, initial_memory: Optional[Dict[str, Any]] = None) -> str:
         """Create a new simulated process with given name and optional initial memory"""
-        pid = str(uuid.uuid4())
+        # Interned so the key in self.processes and process.pid share one string
+        pid = sys.intern(uuid.uuid4().hex)
         
         # If no initial memory provided, create some random values
         if initial_memory is None:
-            initial_memory = {}
             base_address = random.randint(0x1000, 0x10000)
-            for i in range(10):
-                address = hex(base_address + (i * 4))
-                # Randomly choose between int, float, and string values
-                value_type = random.choice([0, 1, 2])
-                if value_type == 0:
-                    value = random.randint(0, 1000)
-                elif value_type == 1:
-                    value = round(random.uniform(0, 100), 2)
-                else:
-                    value = f"String_{i}"
-                initial_memory[address] = value
+            initial_memory = _random_memory(base_address, INITIAL_MEMORY_CELLS)
         
         # Create the process
         process = SimulatedProcess(name, pid, initial_memory)
@@ -165,72 +366,31 @@ class ProcessSimulator:
         # Generate some sample code and symbols for the process
         self._generate_sample_code(process)
         
-        # Set up initial memory state for undo/redo
-        process.save_memory_state()
-        
         self.processes[pid] = process
-        logger.debug(f"Created process: {name} with PID: {pid}")
+        logger.debug("Created process: %s with PID: %s", name, pid)
         return pid
     
     def _generate_sample_code(self, process: SimulatedProcess) -> None:
         """Generate sample instructions and symbols for the process"""
-        # Sample functions and their code
-        functions = [
-            ("main", 0x400500),
-            ("calculate", 0x400600),
-            ("print_result", 0x400700),
-            ("handle_error", 0x400800)
-        ]
-        
-        # Create symbols for functions
-        for name, addr in functions:
-            address = hex(addr)
-            symbol = Symbol(address, name, "function")
-            process.symbols[address] = symbol
-            process.symbols_by_name[name] = symbol
-        
-        # Create some global variables as symbols
-        variables = [
-            ("counter", 0x601000, 0),
-            ("result", 0x601008, 0),
-            ("message", 0x601010, "Hello, Debugger!")
-        ]
-        
-        for name, addr, value in variables:
-            address = hex(addr)
-            symbol = Symbol(address, name, "variable")
-            process.symbols[address] = symbol
-            process.symbols_by_name[name] = symbol
-            process.memory[address] = value
-        
-        # Generate instructions for main
-        main_addr = 0x400500
-        instructions = [
-            (main_addr, InstructionType.MOV, ["rax", "0"], "48 c7 c0 00 00 00 00"),
-            (main_addr + 7, InstructionType.MOV, ["rbx", "10"], "48 c7 c3 0a 00 00 00"),
-            (main_addr + 14, InstructionType.CALL, [hex(0x400600)], "e8 e7 00 00 00"),
-            (main_addr + 19, InstructionType.CMP, ["rax", "0"], "48 83 f8 00"),
-            (main_addr + 23, InstructionType.JE, [hex(0x400800)], "0f 84 d7 02 00 00"),
-            (main_addr + 29, InstructionType.CALL, [hex(0x400700)], "e8 d2 01 00 00"),
-            (main_addr + 34, InstructionType.RET, [], "c3")
-        ]
+        # Create symbols for functions and global variables
+        for symbol in self._SAMPLE_SYMBOLS:
+            process.symbols[symbol.address] = symbol
+            process.symbols_by_name[symbol.name] = symbol
+        process.memory.update(self._SAMPLE_VARIABLES)
         
         # Add instructions to process
-        for addr, opcode, operands, bytes_repr in instructions:
-            address = hex(addr)
-            instr = Instruction(address, opcode, operands, bytes_repr)
-            process.instructions[address] = instr
+        for instr in self._SAMPLE_INSTRUCTIONS:
+            process.add_instruction(instr)
         
         # Set initial RIP to main
-        process.registers["rip"] = main_addr
+        process.registers["rip"] = self._SAMPLE_ENTRY
     
     def delete_process(self, pid: str) -> bool:
         """Delete a simulated process by PID"""
-        if pid in self.processes:
-            del self.processes[pid]
-            logger.debug(f"Deleted process with PID: {pid}")
+        if self.processes.pop(pid, None) is not None:
+            logger.debug("Deleted process with PID: %s", pid)
             return True
-        logger.warning(f"Attempted to delete non-existent process: {pid}")
+        logger.warning("Attempted to delete non-existent process: %s", pid)
         return False
     
     def list_processes(self) -> List[SimulatedProcess]:
@@ -243,50 +403,99 @@ class ProcessSimulator:
     
     def read_memory(self, pid: str, address: str) -> Optional[Any]:
         """Read memory at the specified address for the given process"""
-        process = self.get_process(pid)
+        process = self.processes.get(pid)
         if not process:
-            logger.warning(f"Process {pid} not found")
+            logger.warning("Process %s not found", pid)
             return None
         
         value = process.memory.get(address)
-        logger.debug(f"Read memory at {address} for process {pid}: {value}")
+        logger.debug("Read memory at %s for process %s: %s", address, pid, value)
         return value
     
     def write_memory(self, pid: str, address: str, value: Any) -> bool:
         """Write value to memory at the specified address for the given process"""
-        process = self.get_process(pid)
+        process = self.processes.get(pid)
         if not process:
-            logger.warning(f"Process {pid} not found")
+            logger.warning("Process %s not found", pid)
             return False
         
-        # Save current state for undo/redo
-        process.save_memory_state()
+        memory = process.memory
+        old_value = memory.get(address, _MISSING)
         
         # Check if any breakpoints might be triggered (memory write breakpoints)
-        self._check_memory_breakpoints(process, address, "write")
+        if process.breakpoints:
+            self._check_memory_breakpoints(process, address, "write")
+        
+        if _is_same_value(old_value, value):
+            # Nothing changes: keep history and cached views as they are
+            return True
+        
+        # Journal the change for undo/redo
+        process.record_memory_change([(address, old_value, value)])
         
         # Write the value
-        process.memory[address] = value
-        logger.debug(f"Wrote {value} to memory at {address} for process {pid}")
+        memory[address] = value
+        process.memory_version += 1
+        logger.debug("Wrote %s to memory at %s for process %s", value, address, pid)
         return True
     
-    def get_memory_map(self, pid: str) -> Dict[str, Any]:
-        """Get the entire memory map for a process"""
+    def write_memory_bulk(self, pid: str, items: List[Tuple[str, Any]]) -> bool:
+        """
+        Write several (address, value) pairs for the given process.
+        
+        The batch is saved as a single undo step, so undo reverts all of it.
+        """
+        process = self.processes.get(pid)
+        if not process:
+            logger.warning("Process %s not found", pid)
+            return False
+        
+        memory = process.memory
+        changes = []
+        has_breakpoints = bool(process.breakpoints)
+        for address, value in items:
+            # Check if any breakpoints might be triggered (memory write breakpoints)
+            if has_breakpoints:
+                self._check_memory_breakpoints(process, address, "write")
+            old_value = memory.get(address, _MISSING)
+            if not _is_same_value(old_value, value):
+                changes.append((address, old_value, value))
+                memory[address] = value
+        
+        # Journal the whole batch for undo/redo
+        if changes:
+            process.record_memory_change(changes)
+            process.memory_version += 1
+        logger.debug("Wrote %d values to memory for process %s", len(items), pid)
+        return True
+    
+    def get_memory_map(self, pid: str) -> Mapping[str, Any]:
+        """
+        Get the entire memory map for a process.
+        
+        Returns a read-only live view of the process memory rather than a
+        copy; writes go through write_memory so memory_version stays current.
+        """
         process = self.get_process(pid)
         if not process:
-            logger.warning(f"Process {pid} not found")
+            logger.warning("Process %s not found", pid)
             return {}
         
-        return process.memory
+        return MappingProxyType(process.memory)
     
-    def get_registers(self, pid: str) -> Dict[str, int]:
-        """Get the CPU registers for a process"""
+    def get_registers(self, pid: str) -> Mapping[str, int]:
+        """
+        Get the CPU registers for a process.
+        
+        Returns a read-only live view rather than a copy; changes go through
+        set_register.
+        """
         process = self.get_process(pid)
         if not process:
-            logger.warning(f"Process {pid} not found")
+            logger.warning("Process %s not found", pid)
             return {}
         
-        return process.registers
+        return MappingProxyType(process.registers)
     
     def set_register(self, pid: str, register: str, value: int) -> bool:
         """Set a CPU register to a specific value"""
@@ -295,7 +504,7 @@ class ProcessSimulator:
             return False
         
         process.registers[register] = value
-        logger.debug(f"Set register {register} to {value} for process {pid}")
+        logger.debug("Set register %s to %s for process %s", register, value, pid)
         return True
     
     def get_instructions(self, pid: str, start_address: Optional[str] = None, count: int = 10) -> List[Instruction]:
@@ -304,28 +513,22 @@ class ProcessSimulator:
         if not process:
             return []
         
-        if not start_address:
+        if start_address:
+            start_addr_int = int(start_address, 16)
+        else:
             # Use current instruction pointer if no address specified
-            start_address = hex(process.registers["rip"])
-        
-        # Get all instruction addresses and sort them
-        addresses = sorted([int(addr, 16) for addr in process.instructions.keys()])
+            start_addr_int = process.registers["rip"]
         
-        # Find the start address in the sorted list
-        start_addr_int = int(start_address, 16)
-        start_idx = 0
-        for i, addr in enumerate(addresses):
-            if addr >= start_addr_int:
-                start_idx = i
-                break
+        # Find the first instruction at or after the start address
+        addresses = process.instruction_addresses
+        start_idx = bisect.bisect_left(addresses, start_addr_int)
+        if start_idx == len(addresses):
+            # Past the last instruction: show the listing from the top
+            start_idx = 0
         
         # Get up to 'count' instructions from that point
-        result = []
-        for i in range(start_idx, min(start_idx + count, len(addresses))):
-            addr = hex(addresses[i])
-            result.append(process.instructions[addr])
-        
-        return result
+        instructions = process.instructions
+        return [instructions[addr] for addr in addresses[start_idx:start_idx + count]]
     
     def set_breakpoint(self, pid: str, address: str, bp_type: str = "execution", condition: Optional[str] = None) -> bool:
         """Set a breakpoint at the specified address"""
@@ -335,17 +538,18 @@ class ProcessSimulator:
         
         bp = Breakpoint(address, bp_type, condition)
         process.breakpoints[address] = bp
-        logger.debug(f"Set {bp_type} breakpoint at {address} for process {pid}")
+        process.update_execution_breakpoint(address)
+        logger.debug("Set %s breakpoint at %s for process %s", bp_type, address, pid)
         return True
     
     def remove_breakpoint(self, pid: str, address: str) -> bool:
         """Remove a breakpoint at the specified address"""
         process = self.get_process(pid)
-        if not process or address not in process.breakpoints:
+        if not process or process.breakpoints.pop(address, None) is None:
             return False
         
-        del process.breakpoints[address]
-        logger.debug(f"Removed breakpoint at {address} for process {pid}")
+        process.update_execution_breakpoint(address)
+        logger.debug("Removed breakpoint at %s for process %s", address, pid)
         return True
     
     def get_breakpoints(self, pid: str) -> List[Breakpoint]:
@@ -359,14 +563,27 @@ class ProcessSimulator:
     def toggle_breakpoint(self, pid: str, address: str) -> Tuple[bool, bool]:
         """Toggle a breakpoint on/off, returns (success, new_state)"""
         process = self.get_process(pid)
-        if not process or address not in process.breakpoints:
+        bp = process.breakpoints.get(address) if process else None
+        if bp is None:
             return False, False
         
-        bp = process.breakpoints[address]
         bp.enabled = not bp.enabled
-        logger.debug(f"Toggled breakpoint at {address} to {bp.enabled} for process {pid}")
+        process.update_execution_breakpoint(address)
+        logger.debug("Toggled breakpoint at %s to %s for process %s", address, bp.enabled, pid)
         return True, bp.enabled
     
+    def find_next_breakpoint(self, pid: str, address: str) -> Optional[Breakpoint]:
+        """Find the first enabled execution breakpoint at or after the given address"""
+        process = self.get_process(pid)
+        if not process:
+            return None
+        
+        addresses = process.execution_breakpoint_addresses
+        index = bisect.bisect_left(addresses, int(address, 16))
+        if index == len(addresses):
+            return None
+        return process.execution_breakpoints[addresses[index]]
+    
     def get_symbols(self, pid: str) -> List[Symbol]:
         """Get all symbols for a process"""
         process = self.get_process(pid)
@@ -399,11 +616,11 @@ class ProcessSimulator:
         
         # Get current instruction pointer
         rip = process.registers["rip"]
-        next_rip = self._execute_instruction(process, hex(rip))
+        next_rip = self._execute_instruction(process, rip)
         
         # Update instruction pointer
         process.registers["rip"] = next_rip
-        logger.debug(f"Stepped instruction in process {pid}, RIP now {hex(next_rip)}")
+        logger.debug("Stepped instruction in process %s, RIP now %#x", pid, next_rip)
         return True
     
     def run_until_breakpoint(self, pid: str, max_steps: int = 1000) -> bool:
@@ -413,193 +630,186 @@ class ProcessSimulator:
             return False
         
         process.running = True
-        steps = 0
         
-        while process.running and steps < max_steps:
-            rip = process.registers["rip"]
-            rip_hex = hex(rip)
+        # Bound once: the loop body runs for every simulated instruction
+        registers = process.registers
+        execution_breakpoints = process.execution_breakpoints
+        execute = self._execute_instruction
+        
+        for _ in range(max_steps):
+            if not process.running:
+                break
+            rip = registers["rip"]
             
             # Check if we hit an execution breakpoint
-            if rip_hex in process.breakpoints and process.breakpoints[rip_hex].enabled:
-                bp = process.breakpoints[rip_hex]
-                if bp.type == "execution":
+            if execution_breakpoints:
+                bp = execution_breakpoints.get(rip)
+                if bp is not None:
                     bp.hit_count += 1
-                    logger.debug(f"Hit execution breakpoint at {rip_hex}")
+                    logger.debug("Hit execution breakpoint at %#x", rip)
                     process.running = False
                     return True
             
-            # Execute current instruction
-            next_rip = self._execute_instruction(process, rip_hex)
-            
-            # Update instruction pointer
-            process.registers["rip"] = next_rip
-            steps += 1
+            # Execute current instruction and update instruction pointer
+            registers["rip"] = execute(process, rip)
         
         process.running = False
         return True
     
-    def _execute_instruction(self, process: SimulatedProcess, address: str) -> int:
+    def _execute_instruction(self, process: SimulatedProcess, rip: int) -> int:
         """Execute the instruction at the given address and return next instruction address"""
-        if address not in process.instructions:
+        instr = process.instructions.get(rip)
+        if instr is None:
             # If no instruction at this address, just advance by 1
-            return int(address, 16) + 1
+            return rip + 1
         
-        instr = process.instructions[address]
-        rip = int(address, 16)
-        next_rip = rip
+        # Very simple instruction simulation, one handler per opcode
+        handler = self._opcode_handlers.get(instr.opcode)
+        if handler is None:
+            # Default: just move to next instruction
+            return rip + instr.length
+        return handler(process, instr, rip)
+    
+    def _op_mov(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Handle MOV instruction (dst, src)"""
+        registers = process.registers
+        (dst_kind, dst), (src_kind, src) = instr.decoded_operands
         
-        # Very simple instruction simulation
-        if instr.opcode == InstructionType.MOV:
-            # Handle MOV instruction (dst, src)
-            dst, src = instr.operands
-            
-            # Get the source value
-            if src.isdigit() or (src.startswith('-') and src[1:].isdigit()):
-                value = int(src)
-            elif src.startswith('0x'):
-                value = int(src, 16)
-            else:
-                # Assume it's a register
-                value = process.registers.get(src, 0)
-            
-            # Set the destination
-            if dst in process.registers:
-                process.registers[dst] = value
-            else:
-                # Assume it's a memory address
-                process.memory[dst] = value
-            
-            # Determine length of instruction (simplified)
-            next_rip = rip + len(instr.bytes.split()) // 2
+        # Get the source value
+        value = src if src_kind == OPERAND_IMM else registers.get(src, 0)
         
-        elif instr.opcode == InstructionType.ADD:
-            # Handle ADD instruction (dst, src)
-            dst, src = instr.operands
-            
-            # Get the source value
-            if src.isdigit() or (src.startswith('-') and src[1:].isdigit()):
-                value = int(src)
-            elif src.startswith('0x'):
-                value = int(src, 16)
-            else:
-                # Assume it's a register
-                value = process.registers.get(src, 0)
-            
-            # Add to destination
-            if dst in process.registers:
-                process.registers[dst] += value
-            else:
-                # Assume it's a memory address
-                if dst in process.memory:
-                    process.memory[dst] += value
-            
-            next_rip = rip + len(instr.bytes.split()) // 2
+        # Set the destination
+        if dst_kind == OPERAND_REG:
+            registers[dst] = value
+        else:
+            # Assume it's a memory address
+            process.memory[instr.operands[0]] = value
+            process.memory_version += 1
         
-        elif instr.opcode == InstructionType.SUB:
-            # Similar to ADD but subtract
-            dst, src = instr.operands
-            
-            if src.isdigit() or (src.startswith('-') and src[1:].isdigit()):
-                value = int(src)
-            elif src.startswith('0x'):
-                value = int(src, 16)
-            else:
-                value = process.registers.get(src, 0)
-            
-            if dst in process.registers:
-                process.registers[dst] -= value
-            else:
-                if dst in process.memory:
-                    process.memory[dst] -= value
-            
-            next_rip = rip + len(instr.bytes.split()) // 2
-        
-        elif instr.opcode == InstructionType.JMP:
-            # Unconditional jump
-            target = instr.operands[0]
-            if target.startswith('0x'):
-                next_rip = int(target, 16)
-            else:
-                # Try to resolve symbol
-                symbol = process.symbols_by_name.get(target)
-                if symbol:
-                    next_rip = int(symbol.address, 16)
-        
-        elif instr.opcode == InstructionType.CMP:
-            # Compare two values and set flags
-            left, right = instr.operands
-            
-            # Get left value
-            if left in process.registers:
-                left_val = process.registers[left]
-            else:
-                left_val = int(left, 0) if left.startswith('0x') else int(left)
-            
-            # Get right value
-            if right in process.registers:
-                right_val = process.registers[right]
-            else:
-                right_val = int(right, 0) if right.startswith('0x') else int(right)
-            
-            # Set flags
-            process.registers['zf'] = 1 if left_val == right_val else 0
-            process.registers['sf'] = 1 if left_val < right_val else 0
-            
-            next_rip = rip + len(instr.bytes.split()) // 2
-        
-        elif instr.opcode == InstructionType.JE:
-            # Jump if equal (ZF=1)
-            if process.registers['zf'] == 1:
-                target = instr.operands[0]
-                if target.startswith('0x'):
-                    next_rip = int(target, 16)
-                else:
-                    symbol = process.symbols_by_name.get(target)
-                    if symbol:
-                        next_rip = int(symbol.address, 16)
-            else:
-                next_rip = rip + len(instr.bytes.split()) // 2
-        
-        elif instr.opcode == InstructionType.CALL:
-            # Push return address to stack and jump
-            target = instr.operands[0]
-            ret_addr = rip + len(instr.bytes.split()) // 2
-            
-            # Push return address to stack
-            rsp = process.registers['rsp'] - 8  # Decrement stack pointer (x86_64 uses 8 bytes)
-            process.registers['rsp'] = rsp
-            process.memory[hex(rsp)] = ret_addr
-            
-            # Jump to target
-            if target.startswith('0x'):
-                next_rip = int(target, 16)
-            else:
-                symbol = process.symbols_by_name.get(target)
-                if symbol:
-                    next_rip = int(symbol.address, 16)
-        
-        elif instr.opcode == InstructionType.RET:
-            # Pop return address from stack
-            rsp = process.registers['rsp']
-            if hex(rsp) in process.memory:
-                next_rip = process.memory[hex(rsp)]
-                process.registers['rsp'] = rsp + 8  # Increment stack pointer
+        # Determine length of instruction (simplified)
+        return rip + instr.length
+    
+    def _op_add(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Handle ADD instruction (dst, src)"""
+        registers = process.registers
+        (dst_kind, dst), (src_kind, src) = instr.decoded_operands
+        
+        # Get the source value
+        value = src if src_kind == OPERAND_IMM else registers.get(src, 0)
         
+        # Add to destination
+        if dst_kind == OPERAND_REG:
+            registers[dst] += value
         else:
-            # Default: just move to next instruction
-            next_rip = rip + len(instr.bytes.split()) // 2
+            # Assume it's a memory address
+            dst = instr.operands[0]
+            if dst in process.memory:
+                process.memory[dst] += value
+                process.memory_version += 1
+        
+        return rip + instr.length
+    
+    def _op_sub(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Handle SUB instruction (dst, src), like ADD but subtracting"""
+        registers = process.registers
+        (dst_kind, dst), (src_kind, src) = instr.decoded_operands
+        
+        value = src if src_kind == OPERAND_IMM else registers.get(src, 0)
+        
+        if dst_kind == OPERAND_REG:
+            registers[dst] -= value
+        else:
+            dst = instr.operands[0]
+            if dst in process.memory:
+                process.memory[dst] -= value
+                process.memory_version += 1
+        
+        return rip + instr.length
+    
+    def _branch_target(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Resolve a branch operand to an address, staying at rip for an unknown symbol"""
+        kind, target = instr.decoded_operands[0]
+        if kind == OPERAND_IMM:
+            return target
+        
+        # Try to resolve symbol
+        symbol = process.symbols_by_name.get(target)
+        return symbol.address_int if symbol else rip
+    
+    def _op_jmp(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Handle unconditional jump"""
+        return self._branch_target(process, instr, rip)
+    
+    def _op_cmp(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Compare two values and set flags"""
+        registers = process.registers
+        (left_kind, left), (right_kind, right) = instr.decoded_operands
+        
+        # Get left and right values
+        left_val = registers.get(left, 0) if left_kind != OPERAND_IMM else left
+        right_val = registers.get(right, 0) if right_kind != OPERAND_IMM else right
+        
+        # Set flags
+        registers['zf'] = 1 if left_val == right_val else 0
+        registers['sf'] = 1 if left_val < right_val else 0
         
-        return next_rip
+        return rip + instr.length
+    
+    def _op_je(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Jump if equal (ZF=1)"""
+        if process.registers['zf'] == 1:
+            return self._branch_target(process, instr, rip)
+        return rip + instr.length
+    
+    def _op_call(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Push return address to stack and jump"""
+        registers = process.registers
+        ret_addr = rip + instr.length
+        
+        # Push return address to stack
+        rsp = registers['rsp'] - 8  # Decrement stack pointer (x86_64 uses 8 bytes)
+        registers['rsp'] = rsp
+        process.memory[_hex(rsp)] = ret_addr
+        process.memory_version += 1
+        
+        # Jump to target
+        return self._branch_target(process, instr, rip)
+    
+    def _op_ret(self, process: SimulatedProcess, instr: Instruction, rip: int) -> int:
+        """Pop return address from stack"""
+        registers = process.registers
+        rsp = registers['rsp']
+        ret_addr = process.memory.get(_hex(rsp), _MISSING)
+        if ret_addr is _MISSING:
+            return rip
+        registers['rsp'] = rsp + 8  # Increment stack pointer
+        return ret_addr
     
     def _check_memory_breakpoints(self, process: SimulatedProcess, address: str, access_type: str) -> None:
         """Check if any memory access breakpoints are triggered"""
-        if address in process.breakpoints:
-            bp = process.breakpoints[address]
+        bp = process.breakpoints.get(address)
+        if bp is not None:
             if bp.enabled and (bp.type == access_type or bp.type == "access"):
                 bp.hit_count += 1
-                logger.debug(f"Hit {access_type} breakpoint at {address}")
+                logger.debug("Hit %s breakpoint at %s", access_type, address)
                 process.running = False
     
+    def begin_transaction(self, pid: str) -> bool:
+        """Group the following memory writes to a process into a single undo step"""
+        process = self.get_process(pid)
+        if not process:
+            return False
+        
+        return process.begin_transaction()
+    
+    def commit_transaction(self, pid: str) -> bool:
+        """End the transaction started by begin_transaction"""
+        process = self.get_process(pid)
+        if not process:
+            return False
+        
+        return process.commit_transaction()
+    
     def undo_memory_edit(self, pid: str) -> bool:
         """Undo the last memory edit"""
         process = self.get_process(pid)
@@ -4,16 +4,27 @@ Provides functionality to attach to real running processes and manipulate their
 Platform-specific implementations for Windows, Linux, and macOS.
 """
 
+import array
+import bisect
+import collections
+import errno
+import importlib
+import importlib.util
+import itertools
 import os
 import sys
 import logging
 import platform
+import re
 import subprocess
+import threading
+import time
 import ctypes
-from typing import Optional, Dict, List, Any, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Dict, List, Any, Tuple, Union
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
 class ProcessAccess:
@@ -40,8 +51,85 @@ class MemoryProtection:
     PROT_WRITE = 0x2
     PROT_EXEC = 0x4
 
+class _IOVec(ctypes.Structure):
+    """struct iovec for process_vm_readv/writev"""
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t)
+    ]
+
+class _MemoryBasicInformation(ctypes.Structure):
+    """MEMORY_BASIC_INFORMATION filled in by VirtualQueryEx"""
+    _fields_ = [
+        ("BaseAddress", ctypes.c_void_p),
+        ("AllocationBase", ctypes.c_void_p),
+        ("AllocationProtect", ctypes.c_ulong),
+        ("RegionSize", ctypes.c_size_t),
+        ("State", ctypes.c_ulong),
+        ("Protect", ctypes.c_ulong),
+        ("Type", ctypes.c_ulong)
+    ]
+
+class _SystemInfo(ctypes.Structure):
+    """SYSTEM_INFO filled in by GetSystemInfo"""
+    _fields_ = [
+        ("wProcessorArchitecture", ctypes.c_ushort),
+        ("wReserved", ctypes.c_ushort),
+        ("dwPageSize", ctypes.c_ulong),
+        ("lpMinimumApplicationAddress", ctypes.c_void_p),
+        ("lpMaximumApplicationAddress", ctypes.c_void_p),
+        ("dwActiveProcessorMask", ctypes.c_size_t),
+        ("dwNumberOfProcessors", ctypes.c_ulong),
+        ("dwProcessorType", ctypes.c_ulong),
+        ("dwAllocationGranularity", ctypes.c_ulong),
+        ("wProcessorLevel", ctypes.c_ushort),
+        ("wProcessorRevision", ctypes.c_ushort)
+    ]
+
+# VirtualQueryEx region state and type values
+MEM_COMMIT = 0x1000
+_MEMORY_TYPES = {
+    0x20000: "Private",   # MEM_PRIVATE
+    0x40000: "Mapped",    # MEM_MAPPED
+    0x1000000: "Image",   # MEM_IMAGE
+}
+
+# Most iovec entries a single process_vm_readv call accepts on Linux
+IOV_MAX = 1024
+# array typecode matching the two size_t-wide fields of an iovec
+_IOVEC_TYPECODE = 'Q' if ctypes.sizeof(ctypes.c_size_t) == 8 else 'L'
+
+# Small Windows reads inside a session are served from cached whole pages
+PAGE_SIZE = 0x1000
+PAGE_CACHE_PAGES = 64
+
+# One /proc/[pid]/maps line: start-end, rwx permissions, then offset, device and
+# inode, then an optional path (which may contain spaces)
+_MAPS_LINE = re.compile(r'^([0-9a-f]+)-([0-9a-f]+) ([r-][w-][x-])\S* \S+ \S+ \S+ *(.*)$', re.MULTILINE)
+
+# rwx permission field -> MemoryProtection bits
+_MAPS_PROTECTION = {
+    ('r' if read else '-') + ('w' if write else '-') + ('x' if execute else '-'):
+        (read and MemoryProtection.PROT_READ) | (write and MemoryProtection.PROT_WRITE) |
+        (execute and MemoryProtection.PROT_EXEC)
+    for read in (False, True) for write in (False, True) for execute in (False, True)
+}
+
+# ptrace requests used to attach to and detach from Linux processes
+PTRACE_ATTACH = 16
+PTRACE_DETACH = 17
+
+# Threads that overlap independent reads in read_memory_batch
+READ_WORKERS = 8
+_read_executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="memory-read")
+
+# Seconds a process listing is reused, so UI refreshes don't rescan /proc each time
+PROCESS_LIST_TTL = 0.5
+
 class ProcessInfo:
     """Basic information about a process"""
+    __slots__ = ("pid", "name", "path")
+    
     def __init__(self, pid: int, name: str, path: Optional[str] = None):
         self.pid = pid
         self.name = name
@@ -52,6 +140,9 @@ class ProcessInfo:
 
 class MemoryRegion:
     """Represents a memory region in a process"""
+    # Region listings can hold tens of thousands of these, so skip the per-instance dict
+    __slots__ = ("base_address", "size", "protection", "type", "mapped_file")
+    
     def __init__(self, base_address: int, size: int, protection: int, 
                  type_str: str, mapped_file: Optional[str] = None):
         self.base_address = base_address
@@ -61,29 +152,148 @@ class MemoryRegion:
         self.mapped_file = mapped_file
     
     def __str__(self) -> str:
-        base_hex = hex(self.base_address)
-        return f"MemoryRegion(base={base_hex}, size={self.size}, protection={hex(self.protection)})"
+        return f"MemoryRegion(base={self.base_address:#x}, size={self.size}, protection={self.protection:#x})"
     
     @property
     def end_address(self) -> int:
         """Calculate the end address of this region"""
         return self.base_address + self.size
 
+class RegionIndex:
+    """Memory regions sorted by base address, for binary-search lookup of the region containing an address"""
+    __slots__ = ("_starts", "_regions")
+    
+    def __init__(self, regions: Iterable[MemoryRegion]):
+        self._regions = sorted(regions, key=lambda region: region.base_address)
+        self._starts = [region.base_address for region in self._regions]
+    
+    def position(self, address: int) -> Optional[int]:
+        """Return the position (in base-address order) of the region containing address, or None"""
+        i = bisect.bisect_right(self._starts, address) - 1
+        if i >= 0 and address < self._starts[i] + self._regions[i].size:
+            return i
+        return None
+    
+    def find(self, address: int) -> Optional[MemoryRegion]:
+        """Return the region containing address, or None if it falls between regions"""
+        i = self.position(address)
+        return self._regions[i] if i is not None else None
+    
+    def __len__(self) -> int:
+        return len(self._regions)
+    
+    def __iter__(self) -> Iterator[MemoryRegion]:
+        return iter(self._regions)
+
+class ConnectorSession:
+    """Memory access through a connector's existing attachment, held for the life of a session() block"""
+    def __init__(self, connector: 'RealProcessConnector'):
+        self.connector = connector
+    
+    def read(self, address: int, size: int) -> Optional[bytes]:
+        """Read memory from the attached process"""
+        return self.connector.read_memory(address, size)
+    
+    def read_batch(self, requests: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """Read several (address, size) ranges from the attached process"""
+        return self.connector.read_memory_batch(requests)
+    
+    def write(self, address: int, data: bytes) -> bool:
+        """Write memory to the attached process"""
+        return self.connector.write_memory(address, data)
+    
+    def write_batch(self, writes: List[Tuple[int, bytes]]) -> List[bool]:
+        """Write several (address, data) pairs to the attached process in order"""
+        return self.connector.write_memory_batch(writes)
+
+def _iter_psutil_processes(psutil: Any) -> Iterator[ProcessInfo]:
+    """Yield ProcessInfo for running processes, fetching only pid, name and exe"""
+    skipped = (psutil.NoSuchProcess, psutil.AccessDenied, KeyError)
+    # process_iter reads the requested attributes per process as it is iterated,
+    # so stopping early skips the /proc lookups for the rest
+    for proc in psutil.process_iter(['pid', 'name', 'exe']):
+        try:
+            info = proc.info
+            yield ProcessInfo(info['pid'], info['name'], info['exe'])
+        except skipped:
+            pass
+
+def _coalesce_writes(writes: List[Tuple[int, bytes]]) -> List[Tuple[int, bytes, List[int]]]:
+    """Merge runs of writes that each start where the previous one ended into (address, data, indices)"""
+    spans = []
+    for i, (address, data) in enumerate(writes):
+        if spans and address == spans[-1][1]:
+            span = spans[-1]
+            span[1] += len(data)
+            span[2].append(data)
+            span[3].append(i)
+        else:
+            spans.append([address, address + len(data), [data], [i]])
+    return [(address, b"".join(chunks), indices) for address, _, chunks, indices in spans]
+
 class RealProcessConnector:
     """Base class for platform-specific process connectors"""
+    # Whether read_memory may be called from several threads at once
+    parallel_reads = False
+    # Optional modules imported on first attribute access rather than at construction
+    lazy_modules: Tuple[str, ...] = ()
+    
     def __init__(self):
         self.system = platform.system()
         self.attached_pid = None
         self.process_handle = None
+        # Per-thread scratch buffers for reads, since parallel reads share the connector
+        self._read_buffers = threading.local()
+        self._process_cache = None  # (monotonic timestamp, processes) of the last full listing
+        self._region_index: Optional[Tuple[int, RegionIndex]] = None  # (pid, index) from get_region_index
+        # Set by each platform connector once it knows its lazy_modules are installed
+        self.has_modules = False
         
-        logger.info(f"Initializing process connector for {self.system}")
+        logger.info("Initializing process connector for %s", self.system)
+    
+    def __getattr__(self, name: str) -> Any:
+        """Import a module from lazy_modules on first use and keep it on the instance"""
+        if name in type(self).lazy_modules:
+            module = importlib.import_module(name)
+            setattr(self, name, module)
+            return module
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    def _find_lazy_modules(self) -> bool:
+        """Check that every lazy module is installed, without importing any of them"""
+        return all(importlib.util.find_spec(name) is not None for name in self.lazy_modules)
     
     def list_processes(self) -> List[ProcessInfo]:
         """List running processes on the system"""
-        raise NotImplementedError("Subclasses must implement this method")
+        return list(self.iter_processes())
+    
+    def iter_processes(self) -> Iterator[ProcessInfo]:
+        """Yield running processes one at a time, reusing a listing younger than PROCESS_LIST_TTL"""
+        now = time.monotonic()
+        if self._process_cache is not None and now - self._process_cache[0] < PROCESS_LIST_TTL:
+            yield from self._process_cache[1]
+            return
+        
+        processes = []
+        for proc in self._scan_processes():
+            processes.append(proc)
+            yield proc
+        # Only reached when the caller consumed the whole scan, so partial listings aren't reused
+        self._process_cache = (now, processes)
     
-    def attach_to_process(self, pid: int) -> bool:
-        """Attach to a running process by PID"""
+    def _scan_processes(self) -> Iterator[ProcessInfo]:
+        """Yield running processes as psutil reports them, if the connector has its modules"""
+        if not self.has_modules:
+            return
+        yield from _iter_psutil_processes(self.psutil)
+    
+    def attach_to_process(self, pid: int, readonly: bool = False) -> bool:
+        """
+        Attach to a running process by PID.
+        
+        With readonly set, platforms that can read memory without stopping
+        the target do so, and write_memory returns False until reattached.
+        """
         raise NotImplementedError("Subclasses must implement this method")
     
     def detach_from_process(self) -> bool:
@@ -94,14 +304,147 @@ class RealProcessConnector:
         """Read memory from the attached process"""
         raise NotImplementedError("Subclasses must implement this method")
     
+    def read_memory_batch(self, requests: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """
+        Read several (address, size) ranges from the attached process.
+        
+        Returns one entry per request, None where the read failed. Adjacent
+        or overlapping ranges are coalesced into a single read_memory call;
+        subclasses may override this with a platform batch read.
+        """
+        results: List[Optional[bytes]] = [None] * len(requests)
+        if not self._check_attached():
+            return results
+        
+        # Merge overlapping or touching ranges into spans of request indices
+        order = sorted(range(len(requests)), key=lambda i: requests[i][0])
+        spans = []
+        for i in order:
+            address, size = requests[i]
+            if spans and address <= spans[-1][1]:
+                span = spans[-1]
+                span[1] = max(span[1], address + size)
+                span[2].append(i)
+            else:
+                spans.append([address, address + size, [i]])
+        
+        def read_span(span: List[Any]) -> List[Tuple[int, Optional[bytes]]]:
+            start, end, indices = span
+            data = self.read_memory(start, end - start) if len(indices) > 1 else None
+            span_results = []
+            for i in indices:
+                address, size = requests[i]
+                if data is not None:
+                    span_results.append((i, data[address - start:address - start + size]))
+                else:
+                    # Single range, or the merged read failed: read it on its own
+                    span_results.append((i, self.read_memory(address, size)))
+            return span_results
+        
+        # The underlying read calls release the GIL, so independent spans overlap
+        # their system call latency when the platform read is thread-safe
+        if self.parallel_reads and len(spans) > 1:
+            span_results = _read_executor.map(read_span, spans)
+        else:
+            span_results = map(read_span, spans)
+        for span_result in span_results:
+            for i, data in span_result:
+                results[i] = data
+        
+        return results
+    
     def write_memory(self, address: int, data: bytes) -> bool:
         """Write memory to the attached process"""
         raise NotImplementedError("Subclasses must implement this method")
     
+    def write_memory_batch(self, writes: List[Tuple[int, bytes]]) -> List[bool]:
+        """
+        Write several (address, data) pairs to the attached process in order.
+        
+        Returns one success flag per write. Consecutive writes that continue
+        where the previous one ended go out as a single write_memory call;
+        subclasses may override this with a platform batch write.
+        """
+        results = [False] * len(writes)
+        if not self._check_attached():
+            return results
+        self._write_spans(_coalesce_writes(writes), results)
+        return results
+    
+    def _write_spans(self, spans: List[Tuple[int, bytes, List[int]]], results: List[bool]) -> None:
+        """Write each coalesced span with write_memory, recording the outcome for its writes"""
+        for address, data, indices in spans:
+            written = self.write_memory(address, data)
+            for i in indices:
+                results[i] = written
+    
     def get_memory_regions(self) -> List[MemoryRegion]:
         """Get memory regions of the attached process"""
         raise NotImplementedError("Subclasses must implement this method")
     
+    def iter_memory_regions(self) -> Iterator[MemoryRegion]:
+        """Yield memory regions of the attached process, streaming where the platform allows"""
+        yield from self.get_memory_regions()
+    
+    def find_region(self, address: int) -> Optional[MemoryRegion]:
+        """
+        Find the memory region of the attached process containing an address.
+        
+        The regions are listed once and indexed; the index is kept until
+        detach or invalidate_regions, so call that after the target may
+        have mapped or unmapped memory.
+        """
+        if not self._check_attached():
+            return None
+        return self.get_region_index().find(address)
+    
+    def get_region_index(self) -> RegionIndex:
+        """
+        Return the region index of the attached process, listing the regions
+        only when no index is cached for it yet.
+        """
+        if self.attached_pid is None:
+            return RegionIndex(())
+        if self._region_index is None or self._region_index[0] != self.attached_pid:
+            self._region_index = (self.attached_pid, RegionIndex(self.iter_memory_regions()))
+        return self._region_index[1]
+    
+    def invalidate_regions(self) -> None:
+        """Drop the cached region index"""
+        self._region_index = None
+    
+    @contextmanager
+    def session(self, pid: Optional[int] = None) -> Iterator[ConnectorSession]:
+        """
+        Attach once for a series of reads and writes.
+        
+        With a pid this attaches if needed and detaches again on exit;
+        without one it reuses the current attachment. Raises RuntimeError
+        if no process can be used.
+        """
+        attached_here = False
+        if pid is not None and self.attached_pid != pid:
+            if self.attached_pid is not None:
+                raise RuntimeError(f"Already attached to process {self.attached_pid}")
+            if not self.attach_to_process(pid):
+                raise RuntimeError(f"Could not attach to process {pid}")
+            attached_here = True
+        elif not self._check_attached():
+            raise RuntimeError("Not attached to any process")
+        
+        try:
+            yield ConnectorSession(self)
+        finally:
+            if attached_here:
+                self.detach_from_process()
+    
+    def _read_buffer(self, size: int) -> ctypes.Array:
+        """This thread's read buffer, grown to at least size bytes and reused across reads"""
+        buffer = getattr(self._read_buffers, "buffer", None)
+        if buffer is None or len(buffer) < size:
+            buffer = self._read_buffers.buffer = ctypes.create_string_buffer(size)
+        return buffer
+    
     def _check_attached(self) -> bool:
         """Check if we're attached to a process"""
         if self.attached_pid is None or self.process_handle is None:
@@ -111,49 +454,50 @@ class RealProcessConnector:
 
 class WindowsProcessConnector(RealProcessConnector):
     """Windows-specific implementation using Win32 API"""
+    # ReadProcessMemory on one handle is safe to call concurrently
+    parallel_reads = True
+    lazy_modules = ("win32process", "win32api", "win32con", "win32security", "psutil")
+    
     def __init__(self):
         super().__init__()
         if self.system != "Windows":
             raise RuntimeError("WindowsProcessConnector can only be used on Windows")
         
-        # Import Windows-specific modules
-        try:
-            import win32process
-            import win32api
-            import win32con
-            import win32security
-            import psutil
-            self.win32process = win32process
-            self.win32api = win32api
-            self.win32con = win32con
-            self.win32security = win32security
-            self.psutil = psutil
-            self.has_modules = True
-        except ImportError:
-            logger.warning("Windows modules not available. Limited functionality.")
-            self.has_modules = False
-    
-    def list_processes(self) -> List[ProcessInfo]:
-        """List running processes on Windows"""
+        # Windows-specific modules load on first use, so each pywin32 DLL is only mapped when needed
+        self.has_modules = self._find_lazy_modules()
         if not self.has_modules:
-            return []
+            logger.warning("Windows modules not available. Limited functionality.")
         
-        processes = []
-        for proc in self.psutil.process_iter(['pid', 'name', 'exe']):
-            try:
-                process_info = ProcessInfo(
-                    pid=proc.info['pid'],
-                    name=proc.info['name'],
-                    path=proc.info['exe']
-                )
-                processes.append(process_info)
-            except (self.psutil.NoSuchProcess, self.psutil.AccessDenied, KeyError):
-                pass
+        # A private kernel32 instance, so the prototypes declared here
+        # don't change ctypes.windll.kernel32 for the rest of the process
+        self.kernel32 = ctypes.WinDLL("kernel32")
+        handle, pointer, size = ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t
+        self.kernel32.ReadProcessMemory.argtypes = [handle, pointer, pointer, size, ctypes.POINTER(size)]
+        self.kernel32.ReadProcessMemory.restype = ctypes.c_int
+        self.kernel32.WriteProcessMemory.argtypes = [handle, pointer, pointer, size, ctypes.POINTER(size)]
+        self.kernel32.WriteProcessMemory.restype = ctypes.c_int
+        self.kernel32.VirtualQueryEx.argtypes = [handle, pointer, ctypes.POINTER(_MemoryBasicInformation), size]
+        self.kernel32.VirtualQueryEx.restype = size
+        self.kernel32.CloseHandle.argtypes = [handle]
+        self.kernel32.CloseHandle.restype = ctypes.c_int
+        self.kernel32.GetLastError.argtypes = []
+        self.kernel32.GetLastError.restype = ctypes.c_ulong
+        self.kernel32.GetSystemInfo.argtypes = [ctypes.POINTER(_SystemInfo)]
+        self.kernel32.GetSystemInfo.restype = None
         
-        return processes
+        # User mappings only live in this range, so region walks start and stop at its ends
+        system_info = _SystemInfo()
+        self.kernel32.GetSystemInfo(ctypes.byref(system_info))
+        self._min_address = system_info.lpMinimumApplicationAddress or 0
+        self._max_address = system_info.lpMaximumApplicationAddress or 0
+        
+        # Page address -> PAGE_SIZE bytes, in LRU order; only set while a session
+        # is open, since the target keeps running and pages go stale between sessions
+        self._page_cache: Optional[collections.OrderedDict] = None
+        self._page_cache_lock = threading.Lock()
     
-    def attach_to_process(self, pid: int) -> bool:
-        """Attach to a running process on Windows"""
+    def attach_to_process(self, pid: int, readonly: bool = False) -> bool:
+        """Attach to a running process on Windows, with read access only if readonly"""
         if not self.has_modules:
             logger.error("Windows modules not available")
             return False
@@ -163,19 +507,21 @@ class WindowsProcessConnector(RealProcessConnector):
             access_rights = (ProcessAccess.PROCESS_VM_READ | 
                             ProcessAccess.PROCESS_VM_WRITE | 
                             ProcessAccess.PROCESS_VM_OPERATION)
+            if readonly:
+                access_rights = ProcessAccess.PROCESS_VM_READ
             
             process_handle = self.win32api.OpenProcess(access_rights, False, pid)
             if not process_handle:
-                logger.error(f"Failed to open process {pid}")
+                logger.error("Failed to open process %s", pid)
                 return False
             
             self.process_handle = process_handle
             self.attached_pid = pid
-            logger.info(f"Successfully attached to process {pid}")
+            logger.info("Successfully attached to process %s", pid)
             return True
         
         except Exception as e:
-            logger.error(f"Error attaching to process: {e}")
+            logger.error("Error attaching to process: %s", e)
             return False
     
     def detach_from_process(self) -> bool:
@@ -183,27 +529,79 @@ class WindowsProcessConnector(RealProcessConnector):
         if not self._check_attached():
             return False
         
+        if self._page_cache is not None:
+            self._page_cache.clear()
+        
         try:
             if self.process_handle is not None:
                 self.win32api.CloseHandle(self.process_handle)
             self.process_handle = None
             self.attached_pid = None
+            self.invalidate_regions()
             logger.info("Successfully detached from process")
             return True
         
         except Exception as e:
-            logger.error(f"Error detaching from process: {e}")
+            logger.error("Error detaching from process: %s", e)
             return False
     
+    @contextmanager
+    def session(self, pid: Optional[int] = None) -> Iterator[ConnectorSession]:
+        """Attach once for a series of reads and writes, caching pages that small reads touch"""
+        with super().session(pid) as session:
+            if self._page_cache is not None:
+                # Nested session: the outer one owns the cache
+                yield session
+                return
+            self._page_cache = collections.OrderedDict()
+            try:
+                yield session
+            finally:
+                self._page_cache = None
+    
     def read_memory(self, address: int, size: int) -> Optional[bytes]:
         """Read memory from the attached process on Windows"""
         if not self._check_attached():
             return None
         
+        page_cache = self._page_cache
+        if page_cache is not None and 0 < size <= PAGE_SIZE:
+            page = address & ~(PAGE_SIZE - 1)
+            offset = address - page
+            if offset + size <= PAGE_SIZE:
+                # Within one page: one ReadProcessMemory serves every read of it
+                with self._page_cache_lock:
+                    data = page_cache.get(page)
+                    if data is not None:
+                        page_cache.move_to_end(page)
+                if data is None:
+                    # Protection is per page, so if the page is unreadable so is the range
+                    data = self._read_process_memory(page, PAGE_SIZE)
+                    if data is None:
+                        return None
+                    with self._page_cache_lock:
+                        page_cache[page] = data
+                        if len(page_cache) > PAGE_CACHE_PAGES:
+                            page_cache.popitem(last=False)
+                return data[offset:offset + size]
+        
+        return self._read_process_memory(address, size)
+    
+    def _invalidate_pages(self, address: int, size: int) -> None:
+        """Drop cached pages overlapping [address, address + size)"""
+        page_cache = self._page_cache
+        if not page_cache:
+            return
+        with self._page_cache_lock:
+            for page in range(address & ~(PAGE_SIZE - 1), address + size, PAGE_SIZE):
+                page_cache.pop(page, None)
+    
+    def _read_process_memory(self, address: int, size: int) -> Optional[bytes]:
+        """Read memory with one ReadProcessMemory call"""
         try:
             # Use kernel32.dll for memory reading
-            kernel32 = ctypes.windll.kernel32
-            buffer = ctypes.create_string_buffer(size)
+            kernel32 = self.kernel32
+            buffer = self._read_buffer(size)
             bytes_read = ctypes.c_size_t(0)
             
             result = kernel32.ReadProcessMemory(
@@ -216,13 +614,14 @@ class WindowsProcessConnector(RealProcessConnector):
             
             if result == 0:
                 error_code = kernel32.GetLastError()
-                logger.error(f"Failed to read memory at {hex(address)}, error code: {error_code}")
+                logger.error("Failed to read memory at %#x, error code: %s", address, error_code)
                 return None
             
-            return buffer.raw
+            # Copy out just the bytes read; the buffer may be larger and is reused
+            return ctypes.string_at(buffer, bytes_read.value)
         
         except Exception as e:
-            logger.error(f"Error reading memory: {e}")
+            logger.error("Error reading memory: %s", e)
             return None
     
     def write_memory(self, address: int, data: bytes) -> bool:
@@ -231,149 +630,154 @@ class WindowsProcessConnector(RealProcessConnector):
             return False
         
         try:
-            # Use kernel32.dll for memory writing
-            kernel32 = ctypes.windll.kernel32
+            # Use kernel32.dll for memory writing, straight from the bytes object's buffer
+            kernel32 = self.kernel32
             size = len(data)
-            buffer = ctypes.create_string_buffer(data)
             bytes_written = ctypes.c_size_t(0)
             
             result = kernel32.WriteProcessMemory(
                 int(self.process_handle) if self.process_handle is not None else 0, 
                 ctypes.c_void_p(address), 
-                buffer, 
+                data, 
                 size, 
                 ctypes.byref(bytes_written)
             )
             
             if result == 0:
                 error_code = kernel32.GetLastError()
-                logger.error(f"Failed to write memory at {hex(address)}, error code: {error_code}")
+                logger.error("Failed to write memory at %#x, error code: %s", address, error_code)
                 return False
             
+            self._invalidate_pages(address, size)
             return True
         
         except Exception as e:
-            logger.error(f"Error writing memory: {e}")
+            logger.error("Error writing memory: %s", e)
             return False
     
     def get_memory_regions(self) -> List[MemoryRegion]:
         """Get memory regions of the attached process on Windows"""
+        return list(self.iter_memory_regions())
+    
+    def iter_memory_regions(self) -> Iterator[MemoryRegion]:
+        """Yield committed memory regions of the attached process on Windows as VirtualQueryEx walks them"""
         if not self._check_attached():
-            return []
+            return
         
-        memory_regions = []
+        # Bind everything the loop touches once; only the query itself runs per region
+        virtual_query = self.kernel32.VirtualQueryEx
+        handle = int(self.process_handle) if self.process_handle is not None else 0
+        mbi = _MemoryBasicInformation()
+        mbi_ref = ctypes.byref(mbi)
+        mbi_size = ctypes.sizeof(mbi)
+        address = self._min_address
+        max_address = self._max_address
         
-        try:
-            # Use VirtualQueryEx to enumerate memory regions
-            kernel32 = ctypes.windll.kernel32
+        # Each query covers a whole region, committed or free, so holes cost one call
+        while address < max_address:
+            try:
+                result = virtual_query(handle, address, mbi_ref, mbi_size)
+            except Exception as e:
+                logger.error("Error getting memory regions: %s", e)
+                return
             
-            class MEMORY_BASIC_INFORMATION(ctypes.Structure):
-                _fields_ = [
-                    ("BaseAddress", ctypes.c_void_p),
-                    ("AllocationBase", ctypes.c_void_p),
-                    ("AllocationProtect", ctypes.c_ulong),
-                    ("RegionSize", ctypes.c_size_t),
-                    ("State", ctypes.c_ulong),
-                    ("Protect", ctypes.c_ulong),
-                    ("Type", ctypes.c_ulong)
-                ]
+            if result == 0:
+                return
             
-            mbi = MEMORY_BASIC_INFORMATION()
-            address = 0
+            base_address = mbi.BaseAddress or 0
+            region_size = mbi.RegionSize
             
-            while True:
-                result = kernel32.VirtualQueryEx(
-                    int(self.process_handle) if self.process_handle is not None else 0,
-                    ctypes.c_void_p(address),
-                    ctypes.byref(mbi),
-                    ctypes.sizeof(mbi)
-                )
-                
-                if result == 0:
-                    break
-                
-                # Determine memory type
-                if mbi.State != 0x1000:  # MEM_COMMIT
-                    address = address + mbi.RegionSize
-                    continue
-                
-                memory_type = "Unknown"
-                if mbi.Type == 0x20000:  # MEM_PRIVATE
-                    memory_type = "Private"
-                elif mbi.Type == 0x40000:  # MEM_MAPPED
-                    memory_type = "Mapped"
-                elif mbi.Type == 0x1000000:  # MEM_IMAGE
-                    memory_type = "Image"
-                
-                # Create memory region object
-                region = MemoryRegion(
-                    base_address=int(mbi.BaseAddress),
-                    size=mbi.RegionSize,
+            if mbi.State == MEM_COMMIT:
+                yield MemoryRegion(
+                    base_address=base_address,
+                    size=region_size,
                     protection=mbi.Protect,
-                    type_str=memory_type
+                    type_str=_MEMORY_TYPES.get(mbi.Type, "Unknown")
                 )
-                
-                memory_regions.append(region)
-                
-                # Move to next region
-                address = int(mbi.BaseAddress) + mbi.RegionSize
             
-            return memory_regions
-        
-        except Exception as e:
-            logger.error(f"Error getting memory regions: {e}")
-            return []
+            # Move to next region
+            address = base_address + region_size
 
 class LinuxProcessConnector(RealProcessConnector):
     """Linux-specific implementation using ptrace and /proc"""
+    # pread on the shared /proc/[pid]/mem descriptor has no file position to race on
+    parallel_reads = True
+    lazy_modules = ("psutil",)
+    
     def __init__(self):
         super().__init__()
         if self.system != "Linux":
             raise RuntimeError("LinuxProcessConnector can only be used on Linux")
         
-        # Import Linux-specific modules
-        try:
-            import psutil
-            self.psutil = psutil
-            self.has_modules = True
-        except ImportError:
-            logger.warning("Linux modules not available. Limited functionality.")
-            self.has_modules = False
-    
-    def list_processes(self) -> List[ProcessInfo]:
-        """List running processes on Linux"""
+        # psutil loads on first use
+        self.has_modules = self._find_lazy_modules()
         if not self.has_modules:
-            return []
+            logger.warning("Linux modules not available. Limited functionality.")
         
-        processes = []
-        for proc in self.psutil.process_iter(['pid', 'name', 'exe']):
+        # /proc/[pid]/mem of the attached process, opened once for pread/pwrite
+        self._mem_fd: Optional[int] = None
+        self._mem_fd_writable = False
+        # A readonly attach never stops the target with ptrace and refuses writes
+        self._ptrace_attached = False
+        self._readonly = False
+        
+        # libc is loaded once, with prototypes declared so calls skip argument inference
+        try:
+            self.libc = ctypes.CDLL("libc.so.6", use_errno=True)
+            self.libc.ptrace.restype = ctypes.c_long
+            self.libc.ptrace.argtypes = [ctypes.c_long, ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p]
+        except OSError:
+            self.libc = None
+        
+        # process_vm_readv/writev (Linux 3.2+) move many ranges in one system call
+        self.has_process_vm_readv = False
+        if self.libc is not None:
             try:
-                process_info = ProcessInfo(
-                    pid=proc.info['pid'],
-                    name=proc.info['name'],
-                    path=proc.info['exe']
-                )
-                processes.append(process_info)
-            except (self.psutil.NoSuchProcess, self.psutil.AccessDenied, KeyError):
+                for function in (self.libc.process_vm_readv, self.libc.process_vm_writev):
+                    function.restype = ctypes.c_ssize_t
+                    function.argtypes = [
+                        ctypes.c_int, ctypes.POINTER(_IOVec), ctypes.c_ulong,
+                        ctypes.POINTER(_IOVec), ctypes.c_ulong, ctypes.c_ulong
+                    ]
+                self.has_process_vm_readv = True
+            except AttributeError:
                 pass
-        
-        return processes
     
-    def attach_to_process(self, pid: int) -> bool:
-        """Attach to a running process on Linux using ptrace"""
+    def attach_to_process(self, pid: int, readonly: bool = False) -> bool:
+        """
+        Attach to a running process on Linux using ptrace.
+        
+        With readonly the target is not stopped: only /proc/[pid]/mem is opened,
+        which ptrace_scope or CAP_SYS_PTRACE must allow, and writes are refused.
+        """
         try:
             # Check if process exists
             if not os.path.exists(f"/proc/{pid}"):
-                logger.error(f"Process {pid} does not exist")
+                logger.error("Process %s does not exist", pid)
                 return False
             
-            # Use ptrace to attach
-            libc = ctypes.CDLL("libc.so.6")
-            PTRACE_ATTACH = 16
+            if readonly:
+                self.process_handle = pid
+                self.attached_pid = pid
+                self._readonly = True
+                self._open_mem(writable=False)
+                if self._mem_fd is None:
+                    # Opening failed with the same permission check reads would hit
+                    self.process_handle = None
+                    self.attached_pid = None
+                    self._readonly = False
+                    return False
+                logger.info("Attached to process %s for reading", pid)
+                return True
             
-            result = libc.ptrace(PTRACE_ATTACH, pid, 0, 0)
+            if self.libc is None:
+                logger.error("libc not available, cannot attach to process %s", pid)
+                return False
+            
+            # Use ptrace to attach
+            result = self.libc.ptrace(PTRACE_ATTACH, pid, None, None)
             if result == -1:
-                logger.error(f"Failed to attach to process {pid}")
+                logger.error("Failed to attach to process %s", pid)
                 return False
             
             # Wait for the process to stop
@@ -381,11 +785,14 @@ class LinuxProcessConnector(RealProcessConnector):
             
             self.process_handle = pid  # On Linux, we just use the PID
             self.attached_pid = pid
-            logger.info(f"Successfully attached to process {pid}")
+            self._ptrace_attached = True
+            self._readonly = False
+            self._open_mem()
+            logger.info("Successfully attached to process %s", pid)
             return True
             
         except Exception as e:
-            logger.error(f"Error attaching to process: {e}")
+            logger.error("Error attaching to process: %s", e)
             return False
     
     def detach_from_process(self) -> bool:
@@ -394,22 +801,25 @@ class LinuxProcessConnector(RealProcessConnector):
             return False
         
         try:
-            # Use ptrace to detach
-            libc = ctypes.CDLL("libc.so.6")
-            PTRACE_DETACH = 17
+            # Use ptrace to detach, if the attach stopped the process
+            self._close_mem()
             
-            result = libc.ptrace(PTRACE_DETACH, self.attached_pid, 0, 0)
-            if result == -1:
-                logger.error(f"Failed to detach from process {self.attached_pid}")
-                return False
+            if self._ptrace_attached:
+                result = self.libc.ptrace(PTRACE_DETACH, self.attached_pid, None, None)
+                if result == -1:
+                    logger.error("Failed to detach from process %s", self.attached_pid)
+                    return False
             
+            self._ptrace_attached = False
+            self._readonly = False
             self.process_handle = None
             self.attached_pid = None
+            self.invalidate_regions()
             logger.info("Successfully detached from process")
             return True
             
         except Exception as e:
-            logger.error(f"Error detaching from process: {e}")
+            logger.error("Error detaching from process: %s", e)
             return False
     
     def read_memory(self, address: int, size: int) -> Optional[bytes]:
@@ -418,6 +828,22 @@ class LinuxProcessConnector(RealProcessConnector):
             return None
         
         try:
+            if self._mem_fd is not None:
+                # Positioned read on the descriptor opened at attach time;
+                # cheaper from Python than a ctypes process_vm_readv call
+                return os.pread(self._mem_fd, size, address)
+            
+            if self.has_process_vm_readv:
+                # One system call instead of open/seek/read/close
+                transferred, chunks = self._process_vm_readv([(address, size)])
+                if transferred >= 0:
+                    return chunks[0][:transferred]
+                error = ctypes.get_errno()
+                if error not in (errno.ENOSYS, errno.EPERM):
+                    logger.error("Failed to read memory at %#x: %s", address, os.strerror(error))
+                    return None
+                # Unsupported or not permitted: read through /proc/[pid]/mem
+            
             # Read from /proc/[pid]/mem
             with open(f"/proc/{self.attached_pid}/mem", "rb") as mem_file:
                 mem_file.seek(address)
@@ -425,15 +851,120 @@ class LinuxProcessConnector(RealProcessConnector):
                 return data
                 
         except Exception as e:
-            logger.error(f"Error reading memory: {e}")
+            logger.error("Error reading memory: %s", e)
             return None
     
-    def write_memory(self, address: int, data: bytes) -> bool:
-        """Write memory to the attached process on Linux"""
+    def _refuse_readonly_write(self) -> bool:
+        """Log and return True if the process was attached readonly"""
+        if self._readonly:
+            logger.error("Process %s is attached read-only; writes are disabled", self.attached_pid)
+        return self._readonly
+    
+    def _open_mem(self, writable: bool = True) -> None:
+        """Open /proc/[pid]/mem of the attached process for repeated reads and, if writable, writes"""
+        self._close_mem()
+        path = f"/proc/{self.attached_pid}/mem"
+        if writable:
+            try:
+                self._mem_fd = os.open(path, os.O_RDWR)
+                self._mem_fd_writable = True
+                return
+            except OSError:
+                # Read-only access still serves reads; writes take the slower paths
+                pass
+        try:
+            self._mem_fd = os.open(path, os.O_RDONLY)
+        except OSError as e:
+            logger.warning("Could not open memory of process %s: %s", self.attached_pid, e)
+            self._mem_fd = None
+    
+    def _close_mem(self) -> None:
+        """Close the descriptor opened by _open_mem, if any"""
+        if self._mem_fd is not None:
+            os.close(self._mem_fd)
+            self._mem_fd = None
+        self._mem_fd_writable = False
+    
+    def read_memory_batch(self, requests: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """Read several ranges on Linux with process_vm_readv, falling back to coalesced reads"""
+        results: List[Optional[bytes]] = [None] * len(requests)
         if not self._check_attached():
+            return results
+        
+        index = 0
+        use_readv = self.has_process_vm_readv
+        while index < len(requests) and use_readv:
+            batch = requests[index:index + IOV_MAX]
+            transferred, chunks = self._process_vm_readv(batch)
+            if transferred < 0:
+                if ctypes.get_errno() in (errno.ENOSYS, errno.EPERM):
+                    # Unsupported or not permitted: use the per-read path
+                    use_readv = False
+                else:
+                    # The first range is unreadable; it stays None
+                    index += 1
+                continue
+            
+            # Transfers stop at the first unreadable range, never inside one
+            end = index + len(batch)
+            for (address, size), data in zip(batch, chunks):
+                if transferred < size:
+                    break
+                results[index] = data
+                transferred -= size
+                index += 1
+            if index < end:
+                # Skip the range that stopped the transfer
+                index += 1
+        
+        if index < len(requests):
+            results[index:] = super().read_memory_batch(requests[index:])
+        return results
+    
+    def _process_vm_readv(self, requests: List[Tuple[int, int]]) -> Tuple[int, List[bytes]]:
+        """Issue one process_vm_readv for the ranges; returns (bytes transferred, per-range data)"""
+        count = len(requests)
+        # One bounce buffer for every range, each local iovec pointing into it
+        offsets = list(itertools.accumulate((size for _, size in requests), initial=0))
+        buffer = self._read_buffer(offsets[-1])
+        start = ctypes.addressof(buffer)
+        local_iov = (_IOVec * count)(*[
+            (start + offset, size) for offset, (_, size) in zip(offsets, requests)
+        ])
+        remote_iov = (_IOVec * count)(*requests)
+        transferred = self.libc.process_vm_readv(self.attached_pid, local_iov, count,
+                                                 remote_iov, count, 0)
+        data = ctypes.string_at(buffer, offsets[-1])
+        return transferred, [data[offset:offset + size] for offset, (_, size) in zip(offsets, requests)]
+    
+    def _process_vm_writev(self, writes: List[Tuple[int, bytes]]) -> int:
+        """Issue one process_vm_writev of the (address, data) pairs; returns bytes transferred or -1"""
+        count = len(writes)
+        # All data goes out of one local iovec; a lone write points at the bytes
+        # object's own buffer, so nothing is copied
+        data = writes[0][1] if count == 1 else b"".join([chunk for _, chunk in writes])
+        local_iov = _IOVec(ctypes.cast(data, ctypes.c_void_p), len(data))
+        # Packing the remote iovecs through an array avoids a ctypes object per write
+        fields = array.array(_IOVEC_TYPECODE, [field for address, chunk in writes for field in (address, len(chunk))])
+        remote_iov = (_IOVec * count).from_buffer(fields)
+        return self.libc.process_vm_writev(self.attached_pid, ctypes.byref(local_iov), 1,
+                                           remote_iov, count, 0)
+    
+    def write_memory(self, address: int, data: bytes) -> bool:
+        """Write memory to the attached process on Linux; always False after a readonly attach"""
+        if not self._check_attached() or self._refuse_readonly_write():
             return False
         
         try:
+            if self._mem_fd_writable:
+                # Positioned write on the descriptor opened at attach time
+                return os.pwrite(self._mem_fd, data, address) == len(data)
+            
+            if self.has_process_vm_readv and self._process_vm_writev([(address, data)]) == len(data):
+                return True
+            # process_vm_writev cannot write read-only pages such as code,
+            # which /proc/[pid]/mem can, so any failure falls through
+            
             # Write to /proc/[pid]/mem
             with open(f"/proc/{self.attached_pid}/mem", "wb") as mem_file:
                 mem_file.seek(address)
@@ -441,98 +972,87 @@ class LinuxProcessConnector(RealProcessConnector):
                 return True
                 
         except Exception as e:
-            logger.error(f"Error writing memory: {e}")
+            logger.error("Error writing memory: %s", e)
             return False
     
+    def write_memory_batch(self, writes: List[Tuple[int, bytes]]) -> List[bool]:
+        """Write several ranges on Linux with process_vm_writev, falling back to per-span writes"""
+        results = [False] * len(writes)
+        if not self._check_attached() or self._refuse_readonly_write():
+            return results
+        
+        spans = _coalesce_writes(writes)
+        index = 0
+        while index < len(spans) and self.has_process_vm_readv:
+            batch = spans[index:index + IOV_MAX]
+            transferred = self._process_vm_writev([(address, data) for address, data, _ in batch])
+            # Transfers stop at the first range that can't be written, never inside one
+            for address, data, indices in batch:
+                if transferred < len(data):
+                    break
+                for i in indices:
+                    results[i] = True
+                transferred -= len(data)
+                index += 1
+            else:
+                continue
+            # Read-only pages such as code refuse process_vm_writev but not
+            # /proc/[pid]/mem, so the rest is written span by span
+            break
+        
+        self._write_spans(spans[index:], results)
+        return results
+    
     def get_memory_regions(self) -> List[MemoryRegion]:
         """Get memory regions of the attached process on Linux"""
+        return list(self.iter_memory_regions())
+    
+    def iter_memory_regions(self) -> Iterator[MemoryRegion]:
+        """Yield memory regions of the attached process on Linux from /proc/[pid]/maps"""
         if not self._check_attached():
-            return []
-        
-        memory_regions = []
+            return
         
         try:
-            # Parse /proc/[pid]/maps
-            with open(f"/proc/{self.attached_pid}/maps", "r") as maps_file:
-                for line in maps_file:
-                    parts = line.strip().split()
-                    if len(parts) < 5:
-                        continue
-                    
-                    # Parse address range
-                    addr_range = parts[0].split("-")
-                    start_addr = int(addr_range[0], 16)
-                    end_addr = int(addr_range[1], 16)
-                    size = end_addr - start_addr
-                    
-                    # Parse permissions
-                    perms = parts[1]
-                    protection = 0
-                    if 'r' in perms:
-                        protection |= MemoryProtection.PROT_READ
-                    if 'w' in perms:
-                        protection |= MemoryProtection.PROT_WRITE
-                    if 'x' in perms:
-                        protection |= MemoryProtection.PROT_EXEC
-                    
-                    # Determine memory type and mapped file
-                    mapped_file = parts[5] if len(parts) >= 6 else None
-                    memory_type = "Mapped" if mapped_file else "Private"
-                    
-                    # Create memory region object
-                    region = MemoryRegion(
-                        base_address=start_addr,
-                        size=size,
-                        protection=protection,
-                        type_str=memory_type,
-                        mapped_file=mapped_file
-                    )
-                    
-                    memory_regions.append(region)
-            
-            return memory_regions
-                
+            # Read /proc/[pid]/maps whole and parse it with one regex scan; fsdecode is a
+            # single pass that keeps non-UTF-8 paths (as surrogate escapes) instead of failing
+            with open(f"/proc/{self.attached_pid}/maps", "rb") as maps_file:
+                maps = os.fsdecode(maps_file.read())
         except Exception as e:
-            logger.error(f"Error getting memory regions: {e}")
-            return []
+            logger.error("Error getting memory regions: %s", e)
+            return
+        
+        for start, end, perms, path in _MAPS_LINE.findall(maps):
+            start_addr = int(start, 16)
+            
+            # Determine memory type and mapped file
+            mapped_file = path or None
+            memory_type = "Mapped" if mapped_file else "Private"
+            
+            # Create memory region object
+            yield MemoryRegion(
+                base_address=start_addr,
+                size=int(end, 16) - start_addr,
+                protection=_MAPS_PROTECTION[perms],
+                type_str=memory_type,
+                mapped_file=mapped_file
+            )
 
 class MacOSProcessConnector(RealProcessConnector):
     """macOS-specific implementation using mach APIs"""
+    lazy_modules = ("psutil",)
+    
     def __init__(self):
         super().__init__()
         if self.system != "Darwin":
             raise RuntimeError("MacOSProcessConnector can only be used on macOS")
         
-        # Import macOS-specific modules
-        try:
-            import psutil
-            self.psutil = psutil
-            self.has_modules = True
-        except ImportError:
-            logger.warning("macOS modules not available. Limited functionality.")
-            self.has_modules = False
-    
-    def list_processes(self) -> List[ProcessInfo]:
-        """List running processes on macOS"""
+        # psutil loads on first use
+        self.has_modules = self._find_lazy_modules()
         if not self.has_modules:
-            return []
-        
-        processes = []
-        for proc in self.psutil.process_iter(['pid', 'name', 'exe']):
-            try:
-                process_info = ProcessInfo(
-                    pid=proc.info['pid'],
-                    name=proc.info['name'],
-                    path=proc.info['exe']
-                )
-                processes.append(process_info)
-            except (self.psutil.NoSuchProcess, self.psutil.AccessDenied, KeyError):
-                pass
-        
-        return processes
+            logger.warning("macOS modules not available. Limited functionality.")
     
-    def attach_to_process(self, pid: int) -> bool:
-        """Attach to a running process on macOS"""
+    def attach_to_process(self, pid: int, readonly: bool = False) -> bool:
+        """Attach to a running process on macOS; readonly makes no difference here"""
         logger.warning("Process attachment on macOS requires higher privileges")
         logger.warning("This functionality may be limited due to System Integrity Protection")
         
@@ -545,21 +1065,21 @@ class MacOSProcessConnector(RealProcessConnector):
                 proc = self.psutil.Process(pid)
                 proc_info = proc.as_dict(attrs=['pid', 'name'])
                 if not proc_info:
-                    logger.error(f"Process {pid} does not exist")
+                    logger.error("Process %s does not exist", pid)
                     return False
             except self.psutil.NoSuchProcess:
-                logger.error(f"Process {pid} does not exist")
+                logger.error("Process %s does not exist", pid)
                 return False
             
             # Store process information
             self.process_handle = pid  # On macOS, we just use the PID
             self.attached_pid = pid
-            logger.info(f"Successfully attached to process {pid}")
+            logger.info("Successfully attached to process %s", pid)
             logger.warning("Note: Memory access may be limited due to macOS security")
             return True
             
         except Exception as e:
-            logger.error(f"Error attaching to process: {e}")
+            logger.error("Error attaching to process: %s", e)
             return False
     
     def detach_from_process(self) -> bool:
@@ -570,6 +1090,7 @@ class MacOSProcessConnector(RealProcessConnector):
         # Nothing special to do on macOS
         self.process_handle = None
         self.attached_pid = None
+        self.invalidate_regions()
         logger.info("Successfully detached from process")
         return True
     
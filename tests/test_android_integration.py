@@ -4,6 +4,8 @@ These tests verify that the Android integration works as expected.
 """
 import os
 import platform
+import shutil
+import subprocess
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -23,18 +25,62 @@ class TestAndroidIntegration(unittest.TestCase):
         """Set up test environment"""
         self.android_connector = AndroidProcessConnector()
     
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_is_android_connected(self, mock_run):
+    def test_is_android_connected(self, mock_run, mock_popen):
         """Test detecting connected Android devices"""
         # Mock subprocess.run to return a successful result
         mock_process = MagicMock()
         mock_process.stdout = "List of devices attached\ndevice123\tdevice\n"
         mock_run.return_value = mock_process
+        mock_popen.return_value.poll.return_value = None
         
         # Test the connection detection
         result = self.android_connector.is_android_connected()
         self.assertTrue(result)
         self.assertEqual(self.android_connector.device_id, "device123")
+        self.assertEqual(mock_popen.call_args.args[0], ["adb", "-s", "device123", "shell"])
+        
+        # While the persistent shell is alive, no further adb is spawned
+        self.assertTrue(self.android_connector.is_android_connected())
+        self.assertEqual(mock_run.call_count, 1)
+    
+    @unittest.skipIf(shutil.which('sh') is None, "sh not available")
+    def test_persistent_shell(self):
+        """Test command round trips through a persistent shell, with a local sh standing in for adb"""
+        self.android_connector._start_shell(subprocess.Popen(
+            ["sh"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, bufsize=1))
+        self.addCleanup(self.android_connector._close_shell)
+        
+        self.assertEqual(self.android_connector._shell("echo one; echo two"), "one\ntwo\n")
+        self.assertEqual(self.android_connector._shell("printf partial"), "partial")
+        self.assertEqual(self.android_connector._shell("false", check=False), "")
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.android_connector._shell("exit_code() { return 3; }; exit_code")
+        
+        # Stopping a streamed command early leaves the shell ready for the next one
+        lines = self.android_connector._shell_lines("echo a; echo b; echo c")
+        self.assertEqual(next(lines), "a\n")
+        lines.close()
+        self.assertEqual(self.android_connector._shell("echo next"), "next\n")
+        self.assertIsNotNone(self.android_connector._shell_process)
+    
+    @unittest.skipIf(shutil.which('sh') is None, "sh not available")
+    @patch('android_process_connector.SHELL_READ_TIMEOUT', 0.2)
+    @patch('subprocess.run')
+    def test_persistent_shell_timeout(self, mock_run):
+        """Test that a silent persistent shell is killed and the command retried through a one-off adb shell"""
+        mock_run.return_value.stdout = "fallback\n"
+        self.android_connector.device_id = "device123"
+        self.android_connector._start_shell(subprocess.Popen(
+            ["sh"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, bufsize=1))
+        self.addCleanup(self.android_connector._close_shell)
+        
+        self.assertEqual(self.android_connector._shell("sleep 5"), "fallback\n")
+        self.assertIsNone(self.android_connector._shell_process)
+        self.assertEqual(mock_run.call_args.args[0], "adb -s device123 shell sleep 5")
     
     @patch('android_process_connector.AndroidProcessConnector.is_android_connected')
     @patch('subprocess.run')
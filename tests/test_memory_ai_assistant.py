@@ -0,0 +1,295 @@
+"""
+Tests for the Memory AI Assistant.
+These tests exercise the local (non-network) parts of the assistant.
+"""
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from memory_ai_assistant import (LLMCache, SemanticCache, MemoryAIAssistant, LLMProvider,
+                                 AnthropicProvider, JsonObjectTracker, MEMORY_ACTION_TOOL)
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test the exact-match LLM response cache"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.cache = LLMCache(maxsize=2, ttl=60)
+        self.messages = [{"role": "user", "content": "find 100"}]
+
+    def test_hit_after_set(self):
+        """Test that a stored response is returned for the same request"""
+        key = self.cache.cache_key("model", "system", self.messages, 100, 0.0)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, "response")
+        self.assertEqual(self.cache.get(key), "response")
+        self.assertEqual(self.cache.stats, {"hits": 1, "misses": 1})
+
+    def test_nonzero_temperature_not_cached(self):
+        """Test that sampled requests are never cached"""
+        key = self.cache.cache_key("model", "system", self.messages, 100, 0.7)
+        self.assertIsNone(key)
+        self.cache.set(key, "response")
+        self.assertIsNone(self.cache.get(key))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted at maxsize"""
+        keys = [self.cache.cache_key(f"model{i}", "system", self.messages, 100, 0.0) for i in range(3)]
+        self.cache.set(keys[0], "a")
+        self.cache.set(keys[1], "b")
+        self.cache.get(keys[0])
+        self.cache.set(keys[2], "c")
+        self.assertEqual(self.cache.get(keys[0]), "a")
+        self.assertIsNone(self.cache.get(keys[1]))
+
+    @patch('memory_ai_assistant.time.monotonic')
+    def test_expired_entry_is_a_miss(self, mock_monotonic):
+        """Test that entries older than the TTL are dropped"""
+        key = self.cache.cache_key("model", "system", self.messages, 100, 0.0)
+        mock_monotonic.return_value = 0.0
+        self.cache.set(key, "response")
+        mock_monotonic.return_value = 61.0
+        self.assertIsNone(self.cache.get(key))
+
+
+@unittest.skipIf(not HAS_NUMPY, "NumPy not available")
+class TestSemanticCache(unittest.TestCase):
+    """Test the embedding-similarity interpretation cache"""
+
+    def setUp(self):
+        """Set up a cache with a stub embedding model"""
+        self.cache = SemanticCache(threshold=0.9)
+        self.cache.enabled = True
+        # Queries embed by their leading verb only, so paraphrases collide
+        vectors = {"find": [1.0, 0.0], "search": [0.99, 0.141], "change": [0.0, 1.0]}
+        self.cache._embed = lambda query: numpy.array(vectors[query.split()[0]])
+
+    def test_paraphrase_hits(self):
+        """Test that a similar query with the same literals reuses the interpretation"""
+        self.cache.add("find 100", "pid1", '{"action": "find"}')
+        self.assertEqual(self.cache.lookup("search 100", "pid1"), '{"action": "find"}')
+
+    def test_different_literal_misses(self):
+        """Test that a query differing only in its value is not a hit"""
+        self.cache.add("find 100", "pid1", '{"action": "find"}')
+        self.assertIsNone(self.cache.lookup("search 200", "pid1"))
+
+    def test_different_process_or_intent_misses(self):
+        """Test that other processes and dissimilar queries are not hits"""
+        self.cache.add("find 100", "pid1", '{"action": "find"}')
+        self.assertIsNone(self.cache.lookup("find 100", "pid2"))
+        self.assertIsNone(self.cache.lookup("change 100", "pid1"))
+
+
+class TestHandleUserQuery(unittest.TestCase):
+    """Test query handling without contacting the AI service"""
+
+    def setUp(self):
+        """Set up an assistant with a mocked memory editor"""
+        self.memory_editor = MagicMock()
+        self.memory_editor.scan_memory.return_value = ["0x1000"]
+        self.assistant = MemoryAIAssistant(self.memory_editor, MagicMock())
+
+    @patch('memory_ai_assistant.INTERPRETATION_TIMEOUT', 0.05)
+    def test_slow_interpretation_falls_back(self):
+        """Test that a slow interpretation request is answered by local parsing"""
+        def slow_request(prompt, purpose="chat"):
+            time.sleep(0.5)
+            return '{"action": "find", "value": 1, "data_type": "int"}'
+
+        with patch.object(self.assistant, '_send_ai_request', side_effect=slow_request):
+            response = self.assistant.handle_user_query("find 42 and set it to 1", "pid1", "simulated")
+
+        self.memory_editor.scan_memory.assert_called_once_with("pid1", 42, "int")
+        self.assertIn("0x1000", response)
+
+    def test_extract_numeric_value(self):
+        """Test that floats are not truncated to their integer part"""
+        self.assertEqual(self.assistant._extract_numeric_value("find 3.5"), (3.5, "float"))
+        self.assertEqual(self.assistant._extract_numeric_value("find -7"), (-7, "int"))
+        self.assertEqual(self.assistant._extract_numeric_value("find 7 near 2.5"), (2.5, "float"))
+        self.assertEqual(self.assistant._extract_numeric_value('find "gold"'), ("gold", "string"))
+
+    def test_local_parse(self):
+        """Test that plainly structured queries are parsed without the AI"""
+        self.assertEqual(self.assistant._try_local_parse("find 100"),
+                         {"action": "find", "value": 100, "data_type": "int"})
+        self.assertEqual(self.assistant._try_local_parse("change 0x401000 to 2.5"),
+                         {"action": "change", "address": "0x401000", "value": 2.5, "data_type": "float"})
+        self.assertEqual(self.assistant._try_local_parse('search for "a1"'),
+                         {"action": "find", "value": "a1", "data_type": "string"})
+        self.assertEqual(self.assistant._try_local_parse("change 0x401000 to 0xFF"),
+                         {"action": "change", "address": "0x401000", "value": 255, "data_type": "int"})
+        # The first hex literal reads as an address, so this is left to the AI
+        self.assertIsNone(self.assistant._try_local_parse("find 0x10 and 0x20"))
+
+    def test_local_parse_ambiguous(self):
+        """Test that ambiguous queries are left to the AI"""
+        self.assertIsNone(self.assistant._try_local_parse("find 100 and set it to 5"))
+        self.assertIsNone(self.assistant._try_local_parse("find 100 or 2.5"))
+        self.assertIsNone(self.assistant._try_local_parse("change health to 100"))
+        self.assertIsNone(self.assistant._try_local_parse("find 1e5"))
+        self.assertIsNone(self.assistant._try_local_parse("find player 2 health 100"))
+        self.assertIsNone(self.assistant._try_local_parse("find the value 100 in the first 10 addresses"))
+        self.assertIsNone(self.assistant._try_local_parse("what is my health"))
+
+    def test_batched_find(self):
+        """Test that several values in one query share a single memory scan"""
+        self.memory_editor.scan_memory_multi.return_value = {100: ["0x10"], 200: []}
+        with patch.object(self.assistant, '_send_ai_request') as mock_request:
+            response = self.assistant.handle_user_query("find 100 and 200", "pid1", "simulated")
+        mock_request.assert_not_called()
+        self.memory_editor.scan_memory_multi.assert_called_once_with("pid1", [100, 200], "int")
+        self.assertIn("100: 1 instances at 0x10", response)
+        self.assertIn("200: not found", response)
+
+    def test_local_parse_skips_ai(self):
+        """Test that a locally parsed query never reaches the AI"""
+        with patch.object(self.assistant, '_send_ai_request') as mock_request:
+            self.assistant.handle_user_query("find 42", "pid1", "simulated")
+        mock_request.assert_not_called()
+        self.memory_editor.scan_memory.assert_called_once_with("pid1", 42, "int")
+
+    @patch('memory_ai_assistant.HISTORY_MAXLEN', 4)
+    @patch('memory_ai_assistant.HISTORY_SUMMARIZE_BATCH', 2)
+    def test_history_is_bounded_and_summarized(self):
+        """Test that old turns are folded into the rolling summary"""
+        self.assistant.conversation_history.clear()
+        with patch.object(self.assistant, '_send_ai_request', return_value=""):
+            for i in range(5):
+                self.assistant.handle_user_query(f"find {i}", "pid1", "simulated")
+
+        self.assertEqual([entry['user'] for entry in self.assistant.conversation_history],
+                         ["find 2", "find 3", "find 4"])
+        self.assertIn("find 0; find 1", self.assistant.history_summary)
+
+
+
+class StubProvider(LLMProvider):
+    """Provider that records requests and answers with a fixed interpretation"""
+
+    name = "stub"
+
+    def __init__(self):
+        super().__init__()
+        self.model = "stub-model"
+        self.requests = []
+
+    @property
+    def available(self):
+        return True
+
+    def send(self, system, messages, max_tokens, temperature, model=None, stop_sequences=None, on_token=None):
+        self.requests.append((system, messages, model))
+        text = '{"action": "find", "value": 5, "data_type": "int"}'
+        if on_token is not None:
+            on_token(text)
+        return text
+
+
+class TestProvider(unittest.TestCase):
+    """Test that the assistant delegates to its provider"""
+
+    def setUp(self):
+        """Set up an assistant with a stub provider"""
+        self.provider = StubProvider()
+        self.memory_editor = MagicMock()
+        self.memory_editor.scan_memory.return_value = []
+        self.assistant = MemoryAIAssistant(self.memory_editor, MagicMock(), provider=self.provider)
+
+    def test_provider_response_is_used_and_cached(self):
+        """Test that the provider answers once and repeats come from the response cache"""
+        with patch('memory_ai_assistant.response_cache', LLMCache()):
+            first = self.assistant._send_ai_request("find five")
+            self.assistant.conversation_history.clear()
+            second = self.assistant._send_ai_request("find five")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.provider.requests), 1)
+        system, messages, model = self.provider.requests[0]
+        self.assertEqual(messages[-1], {"role": "user", "content": "find five"})
+        self.assertEqual(model, "stub-model")
+
+    def test_interpretation_uses_interpretation_model(self):
+        """Test that interpretation requests go to the smaller model"""
+        self.provider.interpretation_model = "stub-small"
+        with patch('memory_ai_assistant.response_cache', LLMCache()):
+            self.assistant._send_ai_request("find five", purpose="interpret")
+        self.assertEqual(self.provider.requests[0][2], "stub-small")
+
+    def test_interpretation_from_text_provider(self):
+        """Test that a provider without structured output is parsed from its JSON text"""
+        with patch('memory_ai_assistant.response_cache', LLMCache()):
+            self.assistant.handle_user_query("look for the number five", "pid1", "simulated")
+        self.memory_editor.scan_memory.assert_called_once_with("pid1", 5, "int")
+
+    @patch('memory_ai_assistant.INTERPRETATION_TIMEOUT', 0.05)
+    def test_timed_out_interpretation_is_cached(self):
+        """Test that an interpretation finishing after its timeout answers the next identical query"""
+        send = self.provider.send
+
+        def slow_send(*args, **kwargs):
+            time.sleep(0.2)
+            return send(*args, **kwargs)
+
+        cache = LLMCache()
+        with patch('memory_ai_assistant.response_cache', cache), \
+                patch('memory_ai_assistant.semantic_cache', SemanticCache()), \
+                patch.object(self.provider, 'send', side_effect=slow_send):
+            self.assistant.handle_user_query("look for the number five", "pid1", "simulated")
+            time.sleep(0.4)
+            self.assistant.handle_user_query("look for the number five", "pid1", "simulated")
+
+        self.assertEqual(len(self.provider.requests), 1)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1})
+        self.memory_editor.scan_memory.assert_called_once_with("pid1", 5, "int")
+
+    def test_anthropic_tool_use(self):
+        """Test that the Anthropic provider forces the tool and returns its parsed input"""
+        provider = AnthropicProvider()
+        provider.client = MagicMock()
+        tool_block = MagicMock(type='tool_use', input={"action": "find", "value": 7})
+        provider.client.messages.create.return_value = MagicMock(content=[tool_block])
+
+        result = provider.send_structured(["system"], [{"role": "user", "content": "find seven"}],
+                                          MEMORY_ACTION_TOOL, 128, 0.0, model="small")
+
+        self.assertEqual(result, {"action": "find", "value": 7})
+        request = provider.client.messages.create.call_args.kwargs
+        self.assertEqual(request["tool_choice"], {"type": "tool", "name": "memory_action"})
+        self.assertEqual(request["model"], "small")
+
+
+    def test_anthropic_stream_stops_early(self):
+        """Test that streaming stops once the callback asks it to"""
+        provider = AnthropicProvider()
+        provider.client = MagicMock()
+        stream = provider.client.messages.stream.return_value.__enter__.return_value
+        stream.text_stream = iter(['{"action": ', '"find"}', ' and some prose'])
+
+        text = provider.send(["system"], [{"role": "user", "content": "find"}], 128, 0.0,
+                             on_token=JsonObjectTracker().feed)
+
+        self.assertEqual(text, '{"action": "find"}')
+
+
+class TestJsonObjectTracker(unittest.TestCase):
+    """Test detection of a complete streamed JSON object"""
+
+    def test_completes_on_closing_brace(self):
+        """Test that nested objects and braces in strings are handled"""
+        tracker = JsonObjectTracker()
+        self.assertFalse(tracker.feed('Sure: {"a": {"b": "}'))
+        self.assertFalse(tracker.feed('\\"{"}'))
+        self.assertTrue(tracker.feed(', "c": 1} trailing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
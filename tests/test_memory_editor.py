@@ -0,0 +1,220 @@
+"""
+Tests for the Memory Editor.
+"""
+import unittest
+from unittest.mock import patch
+
+import memory_editor
+from memory_editor import MemoryEditor, MemoryDisplay
+from process_simulator import ProcessSimulator
+
+
+class TestScanMemory(unittest.TestCase):
+    """Test memory scans against a simulated process"""
+
+    def setUp(self):
+        """Set up a process with known memory contents"""
+        self.simulator = ProcessSimulator()
+        self.editor = MemoryEditor(self.simulator)
+        self.pid = self.simulator.create_process("test", {
+            "0x1000": 100,
+            "0x1004": 100.0,
+            "0x1008": 2.5,
+            "0x100c": "gold",
+            "0x1010": 2**70,
+            "0x1014": 100,
+        })
+
+    def test_int_scan(self):
+        """Test that int scans match equal ints and floats in map order"""
+        self.assertEqual(self.editor.scan_memory(self.pid, 100, "int"), ["0x1000", "0x1004", "0x1014"])
+        self.assertEqual(self.editor.scan_memory(self.pid, "0x64", "int"), ["0x1000", "0x1004", "0x1014"])
+        self.assertEqual(self.editor.scan_memory(self.pid, 2**70, "int"), ["0x1010"])
+
+    def test_float_scan_tolerance(self):
+        """Test that float scans tolerate rounding in the typed value"""
+        self.assertEqual(self.editor.scan_memory(self.pid, 2.5000000001, "float"), ["0x1008"])
+        self.assertEqual(self.editor.scan_memory(self.pid, 2.6, "float"), [])
+
+    def test_string_scan(self):
+        """Test that string scans only match strings"""
+        self.assertEqual(self.editor.scan_memory(self.pid, "gold", "string"), ["0x100c"])
+
+    def test_scan_sees_writes(self):
+        """Test that cached scan data is refreshed after memory changes"""
+        self.assertEqual(self.editor.scan_memory(self.pid, 7, "int"), [])
+        self.editor.write_process_memory(self.pid, "0x1008", 7, "int")
+        self.assertEqual(self.editor.scan_memory(self.pid, 7, "int"), ["0x1008"])
+        self.editor.undo_memory_edit(self.pid)
+        self.assertEqual(self.editor.scan_memory(self.pid, 7, "int"), [])
+
+    def test_index_updated_in_place(self):
+        """Test that editor writes update the value index without a rebuild"""
+        self.editor.scan_memory(self.pid, 100, "int")
+        index = self.editor._value_index[self.pid]
+        self.editor.write_process_memory(self.pid, "0x1000", "gold", "string")
+        self.editor.write_process_memory(self.pid, "0x2000", 100, "int")
+        self.assertIs(self.editor._value_index[self.pid], index)
+        self.assertEqual(self.editor.scan_memory(self.pid, 100, "int"), ["0x1004", "0x1014", "0x2000"])
+        self.assertEqual(self.editor.scan_memory(self.pid, "gold", "string"), ["0x1000", "0x100c"])
+
+    def test_deleted_process_is_not_attached(self):
+        """Test that a cached attach doesn't outlive its process"""
+        self.assertTrue(self.editor.attach_to_process(self.pid))
+        self.editor.scan_memory(self.pid, 100, "int")
+        self.simulator.delete_process(self.pid)
+        self.assertFalse(self.editor.attach_to_process(self.pid))
+        self.assertEqual(self.editor.scan_memory(self.pid, 100, "int"), [])
+        self.assertNotIn(self.pid, self.editor._value_index)
+
+    def test_writer(self):
+        """Test that a writer converts and writes like write_process_memory"""
+        writer = self.editor.get_writer(self.pid, "int")
+        self.assertTrue(writer("0x1008", "0x10"))
+        self.assertEqual(self.simulator.read_memory(self.pid, "0x1008"), 16)
+        self.assertEqual(self.editor.scan_memory(self.pid, 16, "int"), ["0x1008"])
+        with self.assertRaises(ValueError):
+            writer("0x1008", "abc")
+        self.assertIsNone(self.editor.get_writer(self.pid, "complex"))
+        self.assertIsNone(self.editor.get_writer("no-such-pid", "int"))
+
+    def test_bulk_write(self):
+        """Test that a bulk write is converted up front and undone as one step"""
+        self.editor.scan_memory(self.pid, 100, "int")
+        self.assertFalse(self.editor.write_process_memory_bulk(self.pid, [("0x1000", 1), ("0x1004", "x")], "int"))
+        self.assertEqual(self.simulator.read_memory(self.pid, "0x1000"), 100)
+
+        items = [("0x1000", 1), ("0x1004", "0x2"), ("0x1000", 3), ("0x3000", 3)]
+        self.assertTrue(self.editor.write_process_memory_bulk(self.pid, items, "int"))
+        self.assertEqual(self.editor.scan_memory(self.pid, 3, "int"), ["0x1000", "0x3000"])
+        self.assertEqual(self.editor.scan_memory(self.pid, 1, "int"), [])
+        self.assertEqual(self.editor.scan_memory(self.pid, 100, "int"), ["0x1014"])
+
+        self.editor.undo_memory_edit(self.pid)
+        self.assertEqual(self.editor.scan_memory(self.pid, 100, "int"), ["0x1000", "0x1004", "0x1014"])
+
+    def test_scan_without_numpy(self):
+        """Test that the plain Python scan gives the same results"""
+        with patch.object(memory_editor, 'HAS_NUMPY', False):
+            self.assertEqual(self.editor.scan_memory(self.pid, 100, "int"), ["0x1000", "0x1004", "0x1014"])
+            self.assertEqual(self.editor.scan_memory(self.pid, 2.5000000001, "float"), ["0x1008"])
+
+    def test_scan_multi(self):
+        """Test that a multi-value scan matches individual scans"""
+        results = self.editor.scan_memory_multi(self.pid, [100, 7, "0x64"], "int")
+        self.assertEqual(results, {100: ["0x1000", "0x1004", "0x1014"], 7: [], "0x64": ["0x1000", "0x1004", "0x1014"]})
+
+
+
+class TestReadProcessMemory(unittest.TestCase):
+    """Test formatting of process memory for display"""
+
+    def setUp(self):
+        """Set up a process with one value of each type"""
+        self.simulator = ProcessSimulator()
+        self.editor = MemoryEditor(self.simulator)
+        self.pid = self.simulator.create_process("test", {
+            "0x1000": 65,
+            "0x1004": 300,
+            "0x1008": 2.5,
+            "0x100c": "Hi\x01",
+        })
+        self.simulator.set_breakpoint(self.pid, "0x1004", "write")
+
+    def test_int_formats(self):
+        """Test each display format for int values"""
+        expected = {
+            MemoryDisplay.HEX: ("0x41", "0x41"),
+            MemoryDisplay.DECIMAL: ("65", "0x41"),
+            MemoryDisplay.ASCII: ("A", "0x41"),
+            MemoryDisplay.BYTES: ("0x00000041", "0x00000041"),
+            MemoryDisplay.MIXED: ("65", "0x41"),
+        }
+        for display_format, (formatted_value, hex_value) in expected.items():
+            cell = self.editor.read_process_memory(self.pid, display_format)["0x1000"]
+            self.assertEqual((cell["formatted_value"], cell["hex"]), (formatted_value, hex_value), display_format)
+        cell = self.editor.read_process_memory(self.pid, MemoryDisplay.ASCII)["0x1004"]
+        self.assertEqual(cell["formatted_value"], ".")
+
+    def test_display_format_names(self):
+        """Test that formats can be set by their UI name"""
+        self.assertTrue(self.editor.set_display_format("hex"))
+        self.assertIs(self.editor.display_format, MemoryDisplay.HEX)
+        self.assertEqual(self.editor.read_process_memory(self.pid)["0x1000"]["formatted_value"], "0x41")
+        self.assertEqual(self.editor.read_process_memory(self.pid, "ascii")["0x1000"]["formatted_value"], "A")
+        self.assertFalse(self.editor.set_display_format("octal"))
+        self.assertEqual(str(MemoryDisplay.BYTES), "bytes")
+
+    def test_float_and_string(self):
+        """Test float and string cells, including ASCII filtering"""
+        memory = self.editor.read_process_memory(self.pid, MemoryDisplay.MIXED)
+        self.assertEqual(memory["0x1008"], {
+            "value": 2.5, "formatted_value": "2.5", "type": "float", "hex": "N/A", "symbol": None,
+            "has_breakpoint": False, "breakpoint_enabled": False, "breakpoint_type": None,
+        })
+        self.assertEqual(memory["0x100c"]["hex"], "48 69 01")
+        self.assertEqual(memory["0x100c"]["formatted_value"], "Hi\x01")
+        ascii_memory = self.editor.read_process_memory(self.pid, MemoryDisplay.ASCII)
+        self.assertEqual(ascii_memory["0x100c"]["formatted_value"], "Hi.")
+
+    def test_symbols_and_breakpoints(self):
+        """Test that symbols and breakpoints are attached to their cells"""
+        memory = self.editor.read_process_memory(self.pid)
+        self.assertEqual(memory["0x601000"]["symbol"], "counter")
+        self.assertTrue(memory["0x1004"]["has_breakpoint"])
+        self.assertEqual(memory["0x1004"]["breakpoint_type"], "write")
+        self.assertTrue(memory["0x1004"]["breakpoint_enabled"])
+
+    def test_iter_in_chunks(self):
+        """Test that chunked reads cover the same cells as a full read"""
+        memory = self.editor.read_process_memory(self.pid)
+        chunks = list(self.editor.iter_process_memory(self.pid, chunk_size=3))
+        self.assertTrue(all(len(chunk) <= 3 for chunk in chunks))
+        merged = {}
+        for chunk in chunks:
+            merged.update(chunk)
+        self.assertEqual(merged, memory)
+        page = next(self.editor.iter_process_memory(self.pid, chunk_size=2, offset=1))
+        self.assertEqual(list(page), list(memory)[1:3])
+
+
+class TestSymbols(unittest.TestCase):
+    """Test symbol lookups"""
+
+    def setUp(self):
+        """Set up a process with the simulator's sample symbols"""
+        self.simulator = ProcessSimulator()
+        self.editor = MemoryEditor(self.simulator)
+        self.pid = self.simulator.create_process("test", {})
+
+    def test_lookup_by_name_and_address(self):
+        """Test that symbols resolve by name and by address"""
+        symbol = self.editor.lookup_symbol(self.pid, "main")
+        self.assertEqual(symbol.address, hex(0x400500))
+        self.assertIs(self.editor.lookup_address_symbol(self.pid, symbol.address), symbol)
+        self.assertIsNone(self.editor.lookup_symbol(self.pid, "missing"))
+        self.assertIsNone(self.editor.lookup_symbol("no-such-pid", "main"))
+
+
+class TestSession(unittest.TestCase):
+    """Test per-process debugging sessions"""
+
+    def setUp(self):
+        """Set up an empty process"""
+        self.simulator = ProcessSimulator()
+        self.editor = MemoryEditor(self.simulator)
+        self.pid = self.simulator.create_process("test", {})
+
+    def test_breakpoints_through_session(self):
+        """Test that session calls act on the bound process"""
+        with self.editor.session(self.pid) as session:
+            self.assertTrue(session.set_breakpoint("0x1000", "write"))
+            self.assertEqual(session.toggle_breakpoint("0x1000"), (True, False))
+            self.assertEqual([bp.address for bp in session.get_breakpoints()], ["0x1000"])
+            self.assertTrue(session.remove_breakpoint("0x1000"))
+        self.assertEqual(self.editor.get_breakpoints(self.pid), [])
+        self.assertIsNone(self.editor.session("no-such-pid"))
+
+
+if __name__ == '__main__':
+    unittest.main()
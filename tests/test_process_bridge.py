@@ -0,0 +1,85 @@
+"""
+Tests for the Process Bridge.
+Real-process paths run against a mocked connector.
+"""
+import struct
+import unittest
+from unittest.mock import MagicMock
+
+from process_bridge import ProcessBridge, ProcessType
+from process_simulator import ProcessSimulator
+from real_process_connector import MemoryRegion, MemoryProtection, RealProcessConnector
+
+
+class TestReadMemory(unittest.TestCase):
+    """Test raw reads from simulated processes"""
+
+    def setUp(self):
+        """Set up a bridge attached to a simulated process"""
+        simulator = ProcessSimulator()
+        pid = simulator.create_process("test", {"0x10": 5, "0x18": -1, "0x20": 2.5, "0x28": "ab"})
+        self.bridge = ProcessBridge(simulator)
+        self.assertTrue(self.bridge.attach_to_process(pid))
+
+    def test_values_encode_by_type(self):
+        """Test that each value type is encoded as little-endian bytes"""
+        self.assertEqual(self.bridge.read_memory("0x10"), b"\x05" + b"\x00" * 7)
+        self.assertEqual(self.bridge.read_memory("0x18"), b"\xff" * 8)
+        self.assertEqual(self.bridge.read_memory("0x20"), struct.pack("<d", 2.5))
+        self.assertEqual(self.bridge.read_memory("0x28"), b"ab")
+        self.assertIsNone(self.bridge.read_memory("0x30"))
+
+
+class TestMemoryRegions(unittest.TestCase):
+    """Test memory region listing for real processes"""
+
+    def setUp(self):
+        """Set up a bridge attached to a mocked real process"""
+        self.bridge = ProcessBridge(ProcessSimulator())
+        self.connector = MagicMock()
+        self.connector.attach_to_process.return_value = True
+        self.connector.write_memory.return_value = True
+        self.connector.iter_memory_regions.side_effect = lambda: iter([
+            MemoryRegion(0x1000, 0x2000, MemoryProtection.PROT_READ, "Private"),
+            MemoryRegion(0x4000, 0x1000, MemoryProtection.PROT_READ | MemoryProtection.PROT_WRITE, "Mapped", "lib.so"),
+        ])
+        # Keep the connector's real region index so the bridge shares it
+        self.connector.attached_pid = 1234
+        self.connector._region_index = None
+        self.connector.get_region_index.side_effect = lambda: RealProcessConnector.get_region_index(self.connector)
+        self.connector.invalidate_regions.side_effect = lambda: RealProcessConnector.invalidate_regions(self.connector)
+        self.bridge.real_connector = self.connector
+        self.bridge.has_real_connector = True
+        self.bridge.system = "Linux"
+        self.assertTrue(self.bridge.attach_to_process("1234", ProcessType.REAL))
+
+    def test_regions_are_cached_until_write(self):
+        """Test that regions are listed once and relisted after a write"""
+        regions = self.bridge.get_memory_regions()
+        self.assertEqual([r["protection"] for r in regions], ["r--", "rw-"])
+        self.assertIs(self.bridge.get_memory_regions(), regions)
+        self.assertEqual(self.connector.iter_memory_regions.call_count, 1)
+
+        self.assertTrue(self.bridge.write_memory("0x1000", 5))
+        self.connector.invalidate_regions.assert_called()
+        self.bridge.get_memory_regions()
+        self.assertEqual(self.connector.iter_memory_regions.call_count, 2)
+
+    def test_find_region(self):
+        """Test that addresses resolve to the region containing them"""
+        self.assertEqual(self.bridge.find_region("0x1000")["base_address"], "0x1000")
+        self.assertEqual(self.bridge.find_region(0x2fff)["base_address"], "0x1000")
+        self.assertEqual(self.bridge.find_region("0x4800")["mapped_file"], "lib.so")
+        self.assertIsNone(self.bridge.find_region("0x3000"))
+        self.assertIsNone(self.bridge.find_region("0x800"))
+        self.assertEqual(self.connector.iter_memory_regions.call_count, 1)
+
+    def test_connector_lookup_shares_index(self):
+        """Test that the bridge and the connector look up regions in one index"""
+        self.bridge.get_memory_regions()
+        self.assertEqual(RealProcessConnector.find_region(self.connector, 0x4800).mapped_file, "lib.so")
+        self.assertEqual(self.connector.iter_memory_regions.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for the Process Simulator.
+"""
+import unittest
+
+from process_simulator import ProcessSimulator
+
+
+class TestMemoryHistory(unittest.TestCase):
+    """Test undo/redo of memory edits"""
+
+    def setUp(self):
+        """Set up a process with known memory contents"""
+        self.simulator = ProcessSimulator()
+        self.pid = self.simulator.create_process("test", {"0x10": 1, "0x20": 2})
+        self.memory = self.simulator.get_memory_map(self.pid)
+
+    def test_undo_redo_single_write(self):
+        """Test that a write is undone and redone in place"""
+        self.simulator.write_memory(self.pid, "0x10", 5)
+        self.assertTrue(self.simulator.undo_memory_edit(self.pid))
+        self.assertEqual(self.memory["0x10"], 1)
+        self.assertTrue(self.simulator.redo_memory_edit(self.pid))
+        self.assertEqual(self.memory["0x10"], 5)
+        self.assertFalse(self.simulator.redo_memory_edit(self.pid))
+
+    def test_undo_removes_new_addresses(self):
+        """Test that undoing a bulk write restores repeated and new addresses"""
+        self.simulator.write_memory_bulk(self.pid, [("0x10", 3), ("0x30", 4), ("0x10", 6)])
+        self.assertTrue(self.simulator.undo_memory_edit(self.pid))
+        self.assertEqual((self.memory["0x10"], self.memory["0x20"]), (1, 2))
+        self.assertNotIn("0x30", self.memory)
+        self.assertFalse(self.simulator.undo_memory_edit(self.pid))
+
+    def test_new_write_drops_redo(self):
+        """Test that writing after an undo discards the undone edit"""
+        self.simulator.write_memory(self.pid, "0x10", 5)
+        self.simulator.undo_memory_edit(self.pid)
+        self.simulator.write_memory(self.pid, "0x20", 7)
+        self.assertFalse(self.simulator.redo_memory_edit(self.pid))
+        self.assertEqual((self.memory["0x10"], self.memory["0x20"]), (1, 7))
+
+    def test_same_value_write_is_not_journaled(self):
+        """Test that rewriting an unchanged value leaves nothing to undo"""
+        process = self.simulator.get_process(self.pid)
+        version = process.memory_version
+        self.assertTrue(self.simulator.write_memory(self.pid, "0x10", 1))
+        self.assertEqual(process.memory_version, version)
+        self.assertFalse(self.simulator.undo_memory_edit(self.pid))
+
+        self.simulator.write_memory(self.pid, "0x10", 1.0)
+        self.assertIsInstance(self.memory["0x10"], float)
+
+    def test_transaction_is_one_undo_step(self):
+        """Test that writes inside a transaction are undone together"""
+        self.assertTrue(self.simulator.begin_transaction(self.pid))
+        self.simulator.write_memory(self.pid, "0x10", 5)
+        self.simulator.write_memory(self.pid, "0x20", 6)
+        self.simulator.write_memory(self.pid, "0x10", 7)
+        self.assertTrue(self.simulator.commit_transaction(self.pid))
+
+        self.assertTrue(self.simulator.undo_memory_edit(self.pid))
+        self.assertEqual((self.memory["0x10"], self.memory["0x20"]), (1, 2))
+        self.assertFalse(self.simulator.undo_memory_edit(self.pid))
+        self.assertTrue(self.simulator.redo_memory_edit(self.pid))
+        self.assertEqual((self.memory["0x10"], self.memory["0x20"]), (7, 6))
+
+
+class TestExecution(unittest.TestCase):
+    """Test stepping through the sample program"""
+
+    def setUp(self):
+        """Set up a process stopped at main"""
+        self.simulator = ProcessSimulator()
+        self.pid = self.simulator.create_process("test")
+        self.registers = self.simulator.get_process(self.pid).registers
+
+    def test_step_advances_by_instruction_length(self):
+        """Test that a step executes the instruction and moves past it"""
+        self.registers["rbx"] = 5
+        self.assertTrue(self.simulator.step_instruction(self.pid))
+        self.assertEqual(self.registers["rax"], 0)
+        self.assertEqual(self.registers["rip"], 0x400500 + 3)
+
+    def test_run_stops_at_enabled_execution_breakpoint(self):
+        """Test that running stops at an execution breakpoint until it is toggled off"""
+        self.simulator.set_breakpoint(self.pid, "0x400507")
+        self.simulator.set_breakpoint(self.pid, "0x400505", "write")
+        self.assertTrue(self.simulator.run_until_breakpoint(self.pid))
+        self.assertEqual(self.registers["rip"], 0x400507)
+        self.assertEqual(self.simulator.get_breakpoints(self.pid)[0].hit_count, 1)
+
+        self.simulator.toggle_breakpoint(self.pid, "0x400507")
+        self.simulator.run_until_breakpoint(self.pid, max_steps=1)
+        self.assertNotEqual(self.registers["rip"], 0x400507)
+
+    def test_find_next_breakpoint(self):
+        """Test that only enabled execution breakpoints are found, in address order"""
+        for address in ("0x400517", "0x40050e", "0x400522"):
+            self.simulator.set_breakpoint(self.pid, address)
+        self.simulator.set_breakpoint(self.pid, "0x400510", "write")
+        self.simulator.toggle_breakpoint(self.pid, "0x400517")
+
+        self.assertEqual(self.simulator.find_next_breakpoint(self.pid, "0x400500").address, "0x40050e")
+        self.assertEqual(self.simulator.find_next_breakpoint(self.pid, "0x40050f").address, "0x400522")
+        self.simulator.remove_breakpoint(self.pid, "0x400522")
+        self.assertIsNone(self.simulator.find_next_breakpoint(self.pid, "0x40050f"))
+
+    def test_get_instructions_from_address(self):
+        """Test that disassembly starts at the first instruction at or after the address"""
+        instructions = self.simulator.get_instructions(self.pid, "0x400501", 2)
+        self.assertEqual([instr.address for instr in instructions], ["0x400507", "0x40050e"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,300 @@
+"""
+Tests for the Real Process Connector.
+These tests read the test process's own memory, so no other process is traced;
+the Windows connector runs against a faked target.
+"""
+import ctypes
+import mmap
+import os
+import platform
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from real_process_connector import (LinuxProcessConnector, WindowsProcessConnector, ProcessInfo,
+                                    MemoryRegion, RegionIndex, PAGE_SIZE)
+
+
+@unittest.skipIf(platform.system() != "Linux", "Linux only")
+class TestLinuxReadMemoryBatch(unittest.TestCase):
+    """Test batched reads on Linux"""
+
+    def setUp(self):
+        """Point a connector at this process without ptrace-attaching"""
+        self.connector = LinuxProcessConnector()
+        self.connector.attached_pid = os.getpid()
+        self.connector.process_handle = os.getpid()
+        self.first = ctypes.create_string_buffer(b"hello world")
+        self.second = ctypes.create_string_buffer(b"ABCDEFGH")
+
+    def tearDown(self):
+        """Close any memory descriptor the test opened"""
+        self.connector._close_mem()
+
+    def test_batch_skips_unreadable_ranges(self):
+        """Test that readable ranges are returned around an unreadable one"""
+        first = ctypes.addressof(self.first)
+        second = ctypes.addressof(self.second)
+        requests = [(first, 5), (8, 4), (second, 8), (first + 6, 5)]
+
+        self.assertEqual(self.connector.read_memory_batch(requests),
+                         [b"hello", None, b"ABCDEFGH", b"world"])
+
+    def test_fallback_without_process_vm_readv(self):
+        """Test that the per-read path gives the same results"""
+        self.connector.has_process_vm_readv = False
+        first = ctypes.addressof(self.first)
+        self.assertEqual(self.connector.read_memory_batch([(first, 5), (first + 6, 5)]),
+                         [b"hello", b"world"])
+
+    def test_fallback_coalesces_adjacent_ranges(self):
+        """Test that touching ranges are fetched with one read"""
+        self.connector.has_process_vm_readv = False
+        first = ctypes.addressof(self.first)
+        with patch.object(self.connector, 'read_memory', wraps=self.connector.read_memory) as read_memory:
+            results = self.connector.read_memory_batch([(first + 6, 5), (first, 3), (first + 3, 3)])
+        self.assertEqual(results, [b"world", b"hel", b"lo "])
+        read_memory.assert_called_once_with(first, 11)
+
+    def test_read_memory_with_pread(self):
+        """Test that reads use the descriptor opened at attach time"""
+        self.connector._open_mem()
+        self.assertIsNotNone(self.connector._mem_fd)
+        self.assertEqual(self.connector.read_memory(ctypes.addressof(self.second), 4), b"ABCD")
+        self.connector._close_mem()
+        self.assertIsNone(self.connector._mem_fd)
+
+    def test_read_without_descriptor(self):
+        """Test that reads without an open descriptor use process_vm_readv"""
+        self.assertIsNone(self.connector._mem_fd)
+        self.assertEqual(self.connector.read_memory(ctypes.addressof(self.second), 4), b"ABCD")
+
+    def test_write_memory(self):
+        """Test that writes land through the descriptor and through process_vm_writev"""
+        address = ctypes.addressof(self.second)
+        self.assertTrue(self.connector.write_memory(address, b"xy"))
+        self.assertEqual(self.second.raw[:4], b"xyCD")
+
+        self.connector._open_mem()
+        self.assertTrue(self.connector.write_memory(address + 2, b"zw"))
+        self.assertEqual(self.second.raw[:4], b"xyzw")
+
+    def test_write_batch(self):
+        """Test that touching writes are merged and all land with one process_vm_writev"""
+        first = ctypes.addressof(self.first)
+        second = ctypes.addressof(self.second)
+        writes = [(first, b"J"), (first + 1, b"E"), (second + 7, b"!"), (first + 6, b"W")]
+        with patch.object(self.connector, '_process_vm_writev',
+                          wraps=self.connector._process_vm_writev) as writev:
+            self.assertEqual(self.connector.write_memory_batch(writes), [True] * 4)
+        writev.assert_called_once_with([(first, b"JE"), (second + 7, b"!"), (first + 6, b"W")])
+        self.assertEqual(self.first.value, b"JEllo World")
+        self.assertEqual(self.second.value, b"ABCDEFG!")
+
+    def test_write_batch_falls_back_for_read_only_pages(self):
+        """Test that a range process_vm_writev refuses is written through /proc/[pid]/mem"""
+        read_only = ctypes.create_string_buffer(PAGE_SIZE * 2)
+        page = (ctypes.addressof(read_only) + PAGE_SIZE - 1) & ~(PAGE_SIZE - 1)
+        mprotect = ctypes.CDLL(None, use_errno=True).mprotect
+        mprotect.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+        self.assertEqual(mprotect(page, PAGE_SIZE, 1), 0)  # PROT_READ
+        self.addCleanup(mprotect, page, PAGE_SIZE, 3)
+
+        first = ctypes.addressof(self.first)
+        results = self.connector.write_memory_batch([(first, b"J"), (page, b"ro"), (first + 6, b"W")])
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(ctypes.string_at(page, 2), b"ro")
+        self.assertEqual(self.first.value, b"Jello World")
+
+    def test_readonly_attach(self):
+        """Test that a readonly attach reads without ptrace and refuses writes"""
+        connector = LinuxProcessConnector()
+        self.assertTrue(connector.attach_to_process(os.getpid(), readonly=True))
+        address = ctypes.addressof(self.second)
+        self.assertEqual(connector.read_memory(address, 4), b"ABCD")
+        self.assertFalse(connector.write_memory(address, b"xy"))
+        self.assertEqual(connector.write_memory_batch([(address, b"xy")]), [False])
+        self.assertEqual(self.second.value, b"ABCDEFGH")
+
+        # Detaching must not PTRACE_DETACH a process that was never stopped
+        connector.libc = MagicMock()
+        self.assertTrue(connector.detach_from_process())
+        connector.libc.ptrace.assert_not_called()
+        self.assertIsNone(connector._mem_fd)
+
+    def test_regions_with_undecodable_path(self):
+        """Test that a mapped file whose name isn't UTF-8 is listed rather than failing the scan"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(os.fsencode(directory), b"caf\xe9.bin")
+        with open(path, "wb") as mapped:
+            mapped.write(b"\0" * PAGE_SIZE)
+        with open(path, "rb") as mapped, mmap.mmap(mapped.fileno(), PAGE_SIZE, prot=mmap.PROT_READ):
+            mapped_files = [region.mapped_file for region in self.connector.iter_memory_regions()]
+        self.assertIn(os.fsdecode(path), mapped_files)
+
+    def test_session_reuses_attachment(self):
+        """Test that a session reads through the current attachment and leaves it attached"""
+        with self.connector.session() as session:
+            self.assertEqual(session.read(ctypes.addressof(self.first), 5), b"hello")
+        self.assertEqual(self.connector.attached_pid, os.getpid())
+
+        self.connector.attached_pid = None
+        with self.assertRaises(RuntimeError):
+            with self.connector.session():
+                pass
+
+
+@unittest.skipIf(platform.system() != "Linux", "Linux only")
+class TestProcessListCache(unittest.TestCase):
+    """Test reuse of recent process listings"""
+
+    def setUp(self):
+        """Set up a connector whose process scan is counted"""
+        self.connector = LinuxProcessConnector()
+        self.scan = patch.object(self.connector, '_scan_processes',
+                                 side_effect=lambda: iter([ProcessInfo(1, "init"), ProcessInfo(2, "shell")])).start()
+
+    def tearDown(self):
+        """Stop patching"""
+        patch.stopall()
+
+    @patch('real_process_connector.time.monotonic')
+    def test_listing_is_reused_until_it_expires(self, mock_monotonic):
+        """Test that a listing younger than the TTL is served without rescanning"""
+        mock_monotonic.return_value = 0.0
+        self.assertEqual([p.pid for p in self.connector.list_processes()], [1, 2])
+        mock_monotonic.return_value = 0.4
+        self.assertEqual([p.pid for p in self.connector.list_processes()], [1, 2])
+        self.assertEqual(self.scan.call_count, 1)
+
+        mock_monotonic.return_value = 1.0
+        self.connector.list_processes()
+        self.assertEqual(self.scan.call_count, 2)
+
+    def test_partial_iteration_is_not_reused(self):
+        """Test that stopping early leaves no cached listing"""
+        next(self.connector.iter_processes())
+        self.connector.list_processes()
+        self.assertEqual(self.scan.call_count, 2)
+
+
+class TestWindowsPageCache(unittest.TestCase):
+    """Test the session page cache of the Windows connector with a faked target"""
+
+    def setUp(self):
+        """Build a connector without loading Win32 libraries"""
+        self.connector = WindowsProcessConnector.__new__(WindowsProcessConnector)
+        self.connector.attached_pid = 1
+        self.connector.process_handle = 1
+        self.connector._page_cache = None
+        self.connector._page_cache_lock = threading.Lock()
+        self.connector.kernel32 = MagicMock()
+        self.connector.kernel32.WriteProcessMemory.return_value = 1
+        self.memory = bytes(range(256)) * (3 * PAGE_SIZE // 256)
+        self.read = patch.object(self.connector, '_read_process_memory',
+                                 side_effect=lambda address, size: self.memory[address:address + size]).start()
+
+    def tearDown(self):
+        """Stop patching"""
+        patch.stopall()
+
+    def test_small_reads_share_a_page_within_a_session(self):
+        """Test that reads in one page cost one target read, and only inside a session"""
+        with self.connector.session():
+            self.assertEqual(self.connector.read_memory(0x10, 4), self.memory[0x10:0x14])
+            self.assertEqual(self.connector.read_memory(0x20, 8), self.memory[0x20:0x28])
+            self.read.assert_called_once_with(0, PAGE_SIZE)
+
+            # Ranges that cross a page boundary are read directly
+            self.connector.read_memory(PAGE_SIZE - 2, 4)
+            self.read.assert_called_with(PAGE_SIZE - 2, 4)
+
+            # A write drops the cached page
+            self.assertTrue(self.connector.write_memory(0x10, b"\x00"))
+            self.connector.read_memory(0x10, 4)
+            self.assertEqual(self.read.call_count, 3)
+
+        self.connector.read_memory(0x10, 4)
+        self.read.assert_called_with(0x10, 4)
+        self.assertIsNone(self.connector._page_cache)
+
+
+class TestWindowsMemoryRegions(unittest.TestCase):
+    """Test region enumeration of the Windows connector with a faked VirtualQueryEx"""
+
+    def setUp(self):
+        """Build a connector whose target has a free, an image and a private region"""
+        self.connector = WindowsProcessConnector.__new__(WindowsProcessConnector)
+        self.connector.attached_pid = 1
+        self.connector.process_handle = 1
+        self.connector._min_address = 0
+        self.connector._max_address = 0x7fffffff
+        self.connector.kernel32 = MagicMock()
+        # address: (size, committed, protection, type)
+        regions = {0: (0x10000, False, 0x01, 0),
+                   0x10000: (0x2000, True, 0x02, 0x1000000),
+                   0x12000: (0x3000, True, 0x04, 0x20000)}
+
+        def virtual_query(handle, address, mbi_ref, mbi_size):
+            if address not in regions:
+                return 0
+            mbi = mbi_ref._obj
+            mbi.BaseAddress = address or None
+            mbi.RegionSize, committed, mbi.Protect, mbi.Type = regions[address]
+            mbi.State = 0x1000 if committed else 0x10000
+            return mbi_size
+
+        self.connector.kernel32.VirtualQueryEx.side_effect = virtual_query
+
+    def test_only_committed_regions_are_listed(self):
+        """Test that free regions are skipped and types are named"""
+        regions = self.connector.get_memory_regions()
+        self.assertEqual([(r.base_address, r.size, r.type) for r in regions],
+                         [(0x10000, 0x2000, "Image"), (0x12000, 0x3000, "Private")])
+        self.assertEqual(self.connector.kernel32.VirtualQueryEx.call_count, 4)
+
+    def test_walk_stays_in_application_range(self):
+        """Test that the walk starts and stops at the application address bounds"""
+        self.connector._min_address = 0x10000
+        self.connector._max_address = 0x15000
+        self.assertEqual(len(self.connector.get_memory_regions()), 2)
+        queried = [call.args[1] for call in self.connector.kernel32.VirtualQueryEx.call_args_list]
+        self.assertEqual(queried, [0x10000, 0x12000])
+
+
+class TestRegionIndex(unittest.TestCase):
+    """Test address to region lookup"""
+
+    def test_find(self):
+        """Test lookups inside, between and outside unsorted regions"""
+        index = RegionIndex([MemoryRegion(0x5000, 0x1000, 1, "Private"),
+                             MemoryRegion(0x1000, 0x2000, 1, "Private")])
+        self.assertEqual(index.find(0x1000).base_address, 0x1000)
+        self.assertEqual(index.find(0x2fff).base_address, 0x1000)
+        self.assertEqual(index.find(0x5800).base_address, 0x5000)
+        self.assertIsNone(index.find(0x3000))
+        self.assertIsNone(index.find(0x800))
+        self.assertIsNone(index.find(0x6000))
+        self.assertEqual(len(index), 2)
+
+    @unittest.skipIf(platform.system() != "Linux", "Linux only")
+    def test_connector_reuses_index_until_invalidated(self):
+        """Test that find_region lists regions once per attachment"""
+        connector = LinuxProcessConnector()
+        connector.attached_pid = connector.process_handle = os.getpid()
+        buffer = ctypes.create_string_buffer(16)
+        with patch.object(connector, 'iter_memory_regions', wraps=connector.iter_memory_regions) as regions:
+            region = connector.find_region(ctypes.addressof(buffer))
+            self.assertLessEqual(region.base_address, ctypes.addressof(buffer))
+            connector.find_region(ctypes.addressof(buffer))
+            self.assertEqual(regions.call_count, 1)
+            connector.invalidate_regions()
+            connector.find_region(ctypes.addressof(buffer))
+            self.assertEqual(regions.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()